@@ -0,0 +1,60 @@
+"""Benchmark color palette lookups and batch functions."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Color Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+from math import inf
+
+import color
+import numpy as np
+from benchmark_tools import best_time
+
+COLORS = np.random.default_rng(0).integers(0, 1 << 24, 1000).tolist()
+FRAME = np.random.default_rng(0).integers(0, 1 << 24, (50, 160))
+
+
+def linear_to_8_bit(color_24_bit: int) -> int:
+    """Return nearest PALETTE index by scanning the whole palette."""
+    r, g, b = color_24_bit >> 16, color_24_bit >> 8 & 0xFF, color_24_bit & 0xFF
+    closest_delta, closest_index = inf, 0
+    for i, palette_color in enumerate(color.PALETTE):
+        p_r, p_g, p_b = (
+            palette_color >> 16,
+            palette_color >> 8 & 0xFF,
+            palette_color & 0xFF,
+        )
+        delta = (p_r - r) ** 2 + (p_g - g) ** 2 + (p_b - b) ** 2
+        if delta < closest_delta:
+            closest_delta, closest_index = delta, i
+    return closest_index
+
+
+def run() -> None:
+    """Time palette lookups and batch functions."""
+    linear = best_time(lambda: [linear_to_8_bit(c) for c in COLORS])
+    table = best_time(lambda: [color.to_8_bit(c) for c in COLORS], 10)
+    frame = best_time(lambda: color.to_8_bit_many(FRAME), 10)
+    print(
+        f"scalar linear scan    {linear / len(COLORS) * 1e6:8.2f} us/color",
+    )
+    print(f"scalar table lookup   {table / len(COLORS) * 1e6:8.2f} us/color")
+    print(f"160x50 frame lookup   {frame * 1e3:8.2f} ms")
+
+    scalar = best_time(
+        lambda: [
+            color.blend(c, 0x336DBF, 0.37) for c in FRAME.ravel().tolist()
+        ],
+    )
+    batch = best_time(lambda: color.blend_many(FRAME, 0x336DBF, 0.37), 10)
+    print(f"160x50 frame blend    {scalar * 1e3:8.2f} ms scalar")
+    print(f"160x50 frame blend    {batch * 1e3:8.2f} ms blend_many")
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
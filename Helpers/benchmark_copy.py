@@ -0,0 +1,162 @@
+"""Benchmark Filesystem.copy against the old one file at a time copy."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Copy Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import functools
+import os
+import random
+import shutil
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+import component  # noqa: E402
+import computer  # noqa: E402
+import Filesystem as filesystem  # noqa: E402
+import Proxy  # noqa: E402
+from benchmark_tools import best_time  # noqa: E402
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DIRECTORIES = 20
+SMALL_FILES = 400
+SMALL_SIZE = 4 << 10
+LARGE_FILES = 16
+LARGE_SIZE = 4 << 20
+REPEAT = 3
+
+
+def make_tree(
+    directory: str,
+    small_files: int = SMALL_FILES,
+    large_files: int = LARGE_FILES,
+) -> int:
+    """Fill directory with nested folders of small and large files."""
+    # Seeded for the same tree every run, not for security
+    rng = random.Random(0)  # noqa: S311
+    folders = [directory]
+    for index in range(DIRECTORIES):
+        folder = os.path.join(rng.choice(folders), f"Folder{index}")
+        os.mkdir(folder)
+        folders.append(folder)
+    total = 0
+    sizes = [SMALL_SIZE] * small_files + [LARGE_SIZE] * large_files
+    for index, size in enumerate(sizes):
+        path = os.path.join(rng.choice(folders), f"File{index}.bin")
+        with open(path, "wb") as file:
+            file.write(rng.randbytes(size))
+        total += size
+    return total
+
+
+def old_copy(from_path: str, to_path: str) -> None:
+    """Copy like the old Filesystem.copy, one file and kilobyte at a time."""
+    if filesystem.isDirectory(from_path):
+        filesystem.makeDirectory(to_path)
+        names, _ = filesystem.list(from_path)
+        for name in names:
+            name = name.rstrip("/")
+            old_copy(f"{from_path}/{name}", f"{to_path}/{name}")
+        return
+    from_handle, _ = filesystem.open(from_path, "rb")
+    to_handle, _ = filesystem.open(to_path, "wb")
+    while True:
+        chunk = from_handle.readString(filesystem.BUFFER_SIZE)
+        if not chunk:
+            break
+        to_handle.write(chunk)
+    to_handle.close()
+    from_handle.close()
+
+
+def fake_path(real_path: str) -> str:
+    """Return the OpenComputers path of a real path."""
+    return "/" + os.path.relpath(real_path, Proxy.OPENCOMPUTERS)
+
+
+def mount_proxy(path: str) -> Any:
+    """Mount a new filesystem component at path and return its proxy."""
+    address = component.newRandomAddress()
+    component.addComponent("filesystem", address)
+    proxy = component.proxy(address)
+    filesystem.mount(proxy, path)
+    return proxy
+
+
+def progress_signals() -> list[tuple[Any, ...]]:
+    """Return and remove queued copy_progress signals."""
+    return [
+        signal
+        for signal in computer.pullSignalBatch(0)
+        if signal[0] == "copy_progress"
+    ]
+
+
+def timed_copy(copy: Callable[[], Any], real_target: str) -> float:
+    """Return best seconds of copy into an emptied real_target."""
+
+    def setup() -> None:
+        shutil.rmtree(real_target, ignore_errors=True)
+        # Removed outside of Proxy, so cached stats are stale
+        Proxy.clearStatCache()
+
+    seconds = best_time(copy, repeat=REPEAT, setup=setup)
+    progress_signals()
+    return seconds
+
+
+def run() -> None:
+    """Time copies of a tree on one and across two filesystem proxies."""
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source")
+        target = os.path.join(directory, "target")
+        os.mkdir(source)
+        total = make_tree(source)
+        from_path = fake_path(source)
+
+        # A second filesystem component showing the same files
+        mount = "/Mounts/CopyBenchmark/"
+        proxy = mount_proxy(mount)
+        targets = {
+            "same proxy": fake_path(target),
+            "across proxies": mount + fake_path(target)[1:],
+        }
+
+        print(
+            f"{SMALL_FILES} x {SMALL_SIZE >> 10} KiB and {LARGE_FILES} x"
+            f" {LARGE_SIZE >> 20} MiB files in {DIRECTORIES} folders,"
+            f" best of {REPEAT}",
+        )
+        old = timed_copy(
+            functools.partial(old_copy, from_path, fake_path(target)),
+            target,
+        )
+        print(
+            f"  old copy        {old * 1e3:8.1f} ms"
+            f" {total / old / 1e6:8.1f} MB/s",
+        )
+        for label, to_path in targets.items():
+            fast = timed_copy(
+                functools.partial(filesystem.copy, from_path, to_path),
+                target,
+            )
+            print(
+                f"  {label:<15} {fast * 1e3:8.1f} ms"
+                f" {total / fast / 1e6:8.1f} MB/s {old / fast:6.1f}x",
+            )
+        filesystem.unmount(proxy)
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
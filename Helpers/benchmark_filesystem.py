@@ -0,0 +1,316 @@
+"""Benchmark Filesystem handle reads against the old slicing buffer."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Filesystem Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from benchmark_tools import REPEAT, best_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+import Bit32 as bit32  # noqa: E402
+import Color as color  # noqa: E402
+import Filesystem as filesystem  # noqa: E402
+import Image as image  # noqa: E402
+import ocif  # noqa: E402
+import Proxy  # noqa: E402
+
+PICTURES = ("Icons/Trash.pic", "Pictures/Road.pic", "Pictures/Girl.pic")
+BLOCK_SIZES = (1 << 10, 1 << 12, 1 << 14, 1 << 16)
+NUMBERS = 15_000
+SAVE_METHODS = (5, 6)
+TEXT_SIZE = 1 << 23
+
+
+class SlicingHandle(filesystem._Handle):
+    """Handle that reads like the old one, re-slicing its buffer."""
+
+    def readString(self, count: int) -> bytes | str | None:
+        """Read count units, copying the rest of the buffer every call."""
+        if count > len(self.buffer):
+            data = self.buffer
+            while len(data) < count:
+                success, chunk = self.proxy.read(self.stream, self.bufferSize)
+                if not success:
+                    filesystem.error(chunk)
+                if not chunk:
+                    self.buffer = self.buffer[0:0]
+                    self.position += len(data)
+                    return data or None
+                data += chunk
+            self.buffer = data[count:]
+            self.position += count
+            return bytes(data[:count])
+        data = self.buffer[:count]
+        self.buffer = self.buffer[count:]
+        self.position += count
+        return bytes(data)
+
+    def readBytes(self, count: int, littleEndian: bool = False) -> int | None:
+        """Read number by folding a list of its bytes."""
+        if count == 1:
+            data = self.readString(1)
+            return ord(data) if data else None
+        bytes_ = list(self.readString(count) or b"")[:8] or [0]
+        if littleEndian:
+            bytes_.reverse()
+        result = 0
+        for byte in bytes_:
+            result = bit32.bor(bit32.lshift(result, 8), byte)
+        return result
+
+    def readUnicodeChar(self) -> str | None:
+        """Read UTF-8 char one byte at a time."""
+        data = self.readString(1)
+        if data is None:
+            return None
+        length = 1
+        while length < 6 and data[0] & (0x80 >> length) and data[0] >= 0xC0:
+            length += 1
+        for _ in range(1, length):
+            data += self.readString(1) or b""
+        return data.decode("utf-8")
+
+
+def per_pixel_load_six(file: SlicingHandle) -> image.Picture:
+    """Load OCIF method 6 data setting one pixel per read x."""
+    picture = image.Picture(file.readBytes(1), file.readBytes(1))
+    for _alpha in range(file.readBytes(1)):
+        alpha = file.readBytes(1) / 255
+        for _symbol in range(file.readBytes(2)):
+            symbol = file.readUnicodeChar()
+            for _background in range(file.readBytes(1)):
+                background = color.to24Bit(file.readBytes(1))
+                for _foreground in range(file.readBytes(1)):
+                    foreground = color.to24Bit(file.readBytes(1))
+                    for _y in range(file.readBytes(1)):
+                        y = file.readBytes(1)
+                        for _x in range(file.readBytes(1)):
+                            image.set_(
+                                picture,
+                                file.readBytes(1),
+                                y,
+                                background,
+                                foreground,
+                                alpha,
+                                symbol,
+                            )
+    return picture
+
+
+def old_load(path: str) -> image.Picture:
+    """Load picture at path with the old handle and decoder."""
+    with handles(SlicingHandle):
+        file, reason = filesystem.open(path, "rb")
+    assert file, reason
+    assert file.readString(4) == image.OCIFSignature.encode()
+    assert file.readBytes(1) == 6
+    picture = per_pixel_load_six(file)
+    file.close()
+    return picture
+
+
+def buffered_load(path: str) -> image.Picture:
+    """Load picture at path through a buffered instead of mapped handle."""
+    file, reason = filesystem.open(path, "rb")
+    assert file, reason
+    assert file.readString(4) == image.OCIFSignature.encode()
+    picture, reason = image.encodingMethodsLoad[file.readBytes(1)](file)
+    file.close()
+    return picture
+
+
+def read_all(path: str, mode: str) -> str:
+    """Read whole file at path with a handle opened in mode."""
+    file, reason = filesystem.open(path, mode)
+    assert file, reason
+    data = file.readAll()
+    file.close()
+    return data
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """Return the most bytes allocated at once while running function."""
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+class CountingHandle(filesystem._Handle):
+    """Handle that counts how many writes reach its stream."""
+
+    writes = 0
+
+    def flush(self) -> tuple[bool, str | None]:
+        """Count and flush written data."""
+        if self.buffer:
+            CountingHandle.writes += 1
+        return super().flush()
+
+
+class UnbufferedHandle(CountingHandle):
+    """Handle that sends every write call to its stream."""
+
+    def __init__(self, *args: Any) -> None:
+        """Initialize handle that flushes on every write."""
+        super().__init__(*args)
+        self.flushSize = 1
+
+
+def fake_path(real_path: str) -> str:
+    """Return the OpenComputers path of a file in this repository."""
+    return "/" + os.path.relpath(real_path, Proxy.OPENCOMPUTERS)
+
+
+@contextmanager
+def handles(handle: type[filesystem._Handle]) -> Iterator[None]:
+    """Make Filesystem.open return handles of the given class."""
+    original = filesystem._Handle
+    filesystem._Handle = handle
+    try:
+        yield
+    finally:
+        filesystem._Handle = original
+
+
+def read_bytes(path: str, buffer_size: int = filesystem.BUFFER_SIZE) -> int:
+    """Read file at path one byte at a time, return the byte count."""
+    file, reason = filesystem.open(path, "rb", buffer_size)
+    assert file, reason
+    count = 0
+    while file.readString(1) is not None:
+        count += 1
+    file.close()
+    return count
+
+
+def read_numbers(path: str, bulk: bool) -> list[int]:
+    """Read NUMBERS two byte numbers from file at path."""
+    file, reason = filesystem.open(path, "rb")
+    assert file, reason
+    if bulk:
+        numbers = file.readBytesArray(NUMBERS, 2)
+    else:
+        numbers = [file.readBytes(2) for _ in range(NUMBERS)]
+    file.close()
+    return numbers
+
+
+def save(path: str, picture: image.Picture, method: int) -> int:
+    """Save picture to path, return how many writes reached the stream."""
+    CountingHandle.writes = 0
+    assert image.save(path, picture, method) == (True, None)
+    return CountingHandle.writes
+
+
+def run() -> None:
+    """Time byte-at-a-time reads and Image.load with both handles."""
+    print(f"best of {REPEAT}")
+    print(f"{'file':<22}{'buffered':>14}{'slicing':>14}{'speedup':>10}")
+    for name in PICTURES:
+        real_path = os.path.join(ROOT, name)
+        path = fake_path(real_path)
+        size = os.path.getsize(real_path)
+
+        fast = best_time(lambda path=path: read_bytes(path))
+        with handles(SlicingHandle):
+            slow = best_time(lambda path=path: read_bytes(path))
+        print(
+            f"{name:<22}{size / fast / 1e6:>9.2f} MB/s"
+            f"{size / slow / 1e6:>9.2f} MB/s{slow / fast:>9.1f}x",
+        )
+
+    name = PICTURES[-1]
+    path = fake_path(os.path.join(ROOT, name))
+    size = os.path.getsize(os.path.join(ROOT, name))
+    print(f"\n{name} by first block size")
+    for block_size in BLOCK_SIZES:
+        fast = best_time(lambda size=block_size: read_bytes(path, size))
+        with handles(SlicingHandle):
+            slow = best_time(lambda size=block_size: read_bytes(path, size))
+        print(
+            f"{block_size:>8} bytes{size / fast / 1e6:>17.2f} MB/s"
+            f"{size / slow / 1e6:>9.2f} MB/s{slow / fast:>9.1f}x",
+        )
+
+    name = PICTURES[-1]
+    path = fake_path(os.path.join(ROOT, name))
+    with handles(SlicingHandle):
+        old = best_time(lambda: read_numbers(path, False))
+    single = best_time(lambda: read_numbers(path, False))
+    bulk = best_time(lambda: read_numbers(path, True))
+    print(f"\n{NUMBERS} two byte numbers from {name}")
+    print(f"  old readBytes   {old / NUMBERS * 1e9:8.0f} ns/number")
+    print(f"  readBytes       {single / NUMBERS * 1e9:8.0f} ns/number")
+    print(f"  readBytesArray  {bulk / NUMBERS * 1e9:8.0f} ns/number")
+
+    print(
+        f"\n{'Image.load':<20}{'mapped':>11}{'buffered':>11}{'old':>11}"
+        f"{'in memory':>12}",
+    )
+    for name in PICTURES:
+        real_path = os.path.join(ROOT, name)
+        path = fake_path(real_path)
+
+        mapped = best_time(lambda path=path: image.load(path))
+        fast = best_time(lambda path=path: buffered_load(path))
+        slow = best_time(lambda path=path: old_load(path))
+        memory = best_time(lambda path=real_path: ocif.load(path))
+        print(
+            f"{name:<20}{mapped * 1e3:>8.2f} ms{fast * 1e3:>8.2f} ms"
+            f"{slow * 1e3:>8.2f} ms{memory * 1e3:>9.2f} ms",
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        real_path = os.path.join(directory, "text.txt")
+        with open(real_path, "w", encoding="utf-8") as file:
+            file.write("MineOS " * (TEXT_SIZE // 7))
+        path = fake_path(real_path)
+        print(f"\nreadAll of {TEXT_SIZE >> 20} MiB text")
+        for mode in ("rm", "rb"):
+            elapsed = best_time(lambda mode=mode: read_all(path, mode))
+            peak = peak_memory(lambda mode=mode: read_all(path, mode))
+            print(
+                f"  {mode}{elapsed * 1e3:10.2f} ms,"
+                f" {peak / TEXT_SIZE:.1f}x file size allocated",
+            )
+
+    name = PICTURES[-1]
+    picture, _ = image.load(fake_path(os.path.join(ROOT, name)))
+    print(f"\nImage.save of {name}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = fake_path(os.path.join(directory, "saved.pic"))
+        for method in SAVE_METHODS:
+            with handles(CountingHandle):
+                combined = save(path, picture, method)
+                fast = best_time(partial(save, path, picture, method))
+            with handles(UnbufferedHandle):
+                separate = save(path, picture, method)
+                slow = best_time(partial(save, path, picture, method))
+            print(
+                f"  method {method} {fast * 1e3:8.2f} ms, {combined:>5} writes"
+                f"{slow * 1e3:10.2f} ms, {separate:>5} writes unbuffered",
+            )
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,207 @@
+"""Benchmark Image transforms against their per-pixel versions."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Image Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import math
+import os
+import sys
+from typing import TYPE_CHECKING, Any
+
+from benchmark_tools import REPEAT, best_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "Libraries"),
+)
+
+import Color as color
+import Image as image
+
+WIDTH = 160
+HEIGHT = 50
+
+
+def per_pixel_transform(
+    picture: image.Picture,
+    new_width: int,
+    new_height: int,
+) -> image.Picture:
+    """Scale picture one pixel at a time."""
+    new_picture = image.Picture(new_width, new_height)
+    step_width = picture.width / new_width
+    step_height = picture.height / new_height
+
+    y = 1.0
+    for j in range(1, new_height + 1):
+        x = 1.0
+        for i in range(1, new_width + 1):
+            image.set_(
+                new_picture,
+                i,
+                j,
+                *image.get(picture, math.floor(x), math.floor(y)),
+            )
+            x += step_width
+        y += step_height
+    return new_picture
+
+
+def per_pixel_crop(
+    picture: image.Picture,
+    from_x: int,
+    from_y: int,
+    width: int,
+    height: int,
+) -> image.Picture:
+    """Crop picture one pixel at a time."""
+    new_picture = image.Picture(width, height)
+    for y in range(from_y, from_y + height):
+        for x in range(from_x, from_x + width):
+            image.set_(
+                new_picture,
+                x - from_x + 1,
+                y - from_y + 1,
+                *image.get(picture, x, y),
+            )
+    return new_picture
+
+
+def per_pixel_flip_horizontally(picture: image.Picture) -> image.Picture:
+    """Mirror picture on the X axis one pixel at a time."""
+    new_picture = image.Picture(picture.width, picture.height)
+    for y in range(1, picture.height + 1):
+        for x in range(1, picture.width + 1):
+            image.set_(
+                new_picture,
+                picture.width - x + 1,
+                y,
+                *image.get(picture, x, y),
+            )
+    return new_picture
+
+
+def per_pixel_flip_vertically(picture: image.Picture) -> image.Picture:
+    """Mirror picture on the Y axis one pixel at a time."""
+    new_picture = image.Picture(picture.width, picture.height)
+    for y in range(1, picture.height + 1):
+        for x in range(1, picture.width + 1):
+            image.set_(
+                new_picture,
+                x,
+                picture.height - y + 1,
+                *image.get(picture, x, y),
+            )
+    return new_picture
+
+
+def per_pixel_expand(
+    picture: image.Picture,
+    top: int,
+    bottom: int,
+    left: int,
+    right: int,
+) -> image.Picture:
+    """Expand picture one pixel at a time."""
+    new_picture = image.Picture(
+        picture.width + left + right,
+        picture.height + top + bottom,
+    )
+    for y in range(1, picture.height + 1):
+        for x in range(1, picture.width + 1):
+            image.set_(
+                new_picture,
+                x + left,
+                y + top,
+                *image.get(picture, x, y),
+            )
+    return new_picture
+
+
+def per_pixel_blend(
+    picture: image.Picture,
+    blend_color: int,
+    transparency: float,
+) -> image.Picture:
+    """Blend picture with color one pixel at a time."""
+    new_picture = picture.copy()
+    for y in range(1, picture.height + 1):
+        for x in range(1, picture.width + 1):
+            background, foreground, alpha, symbol = image.get(picture, x, y)
+            image.set_(
+                new_picture,
+                x,
+                y,
+                color.blend(background, blend_color, transparency),
+                color.blend(foreground, blend_color, transparency),
+                alpha,
+                symbol,
+            )
+    return new_picture
+
+
+def cases(
+    picture: image.Picture,
+) -> tuple[tuple[str, Callable[[], Any], Callable[[], Any]], ...]:
+    """Return name, vectorized and per-pixel call of every transform of picture."""
+    return (
+        (
+            "transform",
+            lambda: image.transform(picture, 97, 31),
+            lambda: per_pixel_transform(picture, 97, 31),
+        ),
+        (
+            "crop",
+            lambda: image.crop(picture, 11, 5, 120, 40)[0],
+            lambda: per_pixel_crop(picture, 11, 5, 120, 40),
+        ),
+        (
+            "flipHorizontally",
+            lambda: image.flipHorizontally(picture),
+            lambda: per_pixel_flip_horizontally(picture),
+        ),
+        (
+            "flipVertically",
+            lambda: image.flipVertically(picture),
+            lambda: per_pixel_flip_vertically(picture),
+        ),
+        (
+            "expand",
+            lambda: image.expand(picture, 2, 3, 4, 5),
+            lambda: per_pixel_expand(picture, 2, 3, 4, 5),
+        ),
+        (
+            "blend",
+            lambda: image.blend(picture, 0x336DBF, 0.37),
+            lambda: per_pixel_blend(picture, 0x336DBF, 0.37),
+        ),
+    )
+
+
+def run() -> None:
+    """Compare vectorized and per-pixel transforms on a full screen picture."""
+    picture = image.create(WIDTH, HEIGHT, random_=True)
+    print(f"{WIDTH}x{HEIGHT} picture, best of {REPEAT}")
+    print(
+        f"{'operation':<18}{'vectorized':>14}{'per pixel':>14}{'speedup':>10}",
+    )
+    for name, vectorized, per_pixel in cases(picture):
+        fast = best_time(vectorized)
+        slow = best_time(per_pixel)
+        print(
+            f"{name:<18}{fast * 1e6:>11.1f} us{slow * 1e3:>11.2f} ms"
+            f"{slow / fast:>9.0f}x",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,107 @@
+"""Benchmark Filesystem directory listings against per entry stats."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Listing Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import functools
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+import Filesystem as filesystem  # noqa: E402
+import Proxy  # noqa: E402
+from benchmark_tools import REPEAT, best_time  # noqa: E402
+
+FILES = 2000
+DIRECTORIES = 100
+EXTENSIONS = (".pic", ".lua", ".cfg", ".txt", "")
+METHODS = {
+    "name": filesystem.SORTING_NAME,
+    "type": filesystem.SORTING_TYPE,
+    "date": filesystem.SORTING_DATE,
+}
+
+
+def make_tree(directory: str) -> None:
+    """Fill directory with files of different types and ages."""
+    now = 1_700_000_000
+    for index in range(FILES):
+        path = os.path.join(
+            directory,
+            f"File{index}{EXTENSIONS[index % len(EXTENSIONS)]}",
+        )
+        with open(path, "wb"):
+            pass
+        # Whole seconds apart, so second precision dates sort the same
+        os.utime(path, (now - index * 7 % FILES, now - index * 7 % FILES))
+    for index in range(DIRECTORIES):
+        path = os.path.join(directory, f"Folder{index}")
+        os.mkdir(path)
+        os.utime(path, (now - FILES - index, now - FILES - index))
+    os.utime(directory, (now, now))
+
+
+def stat_per_entry_list(path: str, method: int) -> list[str]:
+    """List path asking the filesystem for each entry while sorting."""
+    proxy, proxy_path = filesystem.get(path)
+    _, names = proxy.list(proxy_path)
+
+    if method == filesystem.SORTING_NAME:
+        names.sort(key=str.lower)
+    elif method == filesystem.SORTING_DATE:
+
+        def newer(first: str, second: str) -> int:
+            first_date = filesystem.lastModified(path + first)
+            second_date = filesystem.lastModified(path + second)
+            return (first_date < second_date) - (first_date > second_date)
+
+        names.sort(key=functools.cmp_to_key(newer))
+    else:
+
+        def type_key(name: str) -> tuple[str, str]:
+            if "." not in name and filesystem.isDirectory(path + name):
+                extension = "."
+            else:
+                extension = filesystem.extension(name) or "Z"
+            return extension.lower(), name.lower()
+
+        names.sort(key=type_key)
+    return names
+
+
+def cold_list(path: str, method: int) -> tuple[list[str] | None, str | None]:
+    """List path with an empty listing cache."""
+    Proxy._LISTINGS.clear()
+    return filesystem.list(path, method)
+
+
+def run() -> None:
+    """Time directory listings with and without the listing cache."""
+    with tempfile.TemporaryDirectory() as directory:
+        make_tree(directory)
+        path = "/" + os.path.relpath(directory, Proxy.OPENCOMPUTERS) + "/"
+        print(f"{FILES} files and {DIRECTORIES} directories, best of {REPEAT}")
+        print(f"{'sorting':<8}{'per entry':>12}{'scandir':>12}{'cached':>12}")
+        for label, method in METHODS.items():
+            slow = best_time(
+                functools.partial(stat_per_entry_list, path, method),
+            )
+            cold = best_time(functools.partial(cold_list, path, method))
+            warm = best_time(functools.partial(filesystem.list, path, method))
+            print(
+                f"{label:<8}{slow * 1e3:>9.2f} ms{cold * 1e3:>9.2f} ms"
+                f"{warm * 1e3:>9.2f} ms",
+            )
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
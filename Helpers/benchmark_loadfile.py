@@ -0,0 +1,106 @@
+"""Benchmark Filesystem.loadfile against writing and importing a module."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Loadfile Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import functools
+import importlib
+import os
+import sys
+import tempfile
+from typing import TYPE_CHECKING
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+import Filesystem as filesystem  # noqa: E402
+import Proxy  # noqa: E402
+from benchmark_tools import best_time  # noqa: E402
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+FUNCTIONS = 500
+NUMBER = 20
+
+
+def application_source(version: int) -> str:
+    """Return source of an application with FUNCTIONS functions."""
+    lines = [f"VERSION = {version}", ""]
+    for index in range(FUNCTIONS):
+        lines += [
+            f"def function{index}(value):",
+            f'    """Return value changed by step {index}."""',
+            "    for step in range(3):",
+            f"        value = (value * {index + 3} + step) % 65521",
+            "    return value",
+            "",
+        ]
+    lines.append(
+        f"RESULT = function{FUNCTIONS - 1}(function0(VERSION))",
+    )
+    return "\n".join(lines) + "\n"
+
+
+def write_old(real_path: str, source: str) -> None:
+    """Write source to real_path with a modification time in the past."""
+    with open(real_path, "w", encoding="utf-8") as file:
+        file.write(source)
+    past = os.stat(real_path).st_mtime - 10
+    os.utime(real_path, (past, past))
+
+
+def temporary_module_load(path: str, directory: str) -> ModuleType:
+    """Load path like the old loadfile, through a module file and import."""
+    data, _ = filesystem.read(path)
+    module_name = filesystem.hideExtension(filesystem.name(path))
+    module_path = os.path.join(directory, module_name + ".py")
+    with open(module_path, "w", encoding="utf-8") as file:
+        file.write(data)
+    importlib.invalidate_caches()
+    module = importlib.import_module(module_name)
+    os.remove(module_path)
+    # Otherwise the next import would return this module without loading
+    del sys.modules[module_name]
+    return module
+
+
+def cold_load(path: str) -> tuple[ModuleType | None, str | None]:
+    """Load path with an empty code cache."""
+    filesystem._CODES.clear()
+    return filesystem.loadfile(path)
+
+
+def run() -> None:
+    """Time loading an application module three ways."""
+    with tempfile.TemporaryDirectory() as directory:
+        real_path = os.path.join(directory, "Main.py")
+        path = "/" + os.path.relpath(real_path, Proxy.OPENCOMPUTERS)
+        write_old(real_path, application_source(1))
+        modules = os.path.join(directory, "modules")
+        os.mkdir(modules)
+        sys.path.insert(0, modules)
+
+        old = best_time(
+            functools.partial(temporary_module_load, path, modules),
+            NUMBER,
+        )
+        cold = best_time(functools.partial(cold_load, path), NUMBER)
+        filesystem.loadfile(path)
+        warm = best_time(functools.partial(filesystem.loadfile, path), NUMBER)
+        size = os.path.getsize(real_path)
+        print(f"application with {FUNCTIONS} functions, {size} bytes")
+        print(f"  module file and import {old * 1e3:8.2f} ms")
+        print(f"  compile                {cold * 1e3:8.2f} ms")
+        print(f"  cached code            {warm * 1e3:8.2f} ms")
+        sys.path.remove(modules)
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
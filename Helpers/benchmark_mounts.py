@@ -0,0 +1,110 @@
+"""Benchmark Filesystem mount lookups against a linear scan."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Mount Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import os
+import random
+import sys
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from benchmark_tools import REPEAT, best_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "Libraries"),
+)
+
+import component
+import Filesystem as filesystem
+import Paths as paths
+
+MOUNTS = (10, 100, 300, 1000)
+# Every this many mounts get one mounted inside them
+NESTED = 4
+LOOKUPS = 10_000
+
+
+def linear_get(path: str) -> tuple[Any, str]:
+    """Return proxy and rest path of the longest mount prefix by scanning."""
+    found = None
+    for mp in filesystem.mountedProxies:
+        if path.startswith(mp.path) and (
+            found is None or len(mp.path) > len(found.path)
+        ):
+            found = mp
+    if found is None:
+        return filesystem.BOOT_PROXY, path
+    return found.proxy, "/" + path[len(found.path) :]
+
+
+def mount_many(count: int) -> list[Any]:
+    """Mount count new filesystem components, return their proxies."""
+    proxies = []
+    for index in range(count):
+        address = component.newRandomAddress()
+        component.addComponent("filesystem", address)
+        proxy = component.proxy(address)
+        path = paths.system.mounts + address + "/"
+        if index % NESTED and proxies:
+            # Mount inside an earlier mount
+            path = proxies[-1][1] + f"disk{index}/"
+        assert filesystem.mount(proxy, path) == (True, None), path
+        proxies.append((proxy, path))
+    return [proxy for proxy, _ in proxies]
+
+
+def sample_paths(count: int) -> list[str]:
+    """Return count paths inside, beside and outside of mounts."""
+    # Seeded so every run looks up the same paths
+    rng = random.Random(0)  # noqa: S311
+    mounted = [mp.path for mp in filesystem.mountedProxies]
+    samples = []
+    for _ in range(count):
+        base = rng.choice(mounted)
+        kind = rng.randrange(3)
+        if kind == 0:
+            samples.append(base + "Pictures/Girl.pic")
+        elif kind == 1:
+            samples.append(base[:-1] + "x/file.txt")
+        else:
+            samples.append("/Libraries/Filesystem.py")
+    return samples
+
+
+def look_up(get: Callable[[str], Any], samples: list[str]) -> None:
+    """Look up every path of samples with get."""
+    for path in samples:
+        get(path)
+
+
+def run() -> None:
+    """Compare Filesystem.get and a linear scan over many mounts."""
+    print(f"{LOOKUPS} lookups, best of {REPEAT}")
+    print(f"{'mounts':>6}{'trie':>12}{'linear':>12}{'speedup':>10}")
+    for count in MOUNTS:
+        proxies = mount_many(count)
+        samples = sample_paths(LOOKUPS)
+        trie = best_time(partial(look_up, filesystem.get, samples)) / LOOKUPS
+        linear = best_time(partial(look_up, linear_get, samples)) / LOOKUPS
+        print(
+            f"{count:>6}{trie * 1e6:>9.2f} us{linear * 1e6:>9.2f} us"
+            f"{linear / trie:>9.1f}x",
+        )
+
+        for proxy in proxies:
+            filesystem.unmount(proxy)
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
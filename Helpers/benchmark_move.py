@@ -0,0 +1,113 @@
+"""Benchmark Filesystem.rename between mounts against copy and remove."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Move Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import builtins
+import functools
+import os
+import shutil
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+import benchmark_copy  # noqa: E402
+import Filesystem as filesystem  # noqa: E402
+import Proxy  # noqa: E402
+from benchmark_tools import best_time  # noqa: E402
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# tmpfs, a different host device than the temporary directory. Only used
+# as the parent of a new temporary directory, so it is not shared.
+OTHER_DEVICE = "/dev/shm"  # noqa: S108
+REPEAT = 3
+
+
+def old_rename(from_path: str, to_path: str) -> None:
+    """Move like the old Filesystem.rename across components."""
+    filesystem.copy(from_path, to_path)
+    # The old remove could not delete directories, so remove the tree here
+    shutil.rmtree(Proxy._realPath(filesystem.get(from_path)[1]))
+    Proxy.clearStatCache()
+
+
+def refuse_input(prompt: str = "") -> str:
+    """Fail if anything asks the user a question."""
+    raise AssertionError(f"asked {prompt!r}")
+
+
+def time_move(
+    move: Callable[[], Any],
+    source: str,
+    pristine: str,
+    target: str,
+) -> float:
+    """Return best seconds of moving a fresh copy of pristine to target."""
+
+    def setup() -> None:
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(pristine, source)
+        Proxy.clearStatCache()
+
+    return best_time(move, repeat=REPEAT, setup=setup)
+
+
+def run() -> None:
+    """Time renames between two mounts on one device and across devices."""
+    builtins.input = refuse_input
+    Proxy.WARNING = True
+    mount = "/Mounts/MoveBenchmark/"
+    proxy = benchmark_copy.mount_proxy(mount)
+
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        tempfile.TemporaryDirectory(
+            dir=OTHER_DEVICE,
+        ) as other,
+    ):
+        pristine = os.path.join(directory, "pristine")
+        source = os.path.join(directory, "source")
+        os.mkdir(pristine)
+        total = benchmark_copy.make_tree(pristine)
+        from_path = benchmark_copy.fake_path(source)
+        targets = {
+            "same device": os.path.join(directory, "target"),
+            "other device": os.path.join(other, "target"),
+        }
+
+        print(f"{total / 1e6:.1f} MB tree between mounts, best of {REPEAT}")
+        for label, target in targets.items():
+            to_path = mount + benchmark_copy.fake_path(target)[1:]
+            old = time_move(
+                functools.partial(old_rename, from_path, to_path),
+                source,
+                pristine,
+                target,
+            )
+            new = time_move(
+                functools.partial(filesystem.rename, from_path, to_path),
+                source,
+                pristine,
+                target,
+            )
+            print(
+                f"  {label:<13}{old * 1e3:9.1f} ms copy and remove"
+                f"{new * 1e3:9.1f} ms rename {old / new:8.1f}x",
+            )
+            shutil.rmtree(target, ignore_errors=True)
+    filesystem.unmount(proxy)
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,192 @@
+"""Benchmark computer signal queue and Event dispatch."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Signal Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "Libraries"),
+)
+
+import computer
+import Event as event
+
+SIGNALS = 2000
+IDLE = 1.0
+HANDLERS = 1000
+THROUGHPUT = 1_000_000
+BATCH = 1000
+NAMES = (
+    "touch",
+    "drop",
+    "key_down",
+    "key_up",
+    "clipboard",
+    "component_added",
+    "component_removed",
+    "modem_message",
+    "redstone_changed",
+    "screen_resized",
+)
+
+
+def wakeup_latencies(count: int) -> list[float]:
+    """Return microseconds between pushSignal and a blocked pullSignal."""
+    latencies: list[float] = []
+    ready = threading.Event()
+
+    def consumer() -> None:
+        for _ in range(count):
+            ready.set()
+            _, pushed = computer.pullSignal()
+            latencies.append((time.perf_counter_ns() - pushed) / 1000)
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    for _ in range(count):
+        ready.wait()
+        ready.clear()
+        # Give the consumer time to block inside pullSignal
+        time.sleep(0.0002)
+        computer.pushSignal("latency", time.perf_counter_ns())
+    thread.join()
+    return latencies
+
+
+def idle_cpu(seconds: float) -> tuple[float, float]:
+    """Return wall and CPU seconds spent waiting on an empty queue."""
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    computer.pullSignal(seconds)
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def dispatch_cost(indexed: bool) -> float:
+    """Return seconds per pulled signal with HANDLERS handlers over NAMES.
+
+    Indexed handlers are registered for their signal name, the others get
+    every signal and check its name themselves.
+    """
+    calls = 0
+
+    def register(name: str) -> event.Handler:
+        if indexed:
+
+            def callback(*signal: object) -> None:
+                nonlocal calls
+                calls += 1
+
+            return event.addHandler(callback, signalName=name)
+
+        def callback(*signal: object) -> None:
+            nonlocal calls
+            if signal and signal[0] == name:
+                calls += 1
+
+        return event.addHandler(callback)
+
+    computer.setSignalQueue(SIGNALS)
+    registered = [register(NAMES[i % len(NAMES)]) for i in range(HANDLERS)]
+    # Seeded so every run times the same traffic
+    traffic = random.Random(0).choices(NAMES, k=SIGNALS)  # noqa: S311
+    for name in traffic:
+        computer.pushSignal(name, "address", 1, 2)
+
+    start = time.perf_counter()
+    for _ in traffic:
+        event.pull(0)
+    elapsed = time.perf_counter() - start
+
+    for handler in registered:
+        event.removeHandler(handler)
+    return elapsed / SIGNALS
+
+
+def single_throughput(count: int) -> tuple[float, float]:
+    """Return pushSignal and pullSignal calls per second on one thread."""
+    computer.setSignalQueue(count)
+    push, pull = computer.pushSignal, computer.pullSignal
+
+    start = time.perf_counter()
+    for i in range(count):
+        push("modem_message", i)
+    pushed = time.perf_counter()
+    for _ in range(count):
+        pull(0)
+    pulled = time.perf_counter()
+    return count / (pushed - start), count / (pulled - pushed)
+
+
+def batch_throughput(count: int, overflow: str) -> tuple[float, int]:
+    """Return received signals/s and drops for batches passed between two threads."""
+    computer.setSignalQueue(4 * BATCH, overflow)
+    batches = [
+        [("modem_message", i) for i in range(start, start + BATCH)]
+        for start in range(0, count, BATCH)
+    ]
+
+    def producer() -> None:
+        for batch in batches:
+            computer.pushSignalBatch(batch)
+
+    thread = threading.Thread(target=producer)
+    start = time.perf_counter()
+    thread.start()
+    received = 0
+    while received < count:
+        signals = computer.pullSignalBatch(0.1)
+        if not signals and not thread.is_alive():
+            break
+        received += len(signals)
+    thread.join()
+    elapsed = time.perf_counter() - start
+
+    dropped = sum(computer.getSignalMetrics()["dropped"].values())
+    # Dropped signals never reach the consumer, so they do not count
+    return received / elapsed, dropped
+
+
+def run() -> None:
+    """Measure wakeup latency, idle CPU, dispatch cost and throughput."""
+    latencies = sorted(wakeup_latencies(SIGNALS))
+    print(f"push to pull wakeup over {SIGNALS} signals")
+    print(f"  median {statistics.median(latencies):8.1f} us")
+    print(f"  p99    {latencies[int(len(latencies) * 0.99)]:8.1f} us")
+
+    wall, cpu = idle_cpu(IDLE)
+    print(f"idle pullSignal({IDLE}) took {wall:.3f} s, {cpu * 1e3:.2f} ms CPU")
+
+    wall, _ = idle_cpu(0.05)
+    print(f"pullSignal(0.05) on an empty queue took {wall * 1e3:.1f} ms")
+
+    print(f"Event.pull dispatch, {HANDLERS} handlers over {len(NAMES)} names")
+    print(f"  every handler    {dispatch_cost(False) * 1e6:8.1f} us/signal")
+    print(f"  by signal name   {dispatch_cost(True) * 1e6:8.1f} us/signal")
+
+    pushes, pulls = single_throughput(THROUGHPUT)
+    print(f"throughput over {THROUGHPUT} signals")
+    print(f"  pushSignal         {pushes:12,.0f} signals/s")
+    print(f"  pullSignal         {pulls:12,.0f} signals/s")
+    for overflow in ("block", "dropOldest"):
+        rate, dropped = batch_throughput(THROUGHPUT, overflow)
+        print(
+            f"  batches, {overflow:<10}{rate:12,.0f} signals/s,"
+            f" {dropped} dropped",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,94 @@
+"""Benchmark Proxy metadata calls with and without the stat cache."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Stat Cache Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import os
+import sys
+import tempfile
+from math import ceil
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+import Filesystem as filesystem  # noqa: E402
+import Proxy  # noqa: E402
+from benchmark_tools import best_time  # noqa: E402
+
+FILES = 500
+
+
+def real_path(path: str) -> str:
+    """Return the real path of an OpenComputers path without caching."""
+    return os.path.join(Proxy.OPENCOMPUTERS, path[1:])
+
+
+def uncached_metadata(path: str) -> tuple[Any, ...]:
+    """Return metadata of path checking existence before every lookup."""
+    exists = os.path.exists(real_path(path))
+    size = os.path.getsize(real_path(path)) if exists else None
+    is_directory = os.path.isdir(real_path(path))
+    modified = (
+        ceil(os.path.getmtime(real_path(path)))
+        if os.path.exists(real_path(path))
+        else None
+    )
+    return exists, size, is_directory, modified
+
+
+def cached_metadata(path: str) -> tuple[Any, ...]:
+    """Return metadata of path through Proxy."""
+    proxy = Proxy.Proxy
+    exists = proxy.exists(path)
+    _, size = proxy.size(path)
+    is_directory = proxy.isDirectory(path)
+    modified, _ = proxy.lastModified(path)
+    return exists, size if exists else None, is_directory, modified or None
+
+
+def make_files(directory: str) -> list[str]:
+    """Write FILES files of growing size, return them and a missing path."""
+    fake = "/" + os.path.relpath(directory, Proxy.OPENCOMPUTERS)
+    paths = [f"{fake}/File{index}.txt" for index in range(FILES)]
+    for index, path in enumerate(paths):
+        filesystem.write(path, "x" * index)
+    paths.append(f"{fake}/Missing.txt")
+    return paths
+
+
+def run() -> None:
+    """Time metadata lookups over FILES files and report cache hits."""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_files(directory)
+        Proxy.clearStatCache()
+        uncached = best_time(lambda: [uncached_metadata(p) for p in paths])
+        cold = best_time(
+            lambda: (
+                Proxy.clearStatCache(),
+                [cached_metadata(p) for p in paths],
+            ),
+        )
+        warm = best_time(lambda: [cached_metadata(p) for p in paths])
+        calls = len(paths) * 4
+        print(f"exists, size, isDirectory and lastModified of {len(paths)}")
+        print(f"  separate stats {uncached / calls * 1e9:8.0f} ns/call")
+        print(f"  cold cache     {cold / calls * 1e9:8.0f} ns/call")
+        print(f"  warm cache     {warm / calls * 1e9:8.0f} ns/call")
+        metrics = Proxy.getStatCacheMetrics()
+        hit_rate = metrics["hits"] / (metrics["hits"] + metrics["misses"])
+        print(
+            f"{metrics['hits']} hits, {metrics['misses']} misses"
+            f" ({hit_rate:.0%}), {metrics['size']}/{metrics['capacity']}"
+            " paths cached",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
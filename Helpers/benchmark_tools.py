@@ -0,0 +1,32 @@
+"""Timing helpers shared by the benchmark scripts.
+
+Benchmarks only time code. Whether the timed code is correct is checked
+by the tests.
+"""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import timeit
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = ["REPEAT", "best_time"]
+
+REPEAT = 5
+
+
+def best_time(
+    function: Callable[[], Any],
+    number: int = 1,
+    repeat: int = REPEAT,
+    setup: Callable[[], Any] | str = "pass",
+) -> float:
+    """Return the best seconds per call out of repeat runs of number calls.
+
+    setup is called before every run and is not timed.
+    """
+    times = timeit.repeat(function, setup, number=number, repeat=repeat)
+    return min(times) / number
@@ -8,21 +8,30 @@ the OpenComputers PALETTE.
 
 from __future__ import annotations
 
-from functools import cache, lru_cache
+from functools import cache
 from math import floor, inf, modf
 
+import numpy as np
+import numpy.typing as npt
+
 __all__ = [
     "blend",
+    "blend_many",
     "hsb_to_integer",
     "hsb_to_rgb",
+    "hsb_to_rgb_many",
     "integer_to_hsb",
     "integer_to_rgb",
     "optimize",
     "rgb_to_hsb",
+    "rgb_to_hsb_many",
     "rgb_to_integer",
     "to_8_bit",
+    "to_8_bit_many",
     "to_24_bit",
+    "to_24_bit_many",
     "transition",
+    "transition_many",
 ]
 
 
@@ -107,6 +116,31 @@ def blend(color1: int, color2: int, transparency: float) -> int:
     return r | g | b
 
 
+def blend_many(
+    colors_1: npt.ArrayLike,
+    colors_2: npt.ArrayLike,
+    transparency: npt.ArrayLike,
+) -> npt.NDArray[np.uint32]:
+    """Return blend of every pair of colors in two arrays of 24 bit colors."""
+    colors_1 = np.asarray(colors_1, dtype=np.int64)
+    colors_2 = np.asarray(colors_2, dtype=np.int64)
+    transparency = np.asarray(transparency, dtype=np.float64)
+    inverted_transparency = 1 - transparency
+    r = np.floor(
+        (colors_2 >> 16) * inverted_transparency
+        + (colors_1 >> 16) * transparency,
+    ).astype(np.int64)
+    g = np.floor(
+        (colors_2 >> 8 & 0xFF) * inverted_transparency
+        + (colors_1 >> 8 & 0xFF) * transparency,
+    ).astype(np.int64)
+    b = np.floor(
+        (colors_2 & 0xFF) * inverted_transparency
+        + (colors_1 & 0xFF) * transparency,
+    ).astype(np.int64)
+    return (r << 16 | g << 8 | b).astype(np.uint32)
+
+
 def transition(color1: int, color2: int, position: float) -> int:
     """Generate a transitive color between first and second ones, based on the transition argument, where the value 0.0 is equivalent to the first color, and 1.0 is the second color."""
     r1, g1, b1 = color1 >> 16, color1 >> 8 & 0xFF, color1 & 0xFF
@@ -117,18 +151,80 @@ def transition(color1: int, color2: int, position: float) -> int:
     return r | g | b
 
 
+def transition_many(
+    colors_1: npt.ArrayLike,
+    colors_2: npt.ArrayLike,
+    position: npt.ArrayLike,
+) -> npt.NDArray[np.uint32]:
+    """Return transition of every pair of colors in two arrays of 24 bit colors."""
+    colors_1 = np.asarray(colors_1, dtype=np.int64)
+    colors_2 = np.asarray(colors_2, dtype=np.int64)
+    r1, g1, b1 = colors_1 >> 16, colors_1 >> 8 & 0xFF, colors_1 & 0xFF
+    r2, g2, b2 = colors_2 >> 16, colors_2 >> 8 & 0xFF, colors_2 & 0xFF
+    r = (r1 + np.floor((r2 - r1) * position).astype(np.int64)) << 16
+    g = (g1 + np.floor((g2 - g1) * position).astype(np.int64)) << 8
+    b = b1 + np.floor((b2 - b1) * position).astype(np.int64)
+    return (r | g | b).astype(np.uint32)
+
+
 @cache
+def _palette_lookup() -> (
+    tuple[list[tuple[int, ...]], npt.NDArray[np.intp], npt.NDArray[np.int64]]
+):
+    """Return nearest palette color candidates for every color cell.
+
+    Colors are split in 32768 cells by the top 5 bits of each channel. A
+    palette color is a candidate for a cell when its smallest possible
+    delta to the cell is not larger than the largest possible delta of
+    the closest palette color. The nearest palette color of any color in
+    the cell, and every color tied with it, always passes that test, so
+    searching the candidates in ascending order gives the same index as
+    searching the whole PALETTE.
+
+    Returns candidates of every cell as tuples, the same candidates as
+    one array padded with index 256, and palette channels with a far
+    away sentinel color at index 256.
+    """
+    palette = np.array((*PALETTE, 0), dtype=np.int64)
+    channels = np.stack((palette >> 16, palette >> 8 & 0xFF, palette & 0xFF))
+    channels[:, -1] = 1 << 20
+
+    low = np.arange(0, 256, 8)[:, np.newaxis]
+    high = low + 7
+    values = channels[:, np.newaxis, :-1]
+    near = (values - np.clip(values, low, high)) ** 2
+    far = np.maximum((values - low) ** 2, (values - high) ** 2)
+
+    def cells(axes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        return (
+            axes[0][:, np.newaxis, np.newaxis]
+            + axes[1][np.newaxis, :, np.newaxis]
+            + axes[2][np.newaxis, np.newaxis, :]
+        ).reshape(32768, len(PALETTE))
+
+    is_candidate = cells(near) <= cells(far).min(axis=1, keepdims=True)
+
+    counts = is_candidate.sum(axis=1)
+    table = np.full((32768, counts.max()), len(PALETTE), dtype=np.intp)
+    table[np.arange(counts.max()) < counts[:, np.newaxis]] = np.nonzero(
+        is_candidate,
+    )[1]
+    candidates = [
+        tuple(row[:count])
+        for row, count in zip(table.tolist(), counts.tolist(), strict=True)
+    ]
+    return candidates, table, channels
+
+
 def to_8_bit(color_24_bit: int) -> int:
     """Look at 256-color OpenComputers PALETTE and return the color index that most accurately matches given value using the same search method as in gpu.setBackground(value) does."""
     r, g, b = color_24_bit >> 16, color_24_bit >> 8 & 0xFF, color_24_bit & 0xFF
-    closest_delta, closest_index = inf, 1
-    # Moved outside of loop from original
-    # See if 24 bit color perfectly matches a PALETTE color
-    if color_24_bit in PALETTE[1:]:
-        # If there is an entry of 24 bit color in PALETTE, return index minus 1 because we skip first entry.
-        return PALETTE.index(color_24_bit) - 1
-    # We ignore first one, so we need to shift PALETTE indexing by one
-    for i in range(1, len(PALETTE) - 1):
+    candidates = _palette_lookup()[0][r >> 3 << 10 | g >> 3 << 5 | b >> 3]
+    if len(candidates) == 1:
+        return candidates[0]
+
+    closest_delta, closest_index = inf, 0
+    for i in candidates:
         palette_color = PALETTE[i]
 
         p_r, p_g, p_b = (
@@ -140,7 +236,26 @@ def to_8_bit(color_24_bit: int) -> int:
         delta = (p_r - r) ** 2 + (p_g - g) ** 2 + (p_b - b) ** 2
         if delta < closest_delta:
             closest_delta, closest_index = delta, i
-    return closest_index - 1
+    return closest_index
+
+
+def to_8_bit_many(colors: npt.ArrayLike) -> npt.NDArray[np.uint8]:
+    """Return to_8_bit of every color in an array of 24 bit colors."""
+    _, table, channels = _palette_lookup()
+    colors = np.asarray(colors, dtype=np.int64)
+    rgb = (colors >> 16, colors >> 8 & 0xFF, colors & 0xFF)
+    candidates = table[rgb[0] >> 3 << 10 | rgb[1] >> 3 << 5 | rgb[2] >> 3]
+
+    delta = sum(
+        (channel[candidates] - value[..., np.newaxis]) ** 2
+        for channel, value in zip(channels, rgb, strict=True)
+    )
+    closest = np.take_along_axis(
+        candidates,
+        delta.argmin(axis=-1)[..., np.newaxis],
+        axis=-1,
+    )
+    return closest[..., 0].astype(np.uint8)
 
 
 def to_24_bit(color_8_bit: int) -> int:
@@ -148,6 +263,17 @@ def to_24_bit(color_8_bit: int) -> int:
     return PALETTE[color_8_bit]
 
 
+@cache
+def _palette_array() -> npt.NDArray[np.uint32]:
+    """Return PALETTE as an array."""
+    return np.array(PALETTE, dtype=np.uint32)
+
+
+def to_24_bit_many(colors: npt.ArrayLike) -> npt.NDArray[np.uint32]:
+    """Return to_24_bit of every index in an array of 8 bit colors."""
+    return _palette_array()[np.asarray(colors, dtype=np.intp)]
+
+
 def rgb_to_hsb(r: int, g: int, b: int) -> tuple[float, float, float]:
     """Convert three color channels of the RGB color model to the HSB color model and returns the corresponding result."""
     maxv, minv = max(r, g, b), min(r, g, b)
@@ -201,6 +327,79 @@ def hsb_to_rgb(h: float, s: float, b: float) -> tuple[int, int, int]:
     return floor(b * 255), floor(p * 255), floor(q * 255)
 
 
+def rgb_to_hsb_many(
+    r: npt.ArrayLike,
+    g: npt.ArrayLike,
+    b: npt.ArrayLike,
+) -> tuple[
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+]:
+    """Return rgb_to_hsb of every color in arrays of red, green and blue channels.
+
+    Black has saturation 0 here, where rgb_to_hsb raises ZeroDivisionError.
+    """
+    r, g, b = np.broadcast_arrays(
+        *(np.asarray(c, np.int64) for c in (r, g, b)),
+    )
+    maxv = np.maximum(np.maximum(r, g), b)
+    minv = np.minimum(np.minimum(r, g), b)
+    # Keep unselected branches from dividing by zero
+    delta = np.where(maxv == minv, 1, maxv - minv)
+
+    h = np.select(
+        (
+            maxv == minv,
+            (maxv == r) & (g >= b),
+            maxv == r,
+            maxv == g,
+        ),
+        (
+            0.0,
+            60 * (g - b) / delta,
+            60 * (g - b) / delta + 360,
+            60 * (b - r) / delta + 120,
+        ),
+        60 * (r - g) / delta + 240,
+    )
+    s = np.where(maxv == 0, 0.0, 1 - minv / np.where(maxv == 0, 1, maxv))
+    return h, s, maxv / 255
+
+
+def hsb_to_rgb_many(
+    h: npt.ArrayLike,
+    s: npt.ArrayLike,
+    b: npt.ArrayLike,
+) -> tuple[
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+]:
+    """Return hsb_to_rgb of every color in arrays of hue, saturation and brightness."""
+    h, s, b = np.broadcast_arrays(
+        *(np.asarray(c, np.float64) for c in (h, s, b)),
+    )
+    fractional, integer = np.modf(h / 60)
+    p = np.floor(b * (1 - s) * 255).astype(np.int64)
+    q = np.floor(b * (1 - s * fractional) * 255).astype(np.int64)
+    t = np.floor(b * (1 - (1 - fractional) * s) * 255).astype(np.int64)
+    v = np.floor(b * 255).astype(np.int64)
+
+    sector = (
+        integer == 0,
+        integer == 1,
+        integer == 2,
+        integer == 3,
+        integer == 4,
+    )
+    return (
+        np.select(sector, (v, q, p, p, t), v),
+        np.select(sector, (t, v, v, q, p), p),
+        np.select(sector, (p, p, t, v, v), q),
+    )
+
+
 def integer_to_hsb(color: int) -> tuple[float, float, float]:
     """Convert an integer to an RGB value and then that into a HSB value."""
     return rgb_to_hsb(*integer_to_rgb(color))
@@ -211,7 +410,6 @@ def hsb_to_integer(h: int, s: int, b: int) -> int:
     return rgb_to_integer(*hsb_to_rgb(h, s, b))
 
 
-@lru_cache
 def optimize(color_24_bit: int) -> int:
     """Get a close approximation from the OC Color Palette of given 24 bit color."""
     return to_24_bit(to_8_bit(color_24_bit))
@@ -1,4 +1,4 @@
-"""Read OCIF files."""
+"""Read and write OCIF files."""
 
 from __future__ import annotations
 
@@ -12,11 +12,10 @@ import numpy as np
 import numpy.typing as npt
 
 if TYPE_CHECKING:
-    import io
-
     from typing_extensions import Self
 
 OCIF_SIGNATURE: Final = "OCIF"
+PALETTE: Final = np.array(color.PALETTE, dtype=np.uint32)
 
 
 class Picture:
@@ -139,120 +138,357 @@ def int_to_bytearr(number: int, _size: int) -> bytearray:
     return bytearray(number.to_bytes(_size))
 
 
-def read_utf8(file: io.IOBase, count: int) -> str:
-    """Read `count` UTF-8 bytes from file `f`, return as unicode."""
+def utf8_length(lead: int) -> int:
+    """Return byte length of UTF-8 sequence starting with lead byte."""
     # Assumes UTF-8 data is valid; leaves it up to the `.decode()`
     # call to validate
-    res = []
-    while count:
-        count -= 1
-        lead = file.read(1)
-        res.append(lead)
+    if 0xBF < lead < 0xF5:
+        return 2 + (lead >= 0xE0) + (lead >= 0xF0)
+    return 1
 
-        value = ord(lead)
-        if 0xBF < value < 0xF5:
-            read_count = 1 + (value >= 0xE0) + (value >= 0xF0)
-            res.append(file.read(read_count))
-    return (b"".join(res)).decode("utf8")
 
+class Cursor:
+    """Read position over an OCIF file held in memory."""
 
-def load_five(file: io.IOBase) -> Picture:
-    """Load OCIF version five file."""
-    width = int.from_bytes(file.read(1))
-    height = int.from_bytes(file.read(1))
+    __slots__ = ("data", "offset")
 
-    picture = Picture(width, height)
+    def __init__(self, data: bytes | memoryview, offset: int = 0) -> None:
+        """Initialize Cursor."""
+        self.data = memoryview(data)
+        self.offset = offset
 
-    for current_y in range(height):
-        for current_x in range(width):
-            current_background = np.uint32(
-                color.to_24_bit(int.from_bytes(file.read(1))),
-            )
-            current_foreground = np.uint32(
-                color.to_24_bit(int.from_bytes(file.read(1))),
-            )
-            current_alpha = np.uint8(int.from_bytes(file.read(1)))
-            current_symbol = read_utf8(file, 1)
-            picture.set(
-                x=current_x,
-                y=current_y,
-                symbol=current_symbol,
-                foreground=current_foreground,
-                background=current_background,
-                alpha=current_alpha,
-            )
-    return picture
+    def read_int(self, size: int = 1) -> int:
+        """Read `size` byte big endian unsigned integer."""
+        start = self.offset
+        self.offset += size
+        if size == 1:
+            return self.data[start]
+        return int.from_bytes(self.data[start : self.offset])
+
+    def read_bytes(self, count: int) -> memoryview:
+        """Read `count` bytes without copying them."""
+        start = self.offset
+        self.offset += count
+        return self.data[start : self.offset]
+
+    def read_utf8(self) -> str:
+        """Read one UTF-8 encoded character."""
+        start = self.offset
+        self.offset += utf8_length(self.data[start])
+        return str(self.data[start : self.offset], "utf8")
+
+
+def load_five(cursor: Cursor) -> Picture:
+    """Load OCIF version five file."""
+    width = cursor.read_int(2)
+    height = cursor.read_int(2)
+
+    backgrounds: list[int] = []
+    foregrounds: list[int] = []
+    alphas: list[int] = []
+    symbols: list[str] = []
+    for _pixel in range(width * height):
+        backgrounds.append(cursor.read_int())
+        foregrounds.append(cursor.read_int())
+        alphas.append(cursor.read_int())
+        symbols.append(cursor.read_utf8())
+
+    shape = (height, width)
+    return Picture(
+        width,
+        height,
+        np.array(symbols, dtype="<U1").reshape(shape),
+        PALETTE[foregrounds].reshape(shape),
+        PALETTE[backgrounds].reshape(shape),
+        np.array(alphas, dtype=np.uint8).reshape(shape),
+    )
 
 
-def load_grouped(method: int, file: io.IOBase) -> Picture:
+def load_grouped(method: int, cursor: Cursor) -> Picture:
     """Load grouped ocif file."""
     seven = 1 if method >= 7 else 0
     eight = 1 if method >= 8 else 0
 
-    width = int.from_bytes(file.read(1)) + eight
-    height = int.from_bytes(file.read(1)) + eight
+    width = cursor.read_int() + eight
+    height = cursor.read_int() + eight
 
-    picture = Picture(width, height)
+    # Values of every (alpha, symbol, background, foreground) group
+    alphas: list[int] = []
+    symbols: list[str] = []
+    backgrounds: list[int] = []
+    foregrounds: list[int] = []
+    # Number of y runs in each group, then y and x count of each run
+    group_rows: list[int] = []
+    row_ys: list[int] = []
+    row_sizes: list[int] = []
+    xs = bytearray()
 
-    alpha_size = int.from_bytes(file.read(1)) + seven
+    alpha_size = cursor.read_int() + seven
 
     for _alpha in range(alpha_size):
-        current_alpha = np.uint8(int.from_bytes(file.read(1)))  # / 255
+        current_alpha = cursor.read_int()  # / 255
 
-        symbol_size = int.from_bytes(file.read(2)) + seven
+        symbol_size = cursor.read_int(2) + seven
 
         for _symbol in range(symbol_size):
-            current_symbol = read_utf8(file, 1)
+            current_symbol = cursor.read_utf8()
 
-            background_size = int.from_bytes(file.read(1))
+            background_size = cursor.read_int()
 
             for _background in range(background_size + seven):
-                current_background = np.uint32(
-                    color.to_24_bit(
-                        int.from_bytes(file.read(1)),
-                    ),
-                )
-                foreground_size = int.from_bytes(file.read(1))
+                current_background = cursor.read_int()
+                foreground_size = cursor.read_int()
 
                 for _foreground in range(foreground_size + seven):
-                    current_foreground = np.uint32(
-                        color.to_24_bit(
-                            int.from_bytes(file.read(1)),
-                        ),
-                    )
-                    y_size = int.from_bytes(file.read(1))
-
-                    for _y in range(y_size + seven):
-                        current_y = int.from_bytes(file.read(1)) + eight
-                        x_size = int.from_bytes(file.read(1))
-
-                        for _x in range(x_size + seven):
-                            current_x = int.from_bytes(file.read(1)) + eight
-
-                            picture.set(
-                                x=current_x - 1,
-                                y=current_y - 1,
-                                symbol=current_symbol,
-                                foreground=current_foreground,
-                                background=current_background,
-                                alpha=current_alpha,
-                            )
+                    current_foreground = cursor.read_int()
+                    y_size = cursor.read_int() + seven
+
+                    alphas.append(current_alpha)
+                    symbols.append(current_symbol)
+                    backgrounds.append(current_background)
+                    foregrounds.append(current_foreground)
+                    group_rows.append(y_size)
+
+                    for _y in range(y_size):
+                        row_ys.append(cursor.read_int())
+                        x_size = cursor.read_int() + seven
+                        row_sizes.append(x_size)
+                        xs += cursor.read_bytes(x_size)
+
+    picture = Picture(width, height)
+    if not xs:
+        return picture
+
+    # Scatter every pixel into the planes at once
+    sizes = np.array(row_sizes, dtype=np.intp)
+    group = np.repeat(
+        np.repeat(np.arange(len(group_rows)), group_rows),
+        sizes,
+    )
+    index = (
+        np.repeat(np.array(row_ys, dtype=np.intp), sizes) + eight - 1,
+        np.frombuffer(xs, dtype=np.uint8).astype(np.intp) + eight - 1,
+    )
+    picture.symbol[index] = np.array(symbols, dtype="<U1")[group]
+    picture.foreground[index] = PALETTE[foregrounds][group]
+    picture.background[index] = PALETTE[backgrounds][group]
+    picture.alpha[index] = np.array(alphas, dtype=np.uint8)[group]
     return picture
 
 
+def decode(data: bytes | memoryview) -> Picture:
+    """Decode picture from OCIF file contents."""
+    cursor = Cursor(data)
+    if cursor.data[:4] != OCIF_SIGNATURE.encode():
+        raise OSError("File header is invalid for OCIF image")
+    cursor.offset = 4
+    method = cursor.read_int()
+    if method > 5:
+        return load_grouped(method, cursor)
+    if method == 5:
+        return load_five(cursor)
+    raise NotImplementedError(f"OCIF method {method!r}")
+
+
 def load(filename: str) -> Picture:
     """Load picture from file."""
     with open(filename, "rb") as file:
-        magic = file.read(4)
-        if magic != b"OCIF":
-            raise OSError("File header is invalid for OCIF image")
-        method = int.from_bytes(file.read(1))
-        print(f"{method = }")
-        if method > 5:
-            return load_grouped(method, file)
-        if method == 5:
-            return load_five(file)
-        raise NotImplementedError(f"OCIF method {method!r}")
+        return decode(file.read())
+
+
+def utf8_lengths(codepoints: npt.NDArray[np.uint32]) -> npt.NDArray[np.intp]:
+    """Return UTF-8 encoded byte length of every codepoint."""
+    return (
+        1
+        + (codepoints >= 0x80).astype(np.intp)
+        + (codepoints >= 0x800)
+        + (codepoints >= 0x10000)
+    )
+
+
+def to_8_bit_plane(plane: npt.NDArray[np.uint32]) -> npt.NDArray[np.uint64]:
+    """Return every color of plane converted to 8 bit, flattened."""
+    return color.to_8_bit_many(plane.ravel()).astype(np.uint64)
+
+
+def codepoints(picture: Picture) -> npt.NDArray[np.uint32]:
+    """Return symbol codepoints of picture, flattened."""
+    return np.ascontiguousarray(picture.symbol).view(np.uint32).ravel()
+
+
+def new_buffer(method: int, size: int) -> bytearray:
+    """Return buffer for `size` bytes of method data, signature included."""
+    data = bytearray(len(OCIF_SIGNATURE) + 1 + size)
+    data[: len(OCIF_SIGNATURE)] = OCIF_SIGNATURE.encode()
+    data[len(OCIF_SIGNATURE)] = method
+    return data
+
+
+def write_symbols(
+    data: bytearray,
+    positions: npt.NDArray[np.intp],
+    symbols: npt.NDArray[np.uint32],
+) -> None:
+    """Write UTF-8 encoded symbols at positions of data."""
+    view = np.frombuffer(data, dtype=np.uint8)
+    for codepoint in np.unique(symbols):
+        where = positions[symbols == codepoint]
+        for index, byte in enumerate(chr(codepoint).encode("utf8")):
+            view[where + index] = byte
+
+
+def encode_five(picture: Picture) -> bytearray:
+    """Encode picture as OCIF version five file."""
+    if not (0 <= picture.width <= 0xFFFF and 0 <= picture.height <= 0xFFFF):
+        raise ValueError("Picture is too large for OCIF method 5")
+    symbols = codepoints(picture)
+    lengths = 3 + utf8_lengths(symbols)
+    # Width and height are two bytes each
+    header = len(OCIF_SIGNATURE) + 1 + 4
+    ends = np.cumsum(lengths)
+    starts = header + ends - lengths
+
+    data = new_buffer(5, int(ends[-1]) + 4 if len(ends) else 4)
+    data[header - 4 : header - 2] = int_to_bytearr(picture.width, 2)
+    data[header - 2 : header] = int_to_bytearr(picture.height, 2)
+
+    view = np.frombuffer(data, dtype=np.uint8)
+    view[starts] = to_8_bit_plane(picture.background)
+    view[starts + 1] = to_8_bit_plane(picture.foreground)
+    view[starts + 2] = picture.alpha.ravel()
+    write_symbols(data, starts + 3, symbols)
+    return data
+
+
+def group_starts(keys: npt.NDArray[np.uint64]) -> npt.NDArray[np.bool_]:
+    """Return which entries of sorted keys begin a new group."""
+    starts = np.empty(len(keys), dtype=np.bool_)
+    starts[:1] = True
+    np.not_equal(keys[1:], keys[:-1], out=starts[1:])
+    return starts
+
+
+def group_sizes(
+    outer: npt.NDArray[np.bool_],
+    inner: npt.NDArray[np.bool_],
+) -> npt.NDArray[np.intp]:
+    """Return number of inner groups in every outer group."""
+    return np.add.reduceat(inner.astype(np.intp), np.flatnonzero(outer))
+
+
+def encode_grouped(method: int, picture: Picture) -> bytearray:
+    """Encode picture as grouped OCIF file."""
+    seven = 1 if method >= 7 else 0
+    eight = 1 if method >= 8 else 0
+
+    width_limit = 0xFF + eight
+    if not (
+        eight <= picture.width <= width_limit
+        and eight <= picture.height <= width_limit
+    ):
+        raise ValueError(f"Picture is too large for OCIF method {method}")
+
+    # Pack every pixel into one sortable key: alpha, symbol, background,
+    # foreground, y and x, most significant first
+    ys, xs = np.indices((picture.height, picture.width), dtype=np.uint64)
+    keys = (
+        picture.alpha.ravel().astype(np.uint64) << 53
+        | codepoints(picture).astype(np.uint64) << 32
+        | to_8_bit_plane(picture.background) << 24
+        | to_8_bit_plane(picture.foreground) << 16
+        | ys.ravel() << 8
+        | xs.ravel()
+    )
+    keys.sort()
+
+    new_alpha = group_starts(keys >> 53)
+    new_symbol = group_starts(keys >> 32)
+    new_background = group_starts(keys >> 24)
+    new_foreground = group_starts(keys >> 16)
+    new_y = group_starts(keys >> 8)
+
+    alpha_size = int(new_alpha.sum())
+    symbol_sizes = group_sizes(new_alpha, new_symbol)
+    background_sizes = group_sizes(new_symbol, new_background)
+    foreground_sizes = group_sizes(new_background, new_foreground)
+    y_sizes = group_sizes(new_foreground, new_y)
+    x_sizes = np.diff(np.flatnonzero(new_y), append=len(keys))
+
+    for sizes, limit in (
+        ((alpha_size,), 0xFF),
+        (symbol_sizes, 0xFFFF),
+        (background_sizes, 0xFF),
+        (foreground_sizes, 0xFF),
+        (y_sizes, 0xFF),
+        (x_sizes, 0xFF),
+    ):
+        if np.max(sizes, initial=0) - seven > limit:
+            raise ValueError(
+                f"Picture has too many groups for OCIF method {method}",
+            )
+
+    symbols = ((keys >> 32) & 0x1FFFFF).astype(np.uint32)
+    symbol_lengths = utf8_lengths(symbols[new_symbol])
+
+    # Bytes each pixel adds: group headers it opens, then its x
+    lengths = (
+        1 + 3 * new_alpha + 2 * new_background + 2 * new_foreground + 2 * new_y
+    ).astype(np.intp)
+    lengths[new_symbol] += symbol_lengths + 1
+    header = len(OCIF_SIGNATURE) + 1 + 3
+    ends = np.cumsum(lengths)
+    position = header + ends - lengths
+
+    data = new_buffer(method, int(ends[-1]) + 3 if len(ends) else 3)
+    data[header - 3] = picture.width - eight
+    data[header - 2] = picture.height - eight
+    data[header - 1] = alpha_size - seven
+    view = np.frombuffer(data, dtype=np.uint8)
+
+    start = position[new_alpha]
+    view[start] = keys[new_alpha] >> 53
+    view[start + 1] = (symbol_sizes - seven) >> 8
+    view[start + 2] = (symbol_sizes - seven) & 0xFF
+    position += 3 * new_alpha
+
+    start = position[new_symbol]
+    write_symbols(data, start, symbols[new_symbol])
+    view[start + symbol_lengths] = background_sizes - seven
+    position[new_symbol] += symbol_lengths + 1
+
+    start = position[new_background]
+    view[start] = (keys[new_background] >> 24) & 0xFF
+    view[start + 1] = foreground_sizes - seven
+    position += 2 * new_background
+
+    start = position[new_foreground]
+    view[start] = (keys[new_foreground] >> 16) & 0xFF
+    view[start + 1] = y_sizes - seven
+    position += 2 * new_foreground
+
+    start = position[new_y]
+    view[start] = ((keys[new_y] >> 8) & 0xFF) + 1 - eight
+    view[start + 1] = x_sizes - seven
+    position += 2 * new_y
+
+    view[position] = (keys & 0xFF) + 1 - eight
+    return data
+
+
+def encode(picture: Picture, method: int = 6) -> bytearray:
+    """Encode picture as OCIF file contents."""
+    if method == 5:
+        return encode_five(picture)
+    if 6 <= method <= 8:
+        return encode_grouped(method, picture)
+    raise NotImplementedError(f"OCIF method {method!r}")
+
+
+def save(filename: str, picture: Picture, method: int = 6) -> None:
+    """Save picture to file."""
+    data = encode(picture, method)
+    with open(filename, "wb") as file:
+        file.write(data)
 
 
 def run() -> None:
@@ -8,24 +8,32 @@
 # the OpenComputers PALETTE.
 from __future__ import annotations
 
-from functools import cache, lru_cache
+from functools import cache
 from math import floor, inf, modf
 from typing import SupportsFloat
 
+import numpy as np
+import numpy.typing as npt
 from typing_extensions import SupportsIndex
 
 __all__ = [
     "HSBToInteger",
     "HSBToRGB",
+    "HSBToRGBMany",
     "RGBToHSB",
+    "RGBToHSBMany",
     "RGBToInteger",
     "blend",
+    "blendMany",
     "integerToHSB",
     "integerToRGB",
     "optimize",
     "to8Bit",
+    "to8BitMany",
     "to24Bit",
+    "to24BitMany",
     "transition",
+    "transitionMany",
 ]
 
 
@@ -128,6 +136,31 @@ def blend(color1: int, color2: int, transparency: float) -> int:
     return r | g | b
 
 
+def blendMany(
+    colors1: npt.ArrayLike,
+    colors2: npt.ArrayLike,
+    transparency: npt.ArrayLike,
+) -> npt.NDArray[np.uint32]:
+    """Return blend of every pair of colors in two arrays of 24 bit colors."""
+    colors1 = np.asarray(colors1, dtype=np.int64)
+    colors2 = np.asarray(colors2, dtype=np.int64)
+    transparency = np.asarray(transparency, dtype=np.float64)
+    invertedTransparency = 1 - transparency
+    r = np.floor(
+        (colors2 >> 16) * invertedTransparency
+        + (colors1 >> 16) * transparency,
+    ).astype(np.int64)
+    g = np.floor(
+        (colors2 >> 8 & 0xFF) * invertedTransparency
+        + (colors1 >> 8 & 0xFF) * transparency,
+    ).astype(np.int64)
+    b = np.floor(
+        (colors2 & 0xFF) * invertedTransparency
+        + (colors1 & 0xFF) * transparency,
+    ).astype(np.int64)
+    return (r << 16 | g << 8 | b).astype(np.uint32)
+
+
 def transition(color1: int, color2: int, position: float) -> int:
     """Generates a transitive color between first and second ones, based on the transition argument, where the value 0.0 is equivalent to the first color, and 1.0 is the second color."""
     r1, g1, b1 = color1 >> 16, color1 >> 8 & 0xFF, color1 & 0xFF
@@ -138,18 +171,80 @@ def transition(color1: int, color2: int, position: float) -> int:
     return r | g | b
 
 
+def transitionMany(
+    colors1: npt.ArrayLike,
+    colors2: npt.ArrayLike,
+    position: npt.ArrayLike,
+) -> npt.NDArray[np.uint32]:
+    """Return transition of every pair of colors in two arrays of 24 bit colors."""
+    colors1 = np.asarray(colors1, dtype=np.int64)
+    colors2 = np.asarray(colors2, dtype=np.int64)
+    r1, g1, b1 = colors1 >> 16, colors1 >> 8 & 0xFF, colors1 & 0xFF
+    r2, g2, b2 = colors2 >> 16, colors2 >> 8 & 0xFF, colors2 & 0xFF
+    r = (r1 + np.floor((r2 - r1) * position).astype(np.int64)) << 16
+    g = (g1 + np.floor((g2 - g1) * position).astype(np.int64)) << 8
+    b = b1 + np.floor((b2 - b1) * position).astype(np.int64)
+    return (r | g | b).astype(np.uint32)
+
+
 @cache
+def _paletteLookup() -> (
+    tuple[list[tuple[int, ...]], npt.NDArray[np.intp], npt.NDArray[np.int64]]
+):
+    """Return nearest palette color candidates for every color cell.
+
+    Colors are split in 32768 cells by the top 5 bits of each channel. A
+    palette color is a candidate for a cell when its smallest possible
+    delta to the cell is not larger than the largest possible delta of
+    the closest palette color. The nearest palette color of any color in
+    the cell, and every color tied with it, always passes that test, so
+    searching the candidates in ascending order gives the same index as
+    searching the whole PALETTE.
+
+    Returns candidates of every cell as tuples, the same candidates as
+    one array padded with index 256, and palette channels with a far
+    away sentinel color at index 256.
+    """
+    palette = np.array((*PALETTE, 0), dtype=np.int64)
+    channels = np.stack((palette >> 16, palette >> 8 & 0xFF, palette & 0xFF))
+    channels[:, -1] = 1 << 20
+
+    low = np.arange(0, 256, 8)[:, np.newaxis]
+    high = low + 7
+    values = channels[:, np.newaxis, :-1]
+    near = (values - np.clip(values, low, high)) ** 2
+    far = np.maximum((values - low) ** 2, (values - high) ** 2)
+
+    def cells(axes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        return (
+            axes[0][:, np.newaxis, np.newaxis]
+            + axes[1][np.newaxis, :, np.newaxis]
+            + axes[2][np.newaxis, np.newaxis, :]
+        ).reshape(32768, len(PALETTE))
+
+    isCandidate = cells(near) <= cells(far).min(axis=1, keepdims=True)
+
+    counts = isCandidate.sum(axis=1)
+    table = np.full((32768, counts.max()), len(PALETTE), dtype=np.intp)
+    table[np.arange(counts.max()) < counts[:, np.newaxis]] = np.nonzero(
+        isCandidate,
+    )[1]
+    candidates = [
+        tuple(row[:count])
+        for row, count in zip(table.tolist(), counts.tolist(), strict=True)
+    ]
+    return candidates, table, channels
+
+
 def to8Bit(color_24_bit: int) -> int:
     """Looks to 256-color OpenComputers PALETTE and returns the color index that most accurately matches given value using the same search method as in gpu.setBackground(value) do."""
     r, g, b = color_24_bit >> 16, color_24_bit >> 8 & 0xFF, color_24_bit & 0xFF
-    closestDelta, closestIndex = inf, 1
-    # Moved outside of loop from original
-    # See if 24 bit color perfectly matches a PALETTE color
-    if color_24_bit in PALETTE[1:]:
-        # If there is an entry of 24 bit color in PALETTE, return index minus 1 because we skip first entry.
-        return PALETTE.index(color_24_bit) - 1
-    # We ignore first one, so we need to shift PALETTE indexing by one
-    for i in range(1, len(PALETTE) - 1):
+    candidates = _paletteLookup()[0][r >> 3 << 10 | g >> 3 << 5 | b >> 3]
+    if len(candidates) == 1:
+        return candidates[0]
+
+    closestDelta, closestIndex = inf, 0
+    for i in candidates:
         palette_color = PALETTE[i]
 
         palette_r, palette_g, palette_b = (
@@ -163,7 +258,26 @@ def to8Bit(color_24_bit: int) -> int:
         )
         if delta < closestDelta:
             closestDelta, closestIndex = delta, i
-    return closestIndex - 1
+    return closestIndex
+
+
+def to8BitMany(colors: npt.ArrayLike) -> npt.NDArray[np.uint8]:
+    """Return to8Bit of every color in an array of 24 bit colors."""
+    _, table, channels = _paletteLookup()
+    colors = np.asarray(colors, dtype=np.int64)
+    rgb = (colors >> 16, colors >> 8 & 0xFF, colors & 0xFF)
+    candidates = table[rgb[0] >> 3 << 10 | rgb[1] >> 3 << 5 | rgb[2] >> 3]
+
+    delta = sum(
+        (channel[candidates] - value[..., np.newaxis]) ** 2
+        for channel, value in zip(channels, rgb, strict=True)
+    )
+    closest = np.take_along_axis(
+        candidates,
+        delta.argmin(axis=-1)[..., np.newaxis],
+        axis=-1,
+    )
+    return closest[..., 0].astype(np.uint8)
 
 
 def to24Bit(color_8_bit: int) -> int:
@@ -171,6 +285,17 @@ def to24Bit(color_8_bit: int) -> int:
     return PALETTE[color_8_bit]
 
 
+@cache
+def _paletteArray() -> npt.NDArray[np.uint32]:
+    """Return PALETTE as an array."""
+    return np.array(PALETTE, dtype=np.uint32)
+
+
+def to24BitMany(colors: npt.ArrayLike) -> npt.NDArray[np.uint32]:
+    """Return to24Bit of every index in an array of 8 bit colors."""
+    return _paletteArray()[np.asarray(colors, dtype=np.intp)]
+
+
 def RGBToHSB(r: int, g: int, b: int) -> tuple[float, float, float]:
     """Converts three color channels of the RGB color model to the HSB color model and returns the corresponding result."""
     maxv, minv = max(r, g, b), min(r, g, b)
@@ -224,6 +349,79 @@ def HSBToRGB(h: float, s: float, b: float) -> tuple[int, int, int]:
     return floor(b * 255), floor(p * 255), floor(q * 255)
 
 
+def RGBToHSBMany(
+    r: npt.ArrayLike,
+    g: npt.ArrayLike,
+    b: npt.ArrayLike,
+) -> tuple[
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+]:
+    """Return RGBToHSB of every color in arrays of red, green and blue channels.
+
+    Black has saturation 0 here, where RGBToHSB raises ZeroDivisionError.
+    """
+    r, g, b = np.broadcast_arrays(
+        *(np.asarray(c, np.int64) for c in (r, g, b)),
+    )
+    maxv = np.maximum(np.maximum(r, g), b)
+    minv = np.minimum(np.minimum(r, g), b)
+    # Keep unselected branches from dividing by zero
+    delta = np.where(maxv == minv, 1, maxv - minv)
+
+    h = np.select(
+        (
+            maxv == minv,
+            (maxv == r) & (g >= b),
+            maxv == r,
+            maxv == g,
+        ),
+        (
+            0.0,
+            60 * (g - b) / delta,
+            60 * (g - b) / delta + 360,
+            60 * (b - r) / delta + 120,
+        ),
+        60 * (r - g) / delta + 240,
+    )
+    s = np.where(maxv == 0, 0.0, 1 - minv / np.where(maxv == 0, 1, maxv))
+    return h, s, maxv / 255
+
+
+def HSBToRGBMany(
+    h: npt.ArrayLike,
+    s: npt.ArrayLike,
+    b: npt.ArrayLike,
+) -> tuple[
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+]:
+    """Return HSBToRGB of every color in arrays of hue, saturation and brightness."""
+    h, s, b = np.broadcast_arrays(
+        *(np.asarray(c, np.float64) for c in (h, s, b)),
+    )
+    fractional, integer = np.modf(h / 60)
+    p = np.floor(b * (1 - s) * 255).astype(np.int64)
+    q = np.floor(b * (1 - s * fractional) * 255).astype(np.int64)
+    t = np.floor(b * (1 - (1 - fractional) * s) * 255).astype(np.int64)
+    v = np.floor(b * 255).astype(np.int64)
+
+    sector = (
+        integer == 0,
+        integer == 1,
+        integer == 2,
+        integer == 3,
+        integer == 4,
+    )
+    return (
+        np.select(sector, (v, q, p, p, t), v),
+        np.select(sector, (t, v, v, q, p), p),
+        np.select(sector, (p, p, t, v, v), q),
+    )
+
+
 def integerToHSB(color: int) -> tuple[float, float, float]:
     """Convert an integer to an RGB value and then that into a HSB value."""
     return RGBToHSB(*integerToRGB(color))
@@ -234,7 +432,6 @@ def HSBToInteger(h: int, s: int, b: int) -> int:
     return RGBToInteger(*HSBToRGB(h, s, b))
 
 
-@lru_cache
 def optimize(color_24_bit: int) -> int:
     """Get a close approximation from the OC Color Palette of given 24 bit color."""
     return to24Bit(to8Bit(color_24_bit))
@@ -2,6 +2,10 @@
 # This library provides an event system for registering specific event handlers
 # -*- coding: utf-8 -*-
 
+import asyncio
+from heapq import heapify, heappop, heappush
+from inspect import iscoroutine
+from itertools import count
 from math import inf
 
 import computer
@@ -13,10 +17,13 @@ __all__ = [
     "interruptingEnabled",
     "lastInterrupt",
     "pull",
+    "pullAsync",
+    "pullBatch",
     "push",
     "removeHandler",
     "skip",
     "sleep",
+    "sleepAsync",
 ]
 
 FUNCTION = type(lambda: None)
@@ -28,12 +35,21 @@ FUNCTION = type(lambda: None)
 ##             56:True},
 ##         'push':computer.pushSignal}
 handlers = {}
+# Handlers without an interval by the signal name they run for, None for all
+signalHandlers = {}
+# Heap of (nextTriggerTime, order, handler) for handlers with an interval
+timerQueue = []
+timerOrder = count()
+# Tasks of coroutine handlers started by pullAsync, kept so they are not lost
+backgroundTasks = set()
 interruptingKeysDown = {}
 lastInterrupt = 0
 
 skipSignalTypes = []
 
 computerPullSignal = computer.pullSignal
+computerPullSignalAsync = computer.pullSignalAsync
+computerPullSignalBatch = computer.pullSignalBatch
 computerUptime = computer.uptime
 ##mathHuge = inf
 
@@ -53,23 +69,24 @@ def error(name, code=None):
 
 
 class Handler:
-    def __init__(self, callback, times=inf, interval=0):
+    def __init__(self, callback, times=inf, interval=0, signalName=None):
         self.callback = callback
         self.times = times  # or mathHuge
         self.interval = interval
-        self.nextTriggerTime = computerUptime() + interval
+        self.signalName = signalName
+        self.nextTriggerTime = computerUptime() + interval if interval else 0
 
     def __repr__(self):
-        return f"Handler({self.callback}, {self.times}, {self.interval})"
+        return f"Handler({self.callback}, {self.times}, {self.interval}, {self.signalName!r})"
 
 
 interruptingEnabled = True
 interruptingDelay = 1
-interruptingKeyCodes: [29, 46, 56]
+interruptingKeyCodes = (29, 46, 56)
 push = computer.pushSignal
 
 
-def addHandler(callback, interval=0, times=inf):
+def addHandler(callback, interval=0, times=inf, signalName=None):
     """Registers an event handler wrapper for given function and returns it.
 
     Every registered handler will be analyzed for the need to run during each pull() call. When handler is being run, it receives values returned from pull() as arguments.
@@ -77,14 +94,24 @@ def addHandler(callback, interval=0, times=inf):
     You can specify an interval in seconds between each run of given handler. By default it's set to nil, i.e. handler runs every pull() call without any delay.
 
     You can also specify number of times that given handler will be run before being removed automatically. By default it's set to infinity.
+
+    If signalName is given, handler only runs for signals with that name, so it does not have to filter them itself. Timed handlers skip their turn if the signal pulled when they are due has another name.
     """
     checkArg(callback, FUNCTION)
-    checkArg(interval, int)
+    checkArg(interval, (int, float))
     checkArg(times, (int, type(inf)))
+    checkArg(signalName, (str, type(None)))
 
-    handler = Handler(callback, times, interval)
+    handler = Handler(callback, times, interval, signalName)
 
     handlers[handler] = True
+    if handler.nextTriggerTime > 0:
+        heappush(
+            timerQueue,
+            (handler.nextTriggerTime, next(timerOrder), handler),
+        )
+    else:
+        signalHandlers.setdefault(signalName, {})[handler] = True
 
     return handler
 
@@ -93,8 +120,17 @@ def removeHandler(handler):
     """Tries to unregister created event handler. Returns true if it was registered and false otherwise."""
     checkArg(handler, Handler)
 
-    if handlers[handler]:
-        handlers[handler] = None
+    if handlers.pop(handler, None):
+        named = signalHandlers.get(handler.signalName)
+        if named and named.pop(handler, None) and not named:
+            del signalHandlers[handler.signalName]
+        # Timer entries of removed handlers are skipped when they come up,
+        # only rebuild the heap once most of it is stale
+        if len(timerQueue) > 2 * len(handlers) + 16:
+            timerQueue[:] = [
+                entry for entry in timerQueue if entry[2] in handlers
+            ]
+            heapify(timerQueue)
         return True
     return False, "Handler with given table is not registered."
 
@@ -109,70 +145,165 @@ def skip(signalType):
     skipSignalTypes.append(signalType)
 
 
+def nextTriggerTime():
+    """Return the uptime the next timed handler is due at, or inf if there are none."""
+    while timerQueue:
+        triggerTime, _, handler = timerQueue[0]
+        if handler in handlers and handler.nextTriggerTime == triggerTime:
+            return triggerTime
+        heappop(timerQueue)
+    return inf
+
+
+def runHandler(handler, signalData):
+    """Run handler with signalData and remove it once it has run out of times. Return what the callback returned."""
+    handler.times -= 1
+    if handler.times <= 0:
+        removeHandler(handler)
+    return handler.callback(*(signalData or ()))
+
+
+def startTask(coroutine):
+    """Run coroutine as a task on the running event loop."""
+    task = asyncio.get_running_loop().create_task(coroutine)
+    backgroundTasks.add(task)
+    task.add_done_callback(backgroundTasks.discard)
+
+
+def dispatchCoroutine(coroutine):
+    """Run coroutine returned by a handler during a blocking pull. Inside a running event loop it is started as a task on that loop, which cannot be blocked until it finishes. Otherwise it is run to completion."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(coroutine)
+    else:
+        startTask(coroutine)
+
+
+def processSignal(signalData, uptime, runCoroutine):
+    """Run the handlers due for signalData and check interrupting status. Coroutines returned by handlers are given to runCoroutine. Return if pull should return signalData."""
+    global lastInterrupt
+
+    # Handlers processing, only the ones registered for this signal
+    signalName = signalData[0] if signalData else None
+    dispatch = [*signalHandlers.get(None, ())]
+    if signalName is not None:
+        dispatch.extend(signalHandlers.get(signalName, ()))
+    results = [
+        runHandler(handler, signalData)
+        for handler in dispatch
+        if handler in handlers
+    ]
+
+    # Only timed handlers that are due come off the heap
+    while nextTriggerTime() <= uptime:
+        handler = heappop(timerQueue)[2]
+        matches = handler.signalName in (None, signalName)
+        if handler.times > 1 or not matches:
+            handler.nextTriggerTime = uptime + handler.interval
+            heappush(
+                timerQueue,
+                (handler.nextTriggerTime, next(timerOrder), handler),
+            )
+        if matches:
+            results.append(runHandler(handler, signalData))
+
+    for result in results:
+        if iscoroutine(result):
+            runCoroutine(result)
+
+    # Program interruption support. It's faster to do it here instead of registering handlers
+    if (
+        signalData
+        and interruptingEnabled
+        and signalData[0] in ("key_down", "key_up")
+    ):
+        # Analysing for which interrupting key is pressed - we don't need keyboard API for this
+        if signalData[3] in interruptingKeyCodes:
+            interruptingKeysDown[signalData[3]] = signalData[0] == "key_down"
+
+        shouldInterrupt = all(
+            interruptingKeysDown.get(keyCode)
+            for keyCode in interruptingKeyCodes
+        )
+
+        if shouldInterrupt and uptime - lastInterrupt > interruptingDelay:
+            lastInterrupt = uptime
+            error("interrupted", 0)
+    ##                raise KeyboardInterrupt()
+
+    # Loop-breaking condition
+    if signalData:
+        if signalData[0] in skipSignalTypes:
+            skipSignalTypes.remove(signalData[0])
+        else:
+            return True
+    return False
+
+
 def pull(preferredTimeout=None):
-    """Works the same way as computer.pullSignal(...) do, but also calls registered event handlers if needed and checks interrupting status."""
+    """Works the same way as computer.pullSignal(...) do, but also calls registered event handlers if needed and checks interrupting status. Coroutine handlers are run to completion, or started as tasks if an event loop is running."""
     uptime = computerUptime()
-    deadline = uptime + (preferredTimeout or mathHuge)
+    deadline = uptime + (inf if preferredTimeout is None else preferredTimeout)
 
-    while uptime < deadline:
+    while True:
         # Determine pullSignal timeout
-        timeout = deadline
-        for handler in pairs(handlers):
-            if handler.nextTriggerTime > 0:
-                timeout = min(timeout, handler.nextTriggerTime)
+        timeout = min(deadline, nextTriggerTime())
 
         # Pull signal data
-        signalData = [computerPullSignal(timeout - computerUptime())]
-
-        # Handlers processing
-        for handler in pairs(handlers):
-            if handler.times > 0:
-                uptime = computerUptime()
-
-                if handler.nextTriggerTime <= uptime:
-                    handler.times -= 1
-                    if handler.nextTriggerTime > 0:
-                        handler.nextTriggerTime = uptime + handler.interval
-
-                    # Callback running
-                    handler.callback(*signalData)
-            else:
-                handlers[handler] = None
-
-        # Program interruption support. It's faster to do it here instead of registering handlers
-        if signalData[0] == "key_down" or (
-            signalData[0] == "key_up" and interruptingEnabled
-        ):
-            # Analysing for which interrupting key is pressed - we don't need keyboard API for this
-            if signalData[3] in interruptingKeyCodes:
-                interruptingKeysDown[signalData[3]] = (
-                    True if signalData[0] == "key_down" else None
-                )
-
-            shouldInterrupt = True
-            for keyCode in interruptingKeyCodes:
-                if not interruptingKeysDown[keyCode]:
-                    shouldInterrupt = False
-
-            if shouldInterrupt and uptime - lastInterrupt > interruptingDelay:
-                error("interrupted", 0)
-        ##                raise KeyboardInterrupt()
-
-        # Loop-breaking condition
-        if signalData:
-            if signalData[0] in skipSignalType:
-                index = skipSignalType.index(signalData[0])
-                del skipSignalType[index]
-            else:
-                return signalData
-    return None
+        signalData = computerPullSignal(timeout - computerUptime())
+        uptime = computerUptime()
+
+        if processSignal(signalData, uptime, dispatchCoroutine):
+            return signalData
+        if uptime >= deadline:
+            return None
+
+
+def pullBatch(preferredTimeout=None):
+    """Works like pull(...), but also drains every other pending signal and returns them all as a list, so a redraw can follow a whole burst of input. Returns an empty list on timeout."""
+    signalData = pull(preferredTimeout)
+    if signalData is None:
+        return []
+
+    batch = [signalData]
+    for signalData in computerPullSignalBatch(0):
+        if processSignal(signalData, computerUptime(), dispatchCoroutine):
+            batch.append(signalData)
+    return batch
+
+
+async def pullAsync(preferredTimeout=None):
+    """Coroutine version of pull. Waits without blocking the event loop, and coroutine handlers are started as tasks on it."""
+    uptime = computerUptime()
+    deadline = uptime + (inf if preferredTimeout is None else preferredTimeout)
+
+    while True:
+        timeout = min(deadline, nextTriggerTime())
+
+        signalData = await computerPullSignalAsync(timeout - computerUptime())
+        uptime = computerUptime()
+
+        if processSignal(signalData, uptime, startTask):
+            return signalData
+        if uptime >= deadline:
+            return None
 
 
 # Sleeps "time" of seconds
 def sleep(time):
     """Sleeps delay seconds via busy-wait concept. This method allows event handlers to be processed if any event occurs during sleeping."""
-    checkArg(time, (int, float, None))
+    checkArg(time, (int, float, type(None)))
 
     deadline = computerUptime() + (time or 0)
     while computerUptime() < deadline:
         pull(deadline - computerUptime())
+
+
+async def sleepAsync(time):
+    """Coroutine version of sleep. Event handlers are processed while it waits."""
+    checkArg(time, (int, float, type(None)))
+
+    deadline = computerUptime() + (time or 0)
+    while computerUptime() < deadline:
+        await pullAsync(deadline - computerUptime())
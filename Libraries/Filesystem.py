@@ -37,14 +37,32 @@ __all__ = [
     "writeTable",
 ]
 
-import math
+import codecs
+import struct
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import Bit32 as bit32
 import component
+import computer
 import Event as event
 import Paths as paths
+import Proxy as _Proxy
 
 BUFFER_SIZE = 1024
+# Read blocks double on every refill up to this size
+MAX_BUFFER_SIZE = 1 << 20
+# Written data is collected until this many bytes are waiting
+FLUSH_SIZE = 1 << 16
+# struct format of unsigned numbers by byte width
+STRUCT_FORMATS = {2: "H", 4: "I", 8: "Q"}
+# How many files copy works on at once
+COPY_WORKERS = 8
+# Block size of copies between different filesystem components
+COPY_BLOCK_SIZE = MAX_BUFFER_SIZE
+# Compiled code of loaded files by path, with (modification time, size)
+_CODES = {}
 BOOT_PROXY = None  #'12512'
 mountedProxies = []  # {}
 
@@ -93,6 +111,20 @@ class _mountProxy:
         self.proxy = proxy
 
 
+class _mountNode:
+    """Mount tree node for one path component."""
+
+    __slots__ = ("children", "mount")
+
+    def __init__(self):
+        self.children = {}
+        self.mount = None
+
+
+# Mount points by path component, so lookups walk the path once
+_mountTree = _mountNode()
+
+
 def path(path_):
     """Returns parent path from given path."""
     return "/".join(path_.split("/")[:-1]) + "/"
@@ -134,51 +166,85 @@ def removeSlashes(path_):
     return "/".join([i for i in path_.split("/") if i != ""])
 
 
+def _mountNodes(path_):
+    """Return mount tree nodes from the root along given path, creating missing ones."""
+    nodes = [_mountTree]
+    for part in path_.split("/"):
+        if part:
+            nodes.append(nodes[-1].children.setdefault(part, _mountNode()))
+    return nodes
+
+
 def mount(proxy, path_):
     """Mounts passed filesystem component proxy table to specified path."""
     for mp in mountedProxies:
-        if mp.path == path_:
-            return (
-                False,
-                "Mount path has been taken by another mounted filesystem.",
-            )
         if mp.proxy == proxy:
             return False, "Proxy is already mounted."
+    node = _mountNodes(path_)[-1]
+    if node.mount is not None:
+        return (
+            False,
+            "Mount path has been taken by another mounted filesystem.",
+        )
 
-    mountedProxies.append(_mountProxy(path_, proxy))
+    node.mount = _mountProxy(path_, proxy)
+    mountedProxies.append(node.mount)
     return True, None
 
 
 def unmount(proxy):
     """Unmounts passed filesystem component proxy table or it's string address from mounted path."""
-    if isinstance(proxy, (dict, list, tuple)):
-        for i in range(len(mountedProxies)):
-            if mountedProxies[i].proxy == proxy:
-                del mountedProxies[i]
-                return True, None
-        return False, "Specified proxy is not mounted."
     if isinstance(proxy, str):
-        for i in range(len(mountedProxies)):
-            if mountedProxies[i].address == proxy:
-                del mountedProxies[i]
-                return True, None
-        return False, "Specified proxy address is not mounted."
-    ##    else:
-    error(
-        f"Bad argument (filesystem proxy or mounted path expected, got {proxy}).",
-    )
-    return None
+        for mp in mountedProxies:
+            if getattr(mp.proxy, "address", None) == proxy:
+                break
+        else:
+            return False, "Specified proxy address is not mounted."
+    else:
+        for mp in mountedProxies:
+            if mp.proxy == proxy:
+                break
+        else:
+            return False, "Specified proxy is not mounted."
+
+    mountedProxies.remove(mp)
+    nodes = _mountNodes(mp.path)
+    nodes[-1].mount = None
+    # Prune branches that lead to no other mount
+    parts = [part for part in mp.path.split("/") if part]
+    for parent, node, part in zip(
+        reversed(nodes[:-1]),
+        reversed(nodes[1:]),
+        reversed(parts),
+        strict=True,
+    ):
+        if node.children or node.mount is not None:
+            break
+        del parent.children[part]
+    return True, None
 
 
 def get(path_):
-    """Determines correct filesystem component proxy from given path and returns it with rest path part."""
+    """Determines correct filesystem component proxy from given path and returns it with rest path part. The deepest mount containing path wins, and rest path starts with a slash."""
     if not isinstance(path_, str):
-        print(path_)
         error("Invalid argument.")
-    for mp in mountedProxies:
-        if path_[: len(mp.path)] == mp.path:
-            return mp.proxy, path[len(mp.path) :]
-    return BOOT_PROXY, path_
+    node = _mountTree
+    # A proxy mounted at the root contains every path
+    found = node.mount
+    # Index just past the slash after the current part
+    index = 0
+    end = 1
+    for part in path_.split("/"):
+        index += len(part) + 1
+        if part:
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.mount is not None:
+                found, end = node.mount, index
+    if found is None:
+        return BOOT_PROXY, path_
+    return found.proxy, path_[end - 1 :] or "/"
 
 
 def mounts():
@@ -222,62 +288,53 @@ def remove(path_):
     return proxy.remove(proxyPath)
 
 
-def list_(path_, sortingMethod=SORTING_NAME):
-    """Tries to get list of files and directories from given path. Returns table with list on success, False and reason message otherwise."""
+def _typeKey(entry):
+    """Return sorting key of a directory entry that groups entries by extension, directories first."""
+    if entry.isDirectory and "." not in entry.name:
+        extension_ = "."
+    else:
+        extension_ = extension(entry.name) or "Z"
+    return extension_.lower(), entry.name.lower()
+
+
+def _scan(path_):
+    """Hidden function to get entries of files and directories from given path, including filesystems mounted in it. Returns True and list of entries on success, False and reason message otherwise."""
     proxy, proxyPath = get(path_)
 
-    list__, reason = proxy.list(proxyPath)
-    ##    list_, reason = ['computer.py', 'Event.py', 'py', 'Screen.py', 'Color.py', '__pycache__', 'Paths.py'], None
+    success, entries = proxy.scan(proxyPath)
+    if not success:
+        return False, entries
+    entries = [*entries]
+
+    # Fill list with mounted paths if needed
+    node = _mountTree
+    for part in path_.split("/"):
+        if part and node is not None:
+            node = node.children.get(part)
+    if node is not None:
+        for part, child in node.children.items():
+            if child.mount is not None:
+                entries.append(_Proxy.DirectoryEntry(part + "/", True, 0, 0))
+    return True, entries
 
-    if not reason and list__:
-        # Fill list with mounted paths if needed
-        for mp in mountedProxies:
-            if path_ == path(mp.path):
-                list__.append(name(mp.path))
-
-        # Apply sorting methods
-        if sortingMethod == SORTING_NAME:
-            list__.sort(lambda a, b: a.lower() < b.lower())
-            return list__, None
-        if sortingMethod == SORTING_DATE:
-            list__.sort(
-                lambda a, b: lastModified(path_ + a) > lastModified(path_ + b),
-            )
-            return list__, None
-        if sortingMethod == SORTING_TYPE:
-            # Create a map with "extension" structure
-            map_ = {}
-            for file in list__:
-                if "." not in file and isDirectory(path_ + file):
-                    extention_ = "."
-                else:
-                    extention_ = extension(file) or "Z"
-
-                if extention_ not in map_:
-                    map_[extention_] = []
-                map_[extention_].append(file)
-
-            # Sort lists for each extension
-            extensions = {}
-            for key, value in pairs(map_):
-                value.sort(lambda a, b: a.lower() < b.lower())
-
-                extensions[key] = value
-
-            # Sort extensions
-            keys = list(extensions.keys())
-            keys.sort(lambda a, b: a.lower() < b.lower())
-
-            # Create final list:
-            list__ = []
-            for key in keys:
-                for value in extensions[key]:
-                    list__.append(value)
-
-            return list__, None
-        ##        else:
-        reason = "No sorting method given."
-    return list__, reason
+
+def list_(path_, sortingMethod=SORTING_NAME):
+    """Tries to get list of files and directories from given path. Returns table with list on success, False and reason message otherwise. Names, types and dates come from one cached pass over the directory."""
+    success, entries = _scan(path_)
+    if not success:
+        return False, entries
+
+    # Apply sorting methods
+    if sortingMethod == SORTING_NAME:
+        entries.sort(key=lambda entry: entry.name.lower())
+    elif sortingMethod == SORTING_DATE:
+        # Newest first
+        entries.sort(key=lambda entry: entry.lastModified, reverse=True)
+    elif sortingMethod == SORTING_TYPE:
+        entries.sort(key=_typeKey)
+    else:
+        return [entry.name for entry in entries], "No sorting method given."
+    return [entry.name for entry in entries], None
 
 
 # I/O methods
@@ -294,15 +351,51 @@ def _getForMode(string_, mode):
 ##    return str(string_)
 
 
+def _toString(data):
+    """Return data decoded as UTF-8 if it is binary."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return str(data, "utf-8")
+    return data
+
+
+def _toBytes(data):
+    """Return data encoded as UTF-8 if it is not binary. Numbers and booleans are written as text, like Lua's tostring does."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data
+    if isinstance(data, bool):
+        data = "true" if data else "false"
+    return str(data).encode("utf-8")
+
+
 class _Handle:
-    def __init__(self, proxy, stream, mode="r"):
+    def __init__(
+        self,
+        proxy,
+        stream,
+        mode="r",
+        bufferSize=BUFFER_SIZE,
+        flushSize=FLUSH_SIZE,
+    ):
         self.proxy = proxy
         self.stream = stream
         self.mode = mode
+        self.binary = "b" in mode or "m" in mode
+        self.mapped = "m" in mode
         self.position = 0
+        # Read data is consumed by moving offset, never by slicing buffer
         self.buffer = ""
-        if "b" in self.mode:
+        if self.binary:
             self.buffer = b""
+        if self.mapped:
+            # The whole file is already in memory
+            self.buffer = stream
+        if "r" not in self.mode:
+            # Writes are combined here until flushSize bytes are waiting
+            self.buffer = bytearray()
+        self.offset = 0
+        self.bufferSize = bufferSize
+        self.blockSize = bufferSize
+        self.flushSize = flushSize
 
     def seek(self, position="cur", offset=0):
         """Sets or gets the handle position, measured from the beginning of the file, to the position given by offset plus a base specified by the string whence, as follows:
@@ -313,98 +406,109 @@ class _Handle:
 
         The default value for whence is "cur", and for offset is 0. If seek was successful, returns the final file position, measured in bytes from the beginning of the file. Otherwise it returns nil and string reason.
         """
+        if "r" not in self.mode:
+            self.flush()
+        if self.mapped:
+            return self._seekMapped(position, offset)
         if position == "set":
-            result, reason = self.proxy.seek(self.stream, "set", offset)
+            success, result = self.proxy.seek(self.stream, "set", offset)
         elif position == "cur":
-            result, reason = self.proxy.seek(
+            success, result = self.proxy.seek(
                 self.stream,
                 "set",
                 self.position + offset,
             )
         elif position == "end":
-            result, reason = self.proxy.seek(self.stream, "end", offset)
+            success, result = self.proxy.seek(self.stream, "end", offset)
         else:
             error(
                 f"Bad argument #2 ('set', 'cur', or 'end' expected, got {position})",
             )
-        if reason is None:
+        if success:
             self.position = result
-            self.buffer = ""
+            self._dropBuffer()
             return result  # , reason
-        error(f"{reason}")
+        error(f"{result}")
         return None
 
+    def _seekMapped(self, position, offset):
+        """Move the read offset of a mapped file."""
+        base = {"set": 0, "cur": self.position, "end": len(self.buffer)}
+        if position not in base:
+            error(
+                f"Bad argument #2 ('set', 'cur', or 'end' expected, got {position})",
+            )
+        result = base[position] + offset
+        if result < 0:
+            error("Invalid offset.")
+        self.position = self.offset = result
+        return result
+
+    def _dropBuffer(self):
+        """Forget buffered data and start over with small blocks."""
+        self.buffer = self.buffer[0:0]
+        self.offset = 0
+        self.blockSize = self.bufferSize
+
+    def _fill(self, count):
+        """Read blocks until at least count unread units are buffered or EOF is reached. Returns how many unread units are buffered."""
+        while len(self.buffer) - self.offset < count and not self.mapped:
+            success, chunk = self.proxy.read(self.stream, self.blockSize)
+            if not success:
+                error(chunk)
+            if not chunk:
+                break
+            # Drop consumed data once per block
+            self.buffer = self.buffer[self.offset :] + chunk
+            self.offset = 0
+            # Sequential reads get bigger blocks
+            self.blockSize = min(self.blockSize * 2, MAX_BUFFER_SIZE)
+        return len(self.buffer) - self.offset
+
     def close(self):
-        """Closes file stream, flushes internal buffer and releases the handle."""
-        if "w" in self.mode and len(self.buffer) > 0:
-            self.proxy.write(self.stream, self.buffer)
+        """Closes file stream, flushes internal buffer and releases the handle. Returns True, None on success, False and reason message if flushing failed."""
+        result = True, None
+        if "r" not in self.mode:
+            result = self.flush()
 
         self.proxy.close(self.stream)
+        return result
 
     def readString(self, count):
         """Reads string with length of given count of bytes. Returns string value or None if EOF has reached."""
-        # If current buffer content is a "part" of "count data" we need to read
-        if count > len(self.buffer):
-            data = self.buffer
-
-            while len(data) < count:
-                chunk, error_ = self.proxy.read(self.stream, BUFFER_SIZE)
-                if error_:
-                    error(error_)
-
-                if chunk:
-                    data += chunk
-                else:
-                    self.position = self.seek("end", 0)
-
-                    # EOF at start
-                    ##                    if len(data) == 0:
-                    if data == "":
-                        print("EOF")
-                        return None
-                    # EOF after read
-                    return data
-
-            self.buffer = data[count:]  # -1
-            chunk = data[:count]
-            self.position += len(chunk)
-
-            return chunk
-        data = self.buffer[:count]
-        self.buffer = self.buffer[count:]
-        self.position += count
-
+        end = self.offset + count
+        if end > len(self.buffer):
+            available = self._fill(count)
+            if available == 0:
+                return None
+            end = self.offset + min(count, available)
+        data = self.buffer[self.offset : end]
+        self.position += end - self.offset
+        self.offset = end
         return data
 
     def readLine(self):
         r"""Reads next line from file without \n character. Returns string line or None if EOF has reached."""
-        data = _getForMode("", self.mode)
-
-        linebreak = _getForMode("\n", self.mode)
+        linebreak = b"\n" if self.binary else "\n"
+        # How much of the unread buffer has no line break
+        scanned = 0
         while True:
-            if len(self.buffer) > 0:
-                eofidx = self.buffer.find(linebreak)
-                if eofidx >= 0:
-                    chunk = self.buffer[:eofidx]
-                    self.buffer = self.buffer[eofidx:]
-                    self.position += len(chunk)
-
-                    ##                    return data + chunk
-                    return string.char(data + chunk)
-                data += self.buffer
-
-            chunk, error_ = self.proxy.read(self.stream, BUFFER_SIZE)
-            if error_:
-                error(error_)
-            if chunk:
-                self.buffer = chunk
-                self.position += len(chunk)
-            else:  # EOF
-                data = self.buffer
-                self.position = self.seek("end", 0)
-
-                ##                return len(data) > 0 and data or None
-                return (len(data) > 0 and string.char(data)) or None
+            end = self.buffer.find(linebreak, self.offset + scanned)
+            if end >= 0:
+                data = self.buffer[self.offset : end]
+                self.position += end + 1 - self.offset
+                self.offset = end + 1
+                return _toString(data)
+
+            scanned = len(self.buffer) - self.offset
+            if self._fill(scanned + 1) == scanned:
+                # EOF, the rest is the last line
+                if scanned == 0:
+                    return None
+                data = self.buffer[self.offset :]
+                self.position += scanned
+                self.offset = len(self.buffer)
+                return _toString(data)
 
     def lines(self):
         """Return a generator object that will return lines, and on EOF close self."""
@@ -412,74 +516,123 @@ class _Handle:
         def lineGen():
             while True:
                 line = self.readLine()
-                if line:
-                    yield line
-                else:
+                if line is None:
                     break
+                yield line
             self.close()
-            raise StopIteration
 
         ##            return None
         return lineGen
 
     def readAll(self):
         """Reads whole file as string. Returns string data if reading operation was successful, None and reason message otherwise."""
-        data = _getForMode("", self.mode)
-        while True:
-            chunk, error_ = self.proxy.read(self.stream, BUFFER_SIZE)
-            if error_:
-                error(error_)
-
-            if chunk:
-                data += chunk
-            else:
-                self.position = self.seek("end", 0)
-                break
+        if self.mapped:
+            # Decode straight from the mapping without copying it first
+            with memoryview(self.buffer) as view:
+                with view[self.offset :] as rest:
+                    data = str(rest, "utf-8")
+            self.position = self.offset = len(self.buffer)
+            return data
+
+        success, rest = self.proxy.read(self.stream, -1)
+        if not success:
+            error(rest)
+        data = self.buffer[self.offset :] + rest
+        self.position += len(data)
+        self._dropBuffer()
         ##        return data
-        return string.char(data)
+        return _toString(data)
 
     def readBytes(self, count, littleEndian=False):
         """Reads number represented by count of bytes in big endian format by default or little endian if desired. Returns int value or None if EOF has reached."""
-        if count == 1:
-            data = self.readString(1)
-            if data:
-                return ord(data)
-            return None
-
-        def lst(x):
-            return [i for i in x]
-
-        bytes_ = lst(string.byte(self.readString(count))[:8]) or b"\x00"
-        result = 0
-
-        if littleEndian:
-            for i in range(len(bytes_) - 1, -1, -1):
-                result = bit32.bor(bit32.lshift(result, 8), bytes_[i])
+        offset = self.offset
+        end = offset + count
+        if end > len(self.buffer):
+            data = self.readString(count)
+            if data is None:
+                return None
+        elif count == 1:
+            value = self.buffer[offset]
+            self.offset = end
+            self.position += 1
+            # Text handles buffer str
+            return value if isinstance(value, int) else ord(value)
         else:
-            for i in range(len(bytes_)):
-                result = bit32.bor(bit32.lshift(result, 8), bytes_[i])
-        return result
+            data = self.buffer[offset:end]
+            self.offset = end
+            self.position += count
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return int.from_bytes(data, "little" if littleEndian else "big")
+
+    def readBytesArray(self, count, width=1, littleEndian=False):
+        """Reads count numbers represented by width bytes each, like readBytes. Returns list of int values, shorter if EOF has reached, or None if EOF has reached before the first one."""
+        size = count * width
+        if self.offset + size > len(self.buffer):
+            count = min(count, self._fill(size) // width)
+            if count == 0 < size:
+                return None
+            size = count * width
+        if not self.binary:
+            data = self.readString(size).encode("utf-8")
+            offset = 0
+        else:
+            data = self.buffer
+            offset = self.offset
+            self.offset += size
+            self.position += size
+
+        if width == 1:
+            # The list name is rebound to list_ at the end of this module
+            return [*data[offset : offset + size]]
+        order = "<" if littleEndian else ">"
+        if width in STRUCT_FORMATS:
+            return [
+                *struct.unpack_from(
+                    f"{order}{count}{STRUCT_FORMATS[width]}",
+                    data,
+                    offset,
+                ),
+            ]
+        byteorder = "little" if littleEndian else "big"
+        return [
+            int.from_bytes(data[start : start + width], byteorder)
+            for start in range(offset, offset + size, width)
+        ]
 
     def readUnicodeChar(self):
-        """Reads next bytes (up to 6 from current position) as char in UTF-8 encoding. Returns string value or nil if EOF has reached."""
-        byteArray = [
-            string.byte(self.readString(1)),
-        ]  # bytearray(bytes(self.readString(1)))
-
-        nullBitPos = 0
-        for i in range(1, 7):
-            # Added indexing zeroth to zero.
-            if bit32.band(bit32.rshift(byteArray[0][0], 7 - i), 0x1) == 0x0:
-                nullBitPos = i
+        """Reads next bytes (up to 6 from current position) as char in UTF-8 encoding. Returns string value or None if EOF has reached, also in the middle of the char. Raises UnicodeDecodeError if the bytes are not UTF-8."""
+        lead = self.readString(1)
+        if lead is None or not self.binary:
+            return lead
+        # Lead byte of a multibyte char starts with one 1 bit per byte
+        if lead[0] >= 0xC0:
+            length = 2
+            while length < 6 and lead[0] & (0x80 >> length):
+                length += 1
+            rest = self.readString(length - 1) or b""
+            if len(rest) < length - 1:
+                # EOF has reached in the middle of the char
+                return None
+            lead += rest
+        return lead.decode("utf-8")
+
+    def readUnicodeChars(self, count):
+        """Reads next count chars in UTF-8 encoding. Returns string value, shorter if EOF has reached, or None if EOF has reached before the first char."""
+        if not self.binary:
+            return self.readString(count)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        chars = ""
+        while len(chars) < count:
+            # Every missing char is at least one byte, so this never
+            # reads past the last char wanted
+            data = self.readString(count - len(chars))
+            if data is None:
+                # Bytes of a char cut off by EOF are left out
                 break
-
-        for i in range(1, nullBitPos - 2):
-            byte = string.byte(self.readString(1))
-            byteArray.append(byte)  # bytes(self.readString(1)))
-
-        fullbytes = b"".join(byteArray)
-
-        return "".join([chr(int(i)) for i in fullbytes])
+            chars += decoder.decode(data)
+        return chars or None
 
     def read(self, format_, bytesSize=1):
         """Read from this handle in a given format."""
@@ -499,132 +652,239 @@ class _Handle:
             if format_ == "u":
                 return self.readUnicodeChar()
             error(
-                f"Bad argument #2 ('a' (whole file), 'l' (line), 'u' (unicode char), 'b' (byte as number) or 'bs' (sequence of n bytes as number) expected, got {type(_format)})",
+                f"Bad argument #2 ('a' (whole file), 'l' (line), 'u' (unicode char), 'b' (byte as number) or 'bs' (sequence of n bytes as number) expected, got {format_!r})",
             )
         error(f"Bad argument #1 (int or str expected, got {type(format_)}).")
         return None
 
-    def write(self, *write_):
-        """Writes passed arguments to file. Returns True, None on success, False and reason message otherwise. Arguments may have str, int, or bool type."""
-        blank = _getForMode("", self.mode)
-        data = blank.join(_getForMode(thing, self.mode) for thing in write_)
-
-        # If data is small enough to fit in a buffer
-        if len(data) < (BUFFER_SIZE - len(self.buffer)):
-            self.buffer += data
-            # Ok to exit because close writes additional data.
+    def flush(self):
+        """Writes internal buffer to file with a single call. Returns True, None on success, False and reason message otherwise."""
+        # Handles for reading hold read data in the buffer
+        if "r" in self.mode or not self.buffer:
             return True, None
-        ##        else:
-        # Write current buffer content
-        success, reason = self.proxy.write(self.stream, self.buffer)
+        data = self.buffer
+        if not self.binary:
+            data = data.decode("utf-8")
+        success, reason = self.proxy.write(self.stream, data)
+        # Streams do not keep written data, so it is safe to reuse
+        self.buffer.clear()
         if success:
-            # If data will not fit in buffer, use iterative writing with data partitioning
-            if len(data) > BUFFER_SIZE:
-                for i in range(
-                    0,
-                    math.ceil(len(data) / BUFFER_SIZE),
-                    BUFFER_SIZE,
-                ):
-                    ##                    print(data[i:i+BUFFER_SIZE])
-                    success, reason = self.proxy.write(
-                        self.stream,
-                        data[i : i + BUFFER_SIZE],
-                    )
-
-                    if not success:
-                        break
-
-                # Clear buffer reserving type.
-                self.buffer = self.buffer[0:0]
-
-                return success, reason
-            ##            else:
-            # Data will perfectaly fit into an empty buffer
-            # First clear buffer though to preserve type.
-            self.buffer = self.buffer[0:0] + data
             return True, None
-        ##        else:
         return False, reason
 
+    def write(self, *write_):
+        """Writes passed arguments to file. Returns True, None on success, False and reason message otherwise. Arguments may have str, bytes, int, or bool type."""
+        if "r" in self.mode:
+            return False, "Stream is not writable."
+        buffer = self.buffer
+        for thing in write_:
+            buffer += _toBytes(thing)
+
+        if len(buffer) >= self.flushSize:
+            return self.flush()
+        # Ok to exit because close writes additional data.
+        return True, None
+
     def writeBytes(self, *args):
         """Writes passed numbers in [0; 255] range as bytes to file. Returns True, None on success, False and reason message otherwise."""
-        ##        if len(args) > 1:
-        ##            print([string.byte(i) for i in args])
-        return self.write(
-            *[string.byte(i) for i in args],
-        )  # b''.join(bytearray(args)).decode('utf-8'))
+        self.buffer.extend(args)
+
+        if len(self.buffer) >= self.flushSize:
+            return self.flush()
+        return True, None
 
     def __bool__(self):
         return True
 
 
-def open_(path_, mode):
-    """Opens a file at the specified path for reading or writing with specified string mode. By default, mode is r. Possible modes are: r, rb, w, wb, a and ab. If file has been opened, returns file handle table or None and string error otherwise.
+def open_(path_, mode, bufferSize=BUFFER_SIZE, flushSize=FLUSH_SIZE):
+    """Opens a file at the specified path for reading or writing with specified string mode. By default, mode is r. Possible modes are: r, rb, rm, w, wb, a and ab. Mode rm reads a binary file mapped into memory, without copying it through buffers. If file has been opened, returns file handle table or None and string error otherwise. Reads start with blocks of bufferSize bytes, which grow while the file is read in order. Writes are sent to the file once flushSize bytes are waiting.
 
     Independent of mode, every handle will have a close and seek methods
     """
-    if mode not in ("r", "rb", "w", "wb", "a", "ab"):
+    if mode not in ("r", "rb", "rm", "w", "wb", "a", "ab"):
         error(
-            f"Bad argument #2 ('a' (whole file), 'l' (line), 'u' (unicode char), 'b' (byte as number) or 'bs' (sequence of n bytes as number) expected, got {type(_format)})",
+            f"Bad argument #2 ('r', 'rb', 'rm', 'w', 'wb', 'a' or 'ab' expected, got {mode})",
         )
     proxy, proxyPath = get(path_)
-    stream, reason = proxy.open(proxyPath, mode)
+    if mode == "rm":
+        success, stream = proxy.mmap(proxyPath)
+    else:
+        success, stream = proxy.open(proxyPath, mode)
 
-    if stream:
-        handle = _Handle(proxy, stream, mode=mode)
+    if success:
+        handle = _Handle(proxy, stream, mode, bufferSize, flushSize)
         return handle, None
     ##    else:
-    return None, reason
+    return None, stream
+
+
+def _mergeProgress(queued, pushed):
+    """Hidden function to keep only the latest of consecutive progress signals of the same copy or move."""
+    if queued[:2] == pushed[:2]:
+        return pushed
+    return None
+
+
+def _walk(fromPath, toPath, directories, files, mounts=True):
+    """Hidden function to collect (fromPath, toPath) of directories and (fromPath, toPath, size) of files below fromPath with one pass, parents before their children. Filesystems mounted inside are only included if mounts is True. Returns True, None on success, False and reason message otherwise."""
+    success, entries = _scan(fromPath)
+    if not success:
+        return False, entries
+    directories.append((fromPath, toPath))
+    for entry in entries:
+        # Only mounted filesystems are listed with a trailing slash
+        if not mounts and entry.name.endswith("/"):
+            continue
+        name_ = entry.name.rstrip("/")
+        fromItem = f"{fromPath.rstrip('/')}/{name_}"
+        toItem = f"{toPath.rstrip('/')}/{name_}"
+        if entry.isDirectory:
+            success, reason = _walk(
+                fromItem,
+                toItem,
+                directories,
+                files,
+                mounts,
+            )
+            if not success:
+                return False, reason
+        else:
+            files.append((fromItem, toItem, entry.size))
+    return True, None
+
+
+def _copyFile(fromPath, toPath):
+    """Hidden function to copy one file. Returns True, None on success, False and reason message otherwise."""
+    fromProxy, fromProxyPath = get(fromPath)
+    toProxy, toProxyPath = get(toPath)
+
+    # The same filesystem component copies without reading into handles
+    if fromProxy.address == toProxy.address:
+        return fromProxy.copy(fromProxyPath, toProxyPath)
+
+    fromHandle, reason = open_(fromPath, "rb", COPY_BLOCK_SIZE)
+    if fromHandle is None:
+        return False, reason
+    toHandle, reason = open_(toPath, "wb", flushSize=1)
+    if toHandle is None:
+        fromHandle.close()
+        return False, reason
+
+    result = True, None
+    while result[0]:
+        chunk = fromHandle.readString(COPY_BLOCK_SIZE)
+        if chunk is None:
+            break
+        result = toHandle.write(chunk)
+    fromHandle.close()
+    closed = toHandle.close()
+    if not result[0]:
+        return False, "Cannot write chunk."
+    return closed
+
+
+def _moveFile(fromPath, toPath):
+    """Hidden function to copy one file and remove the original once it is copied. Returns True, None on success, False and reason message otherwise."""
+    success, reason = _copyFile(fromPath, toPath)
+    if not success:
+        return False, reason
+    proxy, proxyPath = get(fromPath)
+    # The data is safe at toPath, so there is nothing to ask about
+    return proxy.remove(proxyPath, False)
+
+
+def _transfer(fromPath, toPath, move):
+    """Hidden function to copy or move file or directory from first path to second one, file by file with COPY_WORKERS threads. Pushes copy_progress or move_progress signals with both paths, bytes done and bytes in total after every file. Returns True, None on success, False and reason message otherwise."""
+    if not exists(fromPath):
+        return False, "File does not exist."
+    directories = []
+    if not isDirectory(fromPath):
+        files = [(fromPath, toPath, size(fromPath)[1])]
+    else:
+        files = []
+        success, reason = _walk(
+            fromPath,
+            toPath,
+            directories,
+            files,
+            not move,
+        )
+        if not success:
+            return False, reason
+
+    # Directories left by an earlier, interrupted transfer are reused
+    for _, directory in directories:
+        if not isDirectory(directory):
+            success, reason = makeDirectory(directory)
+            if not success:
+                return False, reason
+
+    signalName = "move_progress" if move else "copy_progress"
+    transferFile = _moveFile if move else _copyFile
+    total = sum(fileSize for _, _, fileSize in files)
+    done = 0
+    result = True, None
+    with ThreadPoolExecutor(COPY_WORKERS) as executor:
+        futures = {
+            executor.submit(transferFile, fromItem, toItem): fileSize
+            for fromItem, toItem, fileSize in files
+        }
+        for future in as_completed(futures):
+            success, reason = future.result()
+            if not success:
+                if result[0]:
+                    result = False, reason
+                continue
+            done += futures[future]
+            event.push(signalName, fromPath, toPath, done, total)
+
+    if move and result[0]:
+        # Children before their parents
+        for directory, _ in reversed(directories):
+            proxy, proxyPath = get(directory)
+            success, reason = proxy.remove(proxyPath, False)
+            if not success:
+                return False, reason
+    return result
 
 
 def copy(fromPath, toPath):
-    """Tries to copy file from first path to second one. Returns True on success, False and reason message otherwise."""
-
-    def copyRecursively(fromPath, toPath):
-        if isDirectory(fromPath):
-            makeDirectory(toPath)
-
-            list__ = list_(fromPath)
-            for item in list__:
-                copyRecursively(f"{fromPath}/{item}", f"{toPath}/{item}")
-            return None
-        fromHandle = open_(fromPath, "rb")
-        if fromHandle:
-            toHandle = open_(toPath, "wb")
-            if toHandle:
-                while True:
-                    chunk = fromHandle.readString(BUFFER_SIZE)
-                    if chunk:
-                        if not toHandle.write(chunk):
-                            return False, "Cannot write chunk."
-                    else:
-                        toHandle.close()
-                        fromHandle.close()
-                        break
-            return False, f'Cannot acquire handle for path "{toPath}"'
-        return False, f'Cannot acquire handle for path "{fromHandle}"'
-
-    return copyRecursively(fromPath, toPath)
+    """Tries to copy file or directory from first path to second one. Returns True on success, False and reason message otherwise.
+
+    The tree is walked once, then its files are copied by COPY_WORKERS threads. After every copied file a copy_progress signal is pushed with the two paths, bytes copied so far and bytes in total. Consecutive progress signals of the same copy are coalesced in the queue.
+    """
+    return _transfer(fromPath, toPath, False)
 
 
 def rename(fromPath, toPath):
-    """Tries to rename file or directory from first path to second one. Returns True on success, False and reason message otherwise."""
+    """Tries to rename file or directory from first path to second one. Returns True on success, False and reason message otherwise.
+
+    Paths on different filesystem components stored on the same host device are renamed atomically too. Otherwise, or if the host refuses that rename, every file is copied and then removed on its own, pushing move_progress signals like the copy_progress ones of copy. If a move is interrupted, renaming again moves what is left.
+    """
     fromProxy, fromProxyPath = get(fromPath)
     toProxy, toProxyPath = get(toPath)
 
     # If it's the same filesystem component
     if fromProxy.address == toProxy.address:
         return fromProxy.rename(fromProxyPath, toProxyPath)
-    # Copy files to destination
-    copy(fromPath, toPath)
-    # Remove original files
-    remove(fromPath)
-    return None
+    success, fromDevice = fromProxy.device(fromProxyPath)
+    if not success:
+        return False, fromDevice
+    success, toDevice = toProxy.device(toProxyPath)
+    # Every proxy keeps its files on the host filesystem, so one on the
+    # same device can usually rename into another
+    if success and fromDevice == toDevice:
+        success, _ = fromProxy.rename(fromProxyPath, toProxyPath)
+        if success:
+            return True, None
+        # Bind mounts share a device but still refuse renames between them
+    return _transfer(fromPath, toPath, True)
 
 
 def read(path_):
     """Reads whole file as string. Returns string data, None if reading operation was successful, None and reason message otherwise."""
-    handle, reason = open_(path_, "rb")
+    handle, reason = open_(path_, "rm")
     if reason is None:
         data = handle.readAll()
         handle.close()
@@ -674,8 +934,10 @@ def _writeOrAppend(append, path_, *write):
     # append and 'ab' or 'wb')
     if handle:
         result, reason = handle.write(*write)
-        handle.close()
+        closed = handle.close()
 
+        if result:
+            return closed
         return result, reason
     return False, reason
 
@@ -723,35 +985,56 @@ def getProxy():
 
 
 def loadfile(path_):
-    """Load file from path as a module."""
-    data, reason = read(path_)
-    if data:
-        moduleName = hideExtension(path_)
-        with open(moduleName + ".py", mode="w") as writeFile:
-            writeFile.write(data)
-            writeFile.close()
-        import importlib
-        import os
-
-        module = importlib.import_module(moduleName)
-        os.remove(moduleName + ".py")
-        del os, importlib
-        ##        exec(f'global {moduleName}')
-        ##        exec(f'{moduleName} = module')
-        return module, None
-    return None, reason
+    """Load file from path as a module. Returns module on success, None and reason message otherwise. Compiled code is cached by path, modification time and size, so loading an unchanged file again only runs it. Like an import, the module is registered in sys.modules under the file name without extension."""
+    proxy, proxyPath = get(path_)
+    # Files may be edited outside of Proxy, so never trust cached stats
+    proxy.forget(proxyPath)
+    success, fileSize = proxy.size(proxyPath)
+    if not success:
+        return None, fileSize
+    modified, reason = proxy.lastModified(proxyPath)
+    if reason is not None:
+        return None, reason
+
+    key = modified, fileSize
+    cached = _CODES.get(path_)
+    if cached is not None and cached[0] == key:
+        code = cached[1]
+    else:
+        data, reason = read(path_)
+        if reason is not None:
+            return None, reason
+        try:
+            code = compile(data, path_, "exec")
+        except SyntaxError as exception:
+            return None, str(exception)
+        # A change within the same second could keep both time and size
+        if time.time() - modified > 1:
+            _CODES[path_] = key, code
+
+    module = types.ModuleType(hideExtension(name(path_)))
+    module.__file__ = path_
+    # dataclasses, typing and pickle look modules up by name
+    sys.modules[module.__name__] = module
+    try:
+        # Running the file is what loading it means
+        exec(code, module.__dict__)  # noqa: S102
+    except BaseException:
+        # Like a failed import, leave no half run module behind
+        sys.modules.pop(module.__name__, None)
+        raise
+    return module, None
 
 
 def doFile(path_, *args, **kwargs):
-    """Execute a given file from path with arguments."""
-    result, reason = loadfile(path_)
-    if result:
-        data = result(*args, **kwargs)
-        if data:
-            return data[1]
-        error(data[1])
-    error(reason)
-    return None
+    """Execute a given file from path with arguments. Returns what the main function of the file returns when given the arguments, or the module if it has no main function."""
+    module, reason = loadfile(path_)
+    if module is None:
+        error(reason)
+    main = getattr(module, "main", None)
+    if callable(main):
+        return main(*args, **kwargs)
+    return module
 
 
 BOOT_PROXY = component.BOOT_PROXY
@@ -769,7 +1052,10 @@ def _addRemoveComponents(signal, address, type_):
         unmount(address)
 
 
-event.addHandler(_addRemoveComponents)
+computer.setCoalescing("copy_progress", _mergeProgress)
+computer.setCoalescing("move_progress", _mergeProgress)
+event.addHandler(_addRemoveComponents, signalName="component_added")
+event.addHandler(_addRemoveComponents, signalName="component_removed")
 
 list = list_
 open = open_
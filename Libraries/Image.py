@@ -4,15 +4,17 @@
 
 # load('/MineOS/Pictures/AhsokaTano.pic')
 
+from __future__ import annotations
+
 import math
-import random
 
 import Bit32 as bit32
 import Color as color
-import computer
 import Filesystem as filesystem
+import numpy as np
 
 __all__ = [
+    "Picture",
     "blend",
     "copy",
     "create",
@@ -42,44 +44,78 @@ encodingMethodsSave = {}
 
 
 class Picture:
-    def __init__(self, data):
-        self.data = data
+    """Picture stored as one plane per channel.
+
+    Every plane is a (height, width) array, so a pixel costs 13 bytes
+    instead of four boxed dictionary entries. Alpha is kept as a byte,
+    the same way OCIF files store it.
+    """
+
+    __slots__ = (
+        "alpha",
+        "background",
+        "foreground",
+        "height",
+        "symbol",
+        "width",
+    )
 
-    ##        if (len(self.data)-2) % 4 > 0:
-    ##            raise TypeError('Image data is invalid!')
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        background: int = 0x0,
+        foreground: int = 0x0,
+        alpha: float = 0x0,
+        symbol: str = " ",
+    ) -> None:
+        """Make a picture of given size with every pixel set to given values."""
+        self.width = width
+        self.height = height
+        shape = (height, width)
+        self.background = np.full(shape, background, dtype=np.uint32)
+        self.foreground = np.full(shape, foreground, dtype=np.uint32)
+        self.alpha = np.full(shape, alphaToByte(alpha), dtype=np.uint8)
+        self.symbol = np.full(shape, symbol, dtype="<U1")
+
+    @classmethod
+    def fromPlanes(cls, background, foreground, alpha, symbol) -> Picture:
+        """Return a new picture that takes ownership of given channel planes."""
+        height, width = background.shape
+        picture = cls.__new__(cls)
+        picture.width = width
+        picture.height = height
+        picture.background = background
+        picture.foreground = foreground
+        picture.alpha = alpha
+        picture.symbol = symbol
+        return picture
+
+    def copy(self) -> Picture:
+        """Return a copy of this picture."""
+        return Picture.fromPlanes(
+            self.background.copy(),
+            self.foreground.copy(),
+            self.alpha.copy(),
+            self.symbol.copy(),
+        )
 
-    def __str__(self):
+    def __str__(self) -> str:
+        """Return the symbols of this picture, like getStr."""
         return self.getStr()
 
-    def getStr(self):
-        w, h = getSize(self.data)
-        ##        for bg, fg, al, ch in self.data[2:]:
-        ##            print(ch)
-        ##            chars.append(ch)
-        pixels = len(self.data) // 4
-        realh = pixels // w
-        ##        print(w, h)
-        print(w, realh)
-        chars = []
-        for y in range(1, realh + 1):
-            for x in range(1, w + 1):
-                try:
-                    data = get(self.data, x, y)[3]
-                    ##                    if not isinstance(data, str):
-                    ##                        raise ValueError
-                    chars.append(data)
-                ##                    chars.append(self.data[(4 * ((y * w) + x) + 2) + 3])
-                except BaseException:
-                    ##                    chars.append('�')
-                    chars.append(" ")
-        ##        chars = [self.data[2+i*4+3] for i in range(pixels)]
-        # (len(self.data)-2) // w-4
-        lines = ["".join(chars[i * w : (i + 1) * w]) for i in range(realh)]
-        ##        chars = [''.join(chars[i*w:(i+1)*w]) for i in range()]
-        return "\n".join(lines)
-
-    def __repr__(self):
-        return self.getStr()
+    def getStr(self) -> str:
+        """Return the symbols of this picture as lines of text."""
+        return "\n".join("".join(row) for row in self.symbol.tolist())
+
+    def __repr__(self) -> str:
+        """Return the size of this picture for debugging."""
+        return f"<Picture({self.width}, {self.height})>"
+
+
+def alphaToByte(alpha: float) -> int:
+    """Return alpha in the 0 to 1 range as the byte stored in a picture."""
+    return math.floor(alpha * 255)
 
 
 ##def readOutput(output):
@@ -88,76 +124,117 @@ class Picture:
 ##
 
 
+def _rows(picture, compressColors=False):
+    """Yield rows of (background, foreground, alpha, symbol) pixels of picture, converting colors to 8 bit if compressColors."""
+    backgrounds, foregrounds = picture.background, picture.foreground
+    if compressColors:
+        backgrounds = color.to8BitMany(backgrounds)
+        foregrounds = color.to8BitMany(foregrounds)
+    return (
+        zip(*row, strict=True)
+        for row in zip(
+            backgrounds.tolist(),
+            foregrounds.tolist(),
+            (picture.alpha / 255).tolist(),
+            picture.symbol.tolist(),
+            strict=True,
+        )
+    )
+
+
 def group(picture, compressColors=False):
     """Simplify a picture into a gigantic table."""
     groupedPicture = {}
-    x, y = 1, 1
-    ##    print((2, len(picture), 4))
-
-    for i in range(2, len(picture), 4):
-        if compressColors:
-            background, foreground = color.to8Bit(picture[i]), color.to8Bit(
-                picture[i + 1],
-            )
-            ##            # Skipping because it's very strange.
-            if i % 603 == 0:
-                # Handle signals for zero seconds? What?
-                # If it's computer's pullSignal, we are making event
-                # module not process signals. Interesting.
-                computer.pullSignal(0)
-        else:
-            background, foreground = picture[i], picture[i + 1]
-        alpha, char = picture[i + 2], picture[i + 3]
-
-        if alpha not in groupedPicture:
-            groupedPicture[alpha] = {}
-        if char not in groupedPicture[alpha]:
-            groupedPicture[alpha][char] = {}
-        if background not in groupedPicture[alpha][char]:
-            groupedPicture[alpha][char][background] = {}
-        if foreground not in groupedPicture[alpha][char][background]:
-            groupedPicture[alpha][char][background][foreground] = {}
-        if y not in groupedPicture[alpha][char][background][foreground]:
-            groupedPicture[alpha][char][background][foreground][y] = []
-
-        groupedPicture[alpha][char][background][foreground][y].append(x)
 
-        x += 1
-        if x > picture[0]:
-            x = 1
-            y += 1
+    for y, row in enumerate(_rows(picture, compressColors), 1):
+        for x, (background, foreground, alpha, char) in enumerate(row, 1):
+            if alpha not in groupedPicture:
+                groupedPicture[alpha] = {}
+            if char not in groupedPicture[alpha]:
+                groupedPicture[alpha][char] = {}
+            if background not in groupedPicture[alpha][char]:
+                groupedPicture[alpha][char][background] = {}
+            if foreground not in groupedPicture[alpha][char][background]:
+                groupedPicture[alpha][char][background][foreground] = {}
+            if y not in groupedPicture[alpha][char][background][foreground]:
+                groupedPicture[alpha][char][background][foreground][y] = []
+
+            groupedPicture[alpha][char][background][foreground][y].append(x)
     return groupedPicture
 
 
+def _readNumber(file, width):
+    """Read a number of width bytes from file. Raises EOFError if the file ends first."""
+    if width == 1:
+        number = file.readBytes(1)
+    else:
+        # readBytes makes a number of fewer bytes at the end of file
+        number = (file.readBytesArray(1, width) or [None])[0]
+    if number is None:
+        raise EOFError
+    return number
+
+
+def _readNumbers(file, count):
+    """Read count one byte numbers from file as a list. Raises EOFError if the file ends first."""
+    numbers = file.readBytesArray(count) or []
+    if len(numbers) < count:
+        raise EOFError
+    return numbers
+
+
+def _readSymbol(file):
+    """Read a unicode char from file. Raises EOFError if the file ends first, ValueError if the char is not UTF-8."""
+    try:
+        symbol = file.readUnicodeChar()
+    except UnicodeDecodeError as exception:
+        raise ValueError("symbol is not valid UTF-8.") from exception
+    if symbol is None:
+        raise EOFError
+    return symbol
+
+
 def encMethodSave5(file, picture):
     """Save an picture to a file."""
-    file.writeBytes(bit32.rshift(picture[0], 8), bit32.band(picture[1], 0xFF))
+    file.writeBytes(
+        bit32.rshift(picture.width, 8),
+        bit32.band(picture.width, 0xFF),
+        bit32.rshift(picture.height, 8),
+        bit32.band(picture.height, 0xFF),
+    )
 
-    for i in range(2, len(picture), 4):
-        file.writeBytes(
-            color.to8Bit(picture[i]),
-            color.to8Bit(picture[i + 1]),
-            math.floor(picture[i + 2] * 255),
-        )
+    for row in _rows(picture, True):
+        for background, foreground, alpha, symbol in row:
+            file.writeBytes(background, foreground, alphaToByte(alpha))
 
-        file.write(picture[i + 3])
+            file.write(symbol)
     return True, None
 
 
 encodingMethodsSave[5] = encMethodSave5
 
 
-def encMethodLoad5(file, picture):
+def encMethodLoad5(file):
     """Load a picture from a file."""
-    picture[0] = file.readBytes(2)
-    picture[1] = file.readBytes(2)
+    try:
+        picture = Picture(_readNumber(file, 2), _readNumber(file, 2))
 
-    for i in range(math.ceil(getWidth(picture) * picture[1])):
-        picture[i] = color.to24Bit(file.readBytes(1))
-        picture[i + 1] = color.to24Bit(file.readBytes(1))
-        picture[i + 2] = file.readBytes(1) / 255
-        picture[i + 3] = file.readUnicodeChar()
-    return None, None
+        for y in range(1, picture.height + 1):
+            for x in range(1, picture.width + 1):
+                set_(
+                    picture,
+                    x,
+                    y,
+                    color.to24Bit(_readNumber(file, 1)),
+                    color.to24Bit(_readNumber(file, 1)),
+                    _readNumber(file, 1) / 255,
+                    _readSymbol(file),
+                )
+    except EOFError:
+        return None, "file is truncated."
+    except ValueError as exception:
+        return None, str(exception)
+    return picture, None
 
 
 encodingMethodsLoad[5] = encMethodLoad5
@@ -169,7 +246,7 @@ def encMethodSave6(file, picture):
     groupedPicture = group(picture, True)
 
     # Write 2 bytes for image width and height
-    file.writeBytes(picture[0], picture[1])
+    file.writeBytes(picture.width, picture.height)
 
     # Write one byte for alphas array size
     file.writeBytes(len(groupedPicture))
@@ -235,69 +312,73 @@ def encMethodSave6(file, picture):
 encodingMethodsSave[6] = encMethodSave6
 
 
-def encMethodLoad6(file, picture, mode=0):
-    """Very efficiant."""
-    picture[0] = file.readBytes(1)
-    picture[1] = file.readBytes(1)
-
-    alphaSize = file.readBytes(1) + mode
-
-    for alpha in range(alphaSize):
-        currentAlpha = file.readBytes(1) / 255
-        symbolSize = file.readBytes(2) + mode
-
-        for symbol in range(symbolSize):
-            print(symbolSize)
-            currentSymbol = file.readUnicodeChar()
-            print(currentSymbol)
-            backgroundSize = file.readBytes(1)
-
-            for background in range(backgroundSize + mode):
-                currentBackground = color.to24Bit(file.readBytes(1))
-                foregroundSize = file.readBytes(1)
-
-                for foreground in range(foregroundSize + mode):
-                    currentForeground = color.to24Bit(file.readBytes(1))
-                    ySize = file.readBytes(1)
-
-                    for y in range(ySize + mode):
-                        currently = file.readBytes(1)
-                        xSize = file.readBytes(1)
-
-                        for x in range(xSize + mode):
-                            currentX = file.readBytes(1)
-
-                            if currentX is None:
-                                print(
-                                    currentX,
-                                    currently,
-                                    f"{currentBackground:06x}",
-                                    f"{currentForeground:06x}",
-                                    currentAlpha,
-                                    currentSymbol,
-                                )
-                                print(
-                                    f"{x}/{xSize} {y}/{ySize} {background}/{backgroundSize} {foreground}/{foregroundSize} {alpha}/{alphaSize} {symbol}/{symbolSize}",
-                                )
-                                return None, None
-                            index = getIndex(currentX, currently, picture[0])
-                            if index < 2:
-                                ##                                print('Low index!')
-                                ##                                print(currentX, currently)
-                                continue
-                            (
-                                picture[index],
-                                picture[index + 1],
-                                picture[index + 2],
-                                picture[index + 3],
-                            ) = (
-                                currentBackground,
-                                currentForeground,
-                                currentAlpha,
-                                currentSymbol,
-                            )
-    ##                            set_(picture, currentX, currently, currentBackground, currentForeground, currentAlpha, currentSymbol)
-    return None, None
+def encMethodLoad6(file, mode=0):
+    """Very efficiant. Groups are read with a few bulk calls each and every pixel is set at once at the end."""
+    # Values of every (alpha, symbol, background, foreground) group
+    alphas = []
+    symbols = []
+    backgrounds = []
+    foregrounds = []
+    # Count of y lines in each group, and y and x count of each line
+    groupLines = []
+    lineYs = []
+    lineSizes = []
+    xs = []
+
+    try:
+        width, height = _readNumbers(file, 2)
+
+        for _alpha in range(_readNumber(file, 1) + mode):
+            currentAlpha = _readNumber(file, 1)
+
+            for _symbol in range(_readNumber(file, 2) + mode):
+                currentSymbol = _readSymbol(file)
+
+                for _background in range(_readNumber(file, 1) + mode):
+                    currentBackground = _readNumber(file, 1)
+
+                    for _foreground in range(_readNumber(file, 1) + mode):
+                        currentForeground = _readNumber(file, 1)
+                        ySize = _readNumber(file, 1) + mode
+
+                        alphas.append(currentAlpha)
+                        symbols.append(currentSymbol)
+                        backgrounds.append(currentBackground)
+                        foregrounds.append(currentForeground)
+                        groupLines.append(ySize)
+
+                        for _y in range(ySize):
+                            currentY, xSize = _readNumbers(file, 2)
+                            line = _readNumbers(file, xSize + mode)
+                            lineYs.append(currentY)
+                            lineSizes.append(len(line))
+                            xs += line
+    except EOFError:
+        return None, "file is truncated."
+    except ValueError as exception:
+        return None, str(exception)
+
+    picture = Picture(width, height)
+    if not xs:
+        return picture, None
+
+    sizes = np.array(lineSizes, dtype=np.intp)
+    group = np.repeat(
+        np.repeat(np.arange(len(groupLines)), groupLines),
+        sizes,
+    )
+    ys = np.repeat(np.array(lineYs, dtype=np.intp), sizes)
+    xs = np.array(xs, dtype=np.intp)
+    # Zero choordinates do not point at a pixel
+    keep = (xs >= 1) & (ys >= 1)
+    group = group[keep]
+    index = (ys[keep] - 1, xs[keep] - 1)
+
+    picture.background[index] = color.to24BitMany(backgrounds)[group]
+    picture.foreground[index] = color.to24BitMany(foregrounds)[group]
+    picture.alpha[index] = np.array(alphas, dtype=np.uint8)[group]
+    picture.symbol[index] = np.array(symbols, dtype="<U1")[group]
+    return picture, None
 
 
 encodingMethodsLoad[6] = encMethodLoad6
@@ -305,64 +386,48 @@ encodingMethodsLoad[6] = encMethodLoad6
 
 def getSize(picture):
     """Return the size of a given picture."""
-    return picture[0], picture[1]
+    return picture.width, picture.height
 
 
 def getWidth(picture) -> int:
     """Return the width of a given picture."""
-    return picture[0]
+    return picture.width
 
 
 def getHeight(picture) -> int:
     """Return the height of a given picture."""
-    return picture[1]
+    return picture.height
 
 
 def getIndex(x: int, y: int, width: int) -> int:
-    """Return the internal picture index of a given pixel, given xy position and the width of the image. Indexing starts at 1, 1."""
-    # Original
-    # return 4 * (width * (y - 1) + x) - 1
-    # Fixed python indexing
-    return 4 * (width * (y - 1) + x) - 2
-
-
-##    return 4 * (width * (y - 1) + x) - 1
+    """Return the index of a given pixel in the flattened channel planes, given xy position and the width of the image. Indexing starts at 1, 1."""
+    return width * (y - 1) + x - 1
 
 
 def set_(picture, x, y, background, foreground, alpha, symbol):
     """Set the data of the pixel at given xy choordinates in a given image."""
-    index = getIndex(x, y, picture[0])
-    (
-        picture[index],
-        picture[index + 1],
-        picture[index + 2],
-        picture[index + 3],
-    ) = (
-        background,
-        foreground,
-        alpha,
-        symbol,
-    )
+    y -= 1
+    x -= 1
+    picture.background[y, x] = background
+    picture.foreground[y, x] = foreground
+    picture.alpha[y, x] = alphaToByte(alpha)
+    picture.symbol[y, x] = symbol
 
     return picture
 
 
 def get(picture, x, y):
     """Return the background, foreground, alpha, and symbol at the pixel at given xy choordinates in given image."""
-    index = getIndex(x, y, picture[0])
+    y -= 1
+    x -= 1
     return (
-        picture[index],
-        picture[index + 1],
-        picture[index + 2],
-        picture[index + 3],
+        int(picture.background[y, x]),
+        int(picture.foreground[y, x]),
+        int(picture.alpha[y, x]) / 255,
+        str(picture.symbol[y, x]),
     )
 
 
-def _pictLstToDict(lst):
-    """Convert picture from list to dictionary."""
-    return {i: lst[i] for i in range(len(lst))}
-
-
 def create(
     width=160,
     height=50,
@@ -373,27 +438,22 @@ def create(
     random_=False,
 ):
     """Create a new picture with given arguments."""
-    picture = [width, height]
-
-    for _ in range(math.ceil(width * height)):
-        if random_:
-            picture.append(random.randint(0x0, 0xFFFFFF))
-            picture.append(random.randint(0x0, 0xFFFFFF))
-        else:
-            picture.append(background)
-            picture.append(foreground)
-        picture.append(alpha)
-        if random_:
-            picture.append(chr(random.randint(65, 90)))
-        else:
-            picture.append(symbol)
-    return _pictLstToDict(picture)
+    picture = Picture(width, height, background, foreground, alpha, symbol)
+
+    if random_:
+        shape = (height, width)
+        rng = np.random.default_rng()
+        picture.background[:] = rng.integers(0x0, 0x1000000, shape)
+        picture.foreground[:] = rng.integers(0x0, 0x1000000, shape)
+        picture.symbol = rng.integers(65, 90, shape, np.uint32, True).view(
+            "<U1",
+        )
+    return picture
 
 
 def copy(picture):
     """Return a copy of given picture."""
-    v = list(picture.values())
-    return _pictLstToDict(v)
+    return picture.copy()
 
 
 def save(path, picture, encodingMethod=6):
@@ -401,11 +461,14 @@ def save(path, picture, encodingMethod=6):
     file, reason = filesystem.open(path, "wb")
     if file:
         if encodingMethodsSave[encodingMethod]:
-            file.write(OCIFSignature, string.byte(encodingMethod))
+            file.write(OCIFSignature)
+            file.writeBytes(encodingMethod)
 
             result, reason = encodingMethodsSave[encodingMethod](file, picture)
 
-            file.close()
+            closed, closeReason = file.close()
+            if result and not closed:
+                result, reason = closed, closeReason
 
             if result:
                 return True, None
@@ -420,20 +483,13 @@ def save(path, picture, encodingMethod=6):
 
 def load(path):
     """Load an image from given path. Automatically de-compresses."""
-    file, reason = filesystem.open(path, "rb")
+    file, reason = filesystem.open(path, "rm")
     if file:
-        print(f"Length: {file.proxy.size(path)[0]}")
-        readSignature = string.char(file.readString(len(OCIFSignature)))
-        if readSignature == OCIFSignature:
+        readSignature = file.readString(len(OCIFSignature))
+        if readSignature == OCIFSignature.encode():
             encodingMethod = file.readBytes(1)
             if encodingMethod in encodingMethodsLoad:
-                picture = {}
-                result, reason = encodingMethodsLoad[encodingMethod](
-                    file,
-                    picture,
-                )
-
-                print(f"End position: {file.position}")
+                picture, reason = encodingMethodsLoad[encodingMethod](file)
 
                 file.close()
 
@@ -455,16 +511,14 @@ def load(path):
 
 def toString(picture):
     """Convert an image into a string and return the string."""
-    charArray = [f"{picture[0]:02X}", f"{picture[1]:02X}"]
+    charArray = [f"{picture.width:02X}", f"{picture.height:02X}"]
 
-    for i in range(2, len(picture), 4):
-        charArray.append(f"{color.to8Bit(picture[i]):02X}")
-        charArray.append(f"{color.to8Bit(picture[i + 1]):02X}")
-        charArray.append(f"{math.floor(picture[i + 2] * 255):02X}")
-        charArray.append(picture[i + 3])
-
-        if i % 603 == 0:
-            computer.pullSignal(0)
+    for row in _rows(picture, True):
+        for background, foreground, alpha, symbol in row:
+            charArray.append(f"{background:02X}")
+            charArray.append(f"{foreground:02X}")
+            charArray.append(f"{alphaToByte(alpha):02X}")
+            charArray.append(symbol)
 
     return "".join(charArray)
 
@@ -475,35 +529,48 @@ def fromString(pictureString):
     def hfstr(string):
         return int("0x" + string.lower(), 16)
 
-    picture = [hfstr(pictureString[0:2]), hfstr(pictureString[2:4])]
+    picture = Picture(hfstr(pictureString[0:2]), hfstr(pictureString[2:4]))
 
+    x, y = 1, 1
     for i in range(4, len(pictureString), 7):
-        picture.append(color.to24Bit(hfstr(pictureString[i : i + 2])))
-        picture.append(color.to24Bit(hfstr(pictureString[i + 2 : i + 4])))
-        picture.append(hfstr(pictureString[i + 4 : i + 6]) / 255)
-        picture.append(pictureString[i + 6])
+        set_(
+            picture,
+            x,
+            y,
+            color.to24Bit(hfstr(pictureString[i : i + 2])),
+            color.to24Bit(hfstr(pictureString[i + 2 : i + 4])),
+            hfstr(pictureString[i + 4 : i + 6]) / 255,
+            pictureString[i + 6],
+        )
 
-    return _pictLstToDict(picture)
+        x += 1
+        if x > picture.width:
+            x = 1
+            y += 1
 
+    return picture
 
-def transform(picture, newWidth: int, newHeight: int):
-    """Scale picture to a new size."""
-    newPicture = [newWidth, newHeight]
-    stepWidth, stepHeight = picture[0] / newWidth, picture[1] / newHeight
 
-    x, y = 1, 1
-    for _j in range(1, newHeight + 1):
-        for _i in range(1, newWidth + 1):
-            bg, fg, al, sy = get(picture, math.floor(x), math.floor(y))
-            newPicture.append(bg)
-            newPicture.append(fg)
-            newPicture.append(al)
-            newPicture.append(sy)
+def _stepIndices(size: int, newSize: int):
+    """Return the zero based source indices transform samples along an axis."""
+    steps = np.full(newSize, size / newSize)
+    steps[:1] = 1
+    # cumsum adds sequentially, matching the original float accumulation.
+    return np.floor(np.cumsum(steps)).astype(np.intp) - 1
 
-            x += stepWidth
-        x = 1
-        y += stepHeight
-    return _pictLstToDict(newPicture)
+
+def transform(picture, newWidth: int, newHeight: int):
+    """Scale picture to a new size."""
+    index = np.ix_(
+        _stepIndices(picture.height, newHeight),
+        _stepIndices(picture.width, newWidth),
+    )
+    return Picture.fromPlanes(
+        picture.background[index],
+        picture.foreground[index],
+        picture.alpha[index],
+        picture.symbol[index],
+    )
 
 
 def crop(picture, fromX, fromY, width, height):
@@ -513,55 +580,43 @@ def crop(picture, fromX, fromY, width, height):
     if (
         fromX >= 1
         and fromY >= 1
-        and toX - 1 <= picture[0]
-        and toY - 1 <= picture[1]
+        and toX - 1 <= picture.width
+        and toY - 1 <= picture.height
     ):
-        newPicture = [width, height]
-
-        for y in range(fromY, toY):
-            for x in range(fromX, toX):
-                bg, fg, al, sy = get(picture, x, y)
-                newPicture.append(bg)
-                newPicture.append(fg)
-                newPicture.append(al)
-                newPicture.append(sy)
-    else:
+        area = (slice(fromY - 1, toY - 1), slice(fromX - 1, toX - 1))
         return (
-            False,
-            "Failed to crop image: target coordinates are out of range.",
+            Picture.fromPlanes(
+                picture.background[area].copy(),
+                picture.foreground[area].copy(),
+                picture.alpha[area].copy(),
+                picture.symbol[area].copy(),
+            ),
+            None,
         )
-
-    return _pictLstToDict(newPicture), None
+    return (
+        False,
+        "Failed to crop image: target coordinates are out of range.",
+    )
 
 
 def flipHorizontally(picture):
     """Return the picture mirrored on the X axes."""
-    newPicture = [picture[0], picture[1]]
-
-    for y in range(1, picture[1] + 1):
-        for x in range(picture[0], 0, -1):
-            bg, fg, al, sy = get(picture, x, y)
-            newPicture.append(bg)
-            newPicture.append(fg)
-            newPicture.append(al)
-            newPicture.append(sy)
-
-    return _pictLstToDict(newPicture)
+    return Picture.fromPlanes(
+        picture.background[:, ::-1].copy(),
+        picture.foreground[:, ::-1].copy(),
+        picture.alpha[:, ::-1].copy(),
+        picture.symbol[:, ::-1].copy(),
+    )
 
 
 def flipVertically(picture):
     """Return the picture mirrored on the X axes."""
-    newPicture = [picture[0], picture[1]]
-
-    for y in range(picture[1], 0, -1):
-        for x in range(1, picture[0] + 1):
-            bg, fg, al, sy = get(picture, x, y)
-            newPicture.append(bg)
-            newPicture.append(fg)
-            newPicture.append(al)
-            newPicture.append(sy)
-
-    return _pictLstToDict(newPicture)
+    return Picture.fromPlanes(
+        picture.background[::-1].copy(),
+        picture.foreground[::-1].copy(),
+        picture.alpha[::-1].copy(),
+        picture.symbol[::-1].copy(),
+    )
 
 
 def expand(
@@ -576,8 +631,8 @@ def expand(
     symbol=" ",
 ):
     """Expand a picture in all four directions, with new pixels defined with background, foreground, alpha, and symbol arguments. No random."""
-    newWidth = picture[0] + fromRight + fromLeft
-    newHeight = picture[1] + fromTop + fromBottom
+    newWidth = picture.width + fromRight + fromLeft
+    newHeight = picture.height + fromTop + fromBottom
     # Create new picture filled with new pixels from arguments
     newPicture = create(
         newWidth,
@@ -589,26 +644,26 @@ def expand(
     )
 
     # Copy pixels from original pixel, overwriting new ones.
-    for y in range(1, picture[1] + 1):
-        for x in range(1, picture[0] + 1):
-            set_(newPicture, x + fromLeft, y + fromTop, *get(picture, x, y))
+    area = (
+        slice(fromTop, fromTop + picture.height),
+        slice(fromLeft, fromLeft + picture.width),
+    )
+    newPicture.background[area] = picture.background
+    newPicture.foreground[area] = picture.foreground
+    newPicture.alpha[area] = picture.alpha
+    newPicture.symbol[area] = picture.symbol
 
     return newPicture
 
 
 def blend(picture, blendColor, transparency):
     """Blend the background and foreground with blendColor by transparency for every pixel in picture. Usually is, but has to be in 24 bit color mode."""
-    newPicture = [picture[0], picture[1]]
-
-    for i in range(2, len(picture), 4):
-        newPicture.append(color.blend(picture[i], blendColor, transparency))
-        newPicture.append(
-            color.blend(picture[i + 1], blendColor, transparency),
-        )
-        newPicture.append(picture[i + 2])
-        newPicture.append(picture[i + 3])
-
-    return _pictLstToDict(newPicture)
+    return Picture.fromPlanes(
+        color.blendMany(picture.background, blendColor, transparency),
+        color.blendMany(picture.foreground, blendColor, transparency),
+        picture.alpha.copy(),
+        picture.symbol.copy(),
+    )
 
 
 ##set = set_
@@ -8,19 +8,32 @@ from __future__ import annotations
 __all__ = [
     "COMPONENTS",
     "LIBRARIES",
+    "LISTING_CACHE_SIZE",
     "MINEOS",
     "OPENCOMPUTERS",
+    "STAT_CACHE_SIZE",
     "WARNING",
+    "DirectoryEntry",
     "Proxy",
+    "clearStatCache",
+    "getStatCacheMetrics",
 ]
 
-WARNING = True
-
 import os as _os
+import shutil as _shutil
+import stat as _stat
+import time as _time
+from collections import OrderedDict as _OrderedDict
 from collections.abc import Sequence
+from contextlib import suppress as _suppress
+from functools import lru_cache as _lru_cache
 from io import IOBase as _IOBASE
 from math import ceil as _ceil
-from typing import Any
+from mmap import ACCESS_READ as _ACCESS_READ, mmap as _mmap
+from threading import Lock as _Lock
+from typing import Any, NamedTuple
+
+WARNING = True
 
 LIBRARIES = _os.path.split(__file__)[0]
 MINEOS = _os.path.split(LIBRARIES)[0]
@@ -29,14 +42,46 @@ OPENCOMPUTERS = _os.path.split(MINEOS)[0]
 COMPONENTS: dict[int, Any] = {}
 
 
+class DirectoryEntry(NamedTuple):
+    """File or directory found by Proxy.scan."""
+
+    name: str
+    isDirectory: bool
+    size: int
+    lastModified: float
+
+
+# How many directory listings are remembered before dropping the oldest
+LISTING_CACHE_SIZE = 128
+# Most recently used directory listings by real path, with the directory
+# mtime they are from. Guarded by _STATS_LOCK like the stat cache.
+_LISTINGS: _OrderedDict[str, tuple[int, tuple[DirectoryEntry, ...]]] = (
+    _OrderedDict()
+)
+# Directories changed more recently than this many nanoseconds ago are not
+# cached, another change in the same clock tick would keep their mtime
+_RACY_NS = 1_000_000_000
+
+# How many paths the stat cache remembers before dropping the oldest
+STAT_CACHE_SIZE = 1024
+# Most recently used os.stat results by real path, None for missing paths
+_STATS: _OrderedDict[str, _os.stat_result | None] = _OrderedDict()
+_STATS_LOCK = _Lock()
+# Bumped on every invalidation so stats taken before it are not cached
+_STATS_GENERATION = 0
+_STAT_HITS = 0
+_STAT_MISSES = 0
+
+
 def _isStream(stream: object) -> bool:
     """Return whether stream argument is an instance of io.IOBase."""
     return isinstance(stream, _IOBASE)
 
 
+@_lru_cache(maxsize=STAT_CACHE_SIZE)
 def _realPath(fakePath: str) -> str:
-    """Return the real path of a given open computers path."""
-    return _os.path.join(OPENCOMPUTERS, fakePath[1:])
+    """Return the normalized real path of a given open computers path."""
+    return _os.path.normpath(_os.path.join(OPENCOMPUTERS, fakePath[1:]))
 
 
 def _fakePath(realPath: str) -> str:
@@ -44,6 +89,67 @@ def _fakePath(realPath: str) -> str:
     return realPath.split(OPENCOMPUTERS)[1]
 
 
+def _statPath(realPath: str) -> _os.stat_result | None:
+    """Hidden function to return os.stat result of real path from the stat cache, or None if it does not exist."""
+    global _STAT_HITS, _STAT_MISSES
+    with _STATS_LOCK:
+        if realPath in _STATS:
+            _STATS.move_to_end(realPath)
+            _STAT_HITS += 1
+            return _STATS[realPath]
+        _STAT_MISSES += 1
+        generation = _STATS_GENERATION
+    try:
+        info = _os.stat(realPath)
+    except (OSError, ValueError):
+        info = None
+    with _STATS_LOCK:
+        if generation == _STATS_GENERATION:
+            _STATS[realPath] = info
+            if len(_STATS) > STAT_CACHE_SIZE:
+                _STATS.popitem(last=False)
+    return info
+
+
+def _forgetPath(realPath: str, below: bool = False) -> None:
+    """Hidden function to drop cached stats and listings of real path and its parent directory, and if below is True of everything inside it too."""
+    global _STATS_GENERATION
+    parent = _os.path.dirname(realPath)
+    with _STATS_LOCK:
+        _STATS_GENERATION += 1
+        _STATS.pop(realPath, None)
+        _STATS.pop(parent, None)
+        # Writing a file changes its size and time in the parent listing
+        # without always changing the mtime of the parent
+        _LISTINGS.pop(realPath, None)
+        _LISTINGS.pop(parent, None)
+        if below:
+            prefix = _os.path.join(realPath, "")
+            for cache in (_STATS, _LISTINGS):
+                for key in [key for key in cache if key.startswith(prefix)]:
+                    del cache[key]
+
+
+def clearStatCache() -> None:
+    """Forget every cached stat and directory listing, for when files were changed without going through a Proxy."""
+    global _STATS_GENERATION
+    with _STATS_LOCK:
+        _STATS_GENERATION += 1
+        _STATS.clear()
+        _LISTINGS.clear()
+
+
+def getStatCacheMetrics() -> dict[str, int]:
+    """Return a dictionary with the number of stat cache hits and misses, how many paths it holds as size, and the most it can hold as capacity."""
+    with _STATS_LOCK:
+        return {
+            "hits": _STAT_HITS,
+            "misses": _STAT_MISSES,
+            "size": len(_STATS),
+            "capacity": STAT_CACHE_SIZE,
+        }
+
+
 class Proxy:
     def __init__(self, address: int) -> None:
         self.address = address
@@ -52,59 +158,84 @@ class Proxy:
     def __repr__(self) -> str:
         return "<component Proxy object>"
 
+    @staticmethod
+    def forget(path: str) -> None:
+        """Drop cached stats of given path, so the next lookup sees changes made without going through a Proxy."""
+        _forgetPath(_realPath(path))
+
     @staticmethod
     def exists(path: str) -> bool:
         """Checks if file or directory exists on given path."""
-        return _os.path.exists(_realPath(path))
+        return _statPath(_realPath(path)) is not None
 
-    @classmethod
-    def size(cls, path: str) -> tuple[bool, str | int]:
+    @staticmethod
+    def size(path: str) -> tuple[bool, str | int]:
         """Tries to get file size by given path in bytes. Returns size on success, False and reason message otherwise."""
         ##        return False, 'File does not exist.'#success int or False, message
-        if cls.exists(path):
-            try:
-                size = _os.path.getsize(_realPath(path))
-            except OSError:
-                return False, "File/Directory is inaccessible."
-            return True, size
+        info = _statPath(_realPath(path))
+        if info is not None:
+            return True, info.st_size
         return False, "File/Directory does not exist."
 
     @staticmethod
     def isDirectory(path: str) -> bool:
         """Checks if given path is a directory or a file."""
-        return _os.path.isdir(_realPath(path))
+        info = _statPath(_realPath(path))
+        return info is not None and _stat.S_ISDIR(info.st_mode)
 
     @staticmethod
     def makeDirectory(path: str) -> tuple[bool, str | None]:
         """Tries to create directory with all sub-paths by given path. Returns True on success, False and reason message otherwise."""
+        realPath = _realPath(path)
         try:
-            _os.mkdir(_realPath(path), 664)
+            _os.mkdir(realPath, 664)
         except OSError:
             return False, "Cannot create directory."
+        finally:
+            _forgetPath(realPath)
         return True, None
 
-    @classmethod
-    def lastModified(cls, path: str) -> tuple[int, str | None]:
+    @staticmethod
+    def lastModified(path: str) -> tuple[int, str | None]:
         """Tries to get real world timestamp when file or directory by given path was modified. For directories this is usually the time of their creation. Returns timestamp on success, False and reason message otherwise."""
-        if cls.exists(path):
-            time = _os.path.getmtime(_realPath(path))
+        info = _statPath(_realPath(path))
+        if info is not None:
             ##            return math.ceil(time), None
-            return _ceil(time), None
+            return _ceil(info.st_mtime), None
         return False, "File does not exist."
 
     @staticmethod
-    def remove(path: str) -> tuple[bool, str]:
-        """Tries to remove file or directory by given path. Returns True on success, False and reason message otherwise."""
-        if WARNING:
+    def remove(path: str, ask: bool = True) -> tuple[bool, str | None]:
+        """Tries to remove file or empty directory by given path. While WARNING is set, asks first unless ask is False. Returns True on success, False and reason message otherwise."""
+        realPath = _realPath(path)
+        info = _statPath(realPath)
+        if info is None:
+            return False, "File does not exist."
+        if WARNING and ask:
             ok = input(
-                f"WARNING: Removing file {_realPath(path)}. Ok? (y/N) : ",
+                f"WARNING: Removing file {realPath}. Ok? (y/N) : ",
             ).lower()
-            if ok == "":
-                ok == "n"
             if ok != "y":
                 return False, "Access Denied."
-        _os.remove(_realPath(path))
-        return False, "File does not exist."
+        try:
+            if _stat.S_ISDIR(info.st_mode):
+                _os.rmdir(realPath)
+            else:
+                _os.remove(realPath)
+        except OSError:
+            return False, "Cannot remove file/directory."
+        finally:
+            _forgetPath(realPath, True)
+        return True, None
+
+    @staticmethod
+    def device(path: str) -> tuple[bool, int | str]:
+        """Tries to get id of the host device storing given path, or the directory it would be created in. Returns True and device id on success, False and reason message otherwise."""
+        realPath = _realPath(path)
+        info = _statPath(realPath) or _statPath(_os.path.dirname(realPath))
+        if info is None:
+            return False, "File does not exist."
+        return True, info.st_dev
 
     @classmethod
     def list(cls, path: str) -> tuple[bool, Sequence[str]]:
@@ -116,6 +247,56 @@ class Proxy:
             return False, f'"{name}" is not a directory.'
         return False, "Directory does not exist."
 
+    @staticmethod
+    def scan(path: str) -> tuple[bool, tuple[DirectoryEntry, ...] | str]:
+        """Tries to get name, type, size and modification time of every file and directory in given path with a single pass. Listings are cached until the directory changes. Returns True and tuple of entries on success, False and reason message otherwise."""
+        realPath = _realPath(path)
+        try:
+            info = _os.stat(realPath)
+        except OSError:
+            return False, "Directory does not exist."
+        if not _stat.S_ISDIR(info.st_mode):
+            name = _os.path.basename(realPath)
+            return False, f'"{name}" is not a directory.'
+
+        with _STATS_LOCK:
+            cached = _LISTINGS.get(realPath)
+            if cached is not None and cached[0] == info.st_mtime_ns:
+                _LISTINGS.move_to_end(realPath)
+                return True, cached[1]
+            generation = _STATS_GENERATION
+
+        entries = []
+        try:
+            with _os.scandir(realPath) as scanner:
+                for entry in scanner:
+                    try:
+                        entryInfo = entry.stat()
+                    except OSError:
+                        # Broken symbolic link
+                        entryInfo = entry.stat(follow_symlinks=False)
+                    entries.append(
+                        DirectoryEntry(
+                            entry.name,
+                            _stat.S_ISDIR(entryInfo.st_mode),
+                            entryInfo.st_size,
+                            entryInfo.st_mtime,
+                        ),
+                    )
+        except OSError:
+            return False, "Directory is inaccessible."
+
+        listing = tuple(entries)
+        if _time.time_ns() - info.st_mtime_ns > _RACY_NS:
+            with _STATS_LOCK:
+                # Unless a file was written through a Proxy meanwhile
+                if generation == _STATS_GENERATION:
+                    _LISTINGS[realPath] = info.st_mtime_ns, listing
+                    _LISTINGS.move_to_end(realPath)
+                    if len(_LISTINGS) > LISTING_CACHE_SIZE:
+                        _LISTINGS.popitem(last=False)
+        return True, listing
+
     @staticmethod
     def seek(
         stream: _IOBASE,
@@ -136,10 +317,18 @@ class Proxy:
         return False, f'"{stream}" is not a stream object.'
 
     @staticmethod
-    def close(stream: _IOBASE) -> None:
-        """Close file stream."""
+    def close(stream: _IOBASE | _mmap) -> None:
+        """Close file stream or mapping."""
         if _isStream(stream):
+            written = not stream.closed and stream.writable()
             stream.close()
+            if written and isinstance(stream.name, str):
+                # Buffered data only reaches the file when it is closed
+                _forgetPath(stream.name)
+        elif isinstance(stream, _mmap):
+            # Views of the mapping keep it open until they are released
+            with _suppress(BufferError):
+                stream.close()
 
     @staticmethod
     def read(stream: _IOBASE, buffer_size: int = -1) -> tuple[bool, int | str]:
@@ -158,6 +347,8 @@ class Proxy:
         if _isStream(stream):
             if stream.writable():
                 written = stream.write(data)
+                if isinstance(stream.name, str):
+                    _forgetPath(stream.name)
                 return True, written
             return False, "Stream is not writable."
         return False, f'"{stream}" is not a stream object.'
@@ -169,22 +360,65 @@ class Proxy:
             readAdd = mode in {"r", "rb", "a", "ab"}
             if (readAdd and cls.exists(path)) or (not readAdd):
                 if not cls.isDirectory(path):
+                    realPath = _realPath(path)
                     try:
-                        return True, open(_realPath(path), mode=mode)
+                        return True, open(realPath, mode=mode)
                     except BaseException:
                         return False, "Cannot open file stream."
-                name = _os.path.split(_os.path.dirname(_realPath(path)))[1]
+                    finally:
+                        if not mode.startswith("r"):
+                            _forgetPath(realPath)
+                name = _os.path.basename(_realPath(path))
                 return False, f'"{name}" is a directory.'
             return False, "File does not exist."
         return False, f'Mode "{mode}" is invalid.'
 
+    @classmethod
+    def mmap(cls, path: str) -> tuple[bool, _mmap | bytes | str]:
+        """Maps the file at the specified path into memory read only. The operating system shares its pages with every other reader of the same file. Returns True and mapping on success, False and reason message otherwise."""
+        if not cls.exists(path):
+            return False, "File does not exist."
+        if cls.isDirectory(path):
+            name = _os.path.basename(_realPath(path))
+            return False, f'"{name}" is a directory.'
+        try:
+            with open(_realPath(path), "rb") as file:
+                if _os.fstat(file.fileno()).st_size == 0:
+                    # Empty files cannot be mapped
+                    return True, b""
+                return True, _mmap(file.fileno(), 0, access=_ACCESS_READ)
+        except OSError:
+            return False, "Cannot map file."
+
+    @classmethod
+    def copy(cls, fromPath: str, toPath: str) -> tuple[bool, str | None]:
+        """Tries to copy file from first path to second one, letting the operating system move the data without reading it into Python when it can. Returns True on success, False and reason message otherwise."""
+        if not cls.exists(fromPath):
+            return False, "File does not exist."
+        if cls.isDirectory(fromPath):
+            name = _os.path.basename(_realPath(fromPath))
+            return False, f'"{name}" is a directory.'
+        toRealPath = _realPath(toPath)
+        try:
+            _shutil.copyfile(_realPath(fromPath), toRealPath)
+        except OSError:
+            return False, "Cannot copy file."
+        finally:
+            _forgetPath(toRealPath)
+        return True, None
+
     @classmethod
     def rename(cls, fromPath: str, toPath: str) -> tuple[bool, str | None]:
         """Tries to rename file or directory from first path to second one. Returns True on success, False and reason message otherwise."""
         if cls.exists(fromPath):
+            fromRealPath = _realPath(fromPath)
+            toRealPath = _realPath(toPath)
             try:
-                _os.rename(_realPath(fromPath), _realPath(toPath))
+                _os.rename(fromRealPath, toRealPath)
             except OSError:
                 return False, "Cannot rename file/directory"
+            finally:
+                _forgetPath(fromRealPath, True)
+                _forgetPath(toRealPath, True)
             return True, None
         return False, "File does not exist."
@@ -4,6 +4,9 @@
 from __future__ import annotations
 
 import Color as color
+import Image as image
+import numpy as np
+import numpy.typing as npt
 
 colorBlend = color.blend
 
@@ -26,24 +29,27 @@ colorBlend = color.blend
 bufferWidth = 0
 bufferHeight = 0
 
-currentFrameBackgrounds: dict[int, int] = {}
-currentFrameForegrounds: dict[int, int] = {}
-currentFrameSymbols: dict[int, str] = {}
+currentFrameBackgrounds: npt.NDArray[np.uint32] = np.zeros(0, np.uint32)
+currentFrameForegrounds: npt.NDArray[np.uint32] = np.zeros(0, np.uint32)
+currentFrameSymbols: npt.NDArray[np.str_] = np.zeros(0, "<U1")
 
-newFrameBackgrounds: dict[int, int] = {}
-newFrameForegrounds: dict[int, int] = {}
-newFrameSymbols: dict[int, str] = {}
+newFrameBackgrounds: npt.NDArray[np.uint32] = np.zeros(0, np.uint32)
+newFrameForegrounds: npt.NDArray[np.uint32] = np.zeros(0, np.uint32)
+newFrameSymbols: npt.NDArray[np.str_] = np.zeros(0, "<U1")
 
 drawLimitX1 = 1
 drawLimitY1 = 1
 drawLimitX2 = bufferWidth
 drawLimitY2 = bufferHeight
 
+
 ##GPUProxy
-GPUProxyGetResolution = lambda: 0, 0
+def GPUProxyGetResolution() -> tuple[int, int]:
+    """Return a 0 by 0 resolution until setGPUProxy is called."""
+    return 0, 0
 
 
-def GPUProxySetResolution():
+def GPUProxySetResolution(width: int, height: int) -> None:
     return None
 
 
@@ -55,11 +61,11 @@ def GPUProxyGetForeground():
     return 0
 
 
-def GPUProxySetBackground():
+def GPUProxySetBackground(color: int) -> None:
     return None
 
 
-def GPUProxySetForeground():
+def GPUProxySetForeground(color: int) -> None:
     return None
 
 
@@ -67,7 +73,7 @@ def GPUProxyGet():
     return None
 
 
-def GPUProxySet():
+def GPUProxySet(x: int, y: int, text: str) -> None:
     return None
 
 
@@ -75,12 +81,6 @@ def GPUProxyFill():
     return None
 
 
-def tableInsert(table: dict, value: object) -> None:
-    """Add a value to a table at given position. -1 is adding to the end. Only works if dictionary keys are intigers."""
-    pos = max(table.keys()) + 1
-    table[pos] = value
-
-
 def updateGPUProxyMethods(GPUProxy: object) -> None:
     """Update the GPU Proxy methods."""
     global GPUProxyGetResolution, GPUProxyGetBackground, GPUProxyGetForeground
@@ -103,9 +103,16 @@ def getIndex(x: int, y: int) -> int:
     return bufferWidth * (y - 1) + x
 
 
-def getCurrentFrameFromTables() -> (
-    tuple[dict[int, int], dict[int, int], dict[int, str]]
-):
+def _getIndex(x: int, y: int) -> int:
+    """Return the index of a given choordinate in the flat frame arrays, which start at 0 unlike getIndex."""
+    return bufferWidth * (y - 1) + x - 1
+
+
+def getCurrentFrameFromTables() -> tuple[
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.str_],
+]:
     """Return the current frame backgrounds, foregrounds, and symbols."""
     return (
         currentFrameBackgrounds,
@@ -114,9 +121,11 @@ def getCurrentFrameFromTables() -> (
     )
 
 
-def getNewFrameTables() -> (
-    tuple[dict[int, int], dict[int, int], dict[int, str]]
-):
+def getNewFrameTables() -> tuple[
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.str_],
+]:
     """Return new frame tables for backgrounds, foregrounds, and symbols."""
     return newFrameBackgrounds, newFrameForegrounds, newFrameSymbols
 
@@ -149,29 +158,105 @@ def flush(width: int | None = None, height: int | None = None) -> None:
     global bufferWidth, bufferHeight
 
     if not width or not height:
-        width, height = GPUProxySetResolution()
+        width, height = GPUProxyGetResolution()
 
-    (
-        currentFrameBackgrounds,
-        currentFrameForegrounds,
-        currentFrameSymbols,
-        newFrameBackgrounds,
-        newFrameForegrounds,
-        newFrameSymbols,
-    ) = ({}, {}, {}, {}, {}, {})
     bufferWidth = width
     bufferHeight = height
     resetDrawLimit()
 
-    for _y in range(1, bufferHeight):
-        for _x in range(1, bufferWidth):
-            tableInsert(currentFrameBackgrounds, 0x010101)
-            tableInsert(currentFrameForegrounds, 0xFEFEFE)
-            tableInsert(currentFrameSymbols, " ")
-
-            tableInsert(newFrameBackgrounds, 0x010101)
-            tableInsert(newFrameForegrounds, 0xFEFEFE)
-            tableInsert(newFrameSymbols, " ")
+    size = bufferWidth * bufferHeight
+    currentFrameBackgrounds = np.full(size, 0x010101, dtype=np.uint32)
+    currentFrameForegrounds = np.full(size, 0xFEFEFE, dtype=np.uint32)
+    currentFrameSymbols = np.full(size, " ", dtype="<U1")
+
+    newFrameBackgrounds = currentFrameBackgrounds.copy()
+    newFrameForegrounds = currentFrameForegrounds.copy()
+    newFrameSymbols = currentFrameSymbols.copy()
+
+
+def update(force: bool = False) -> int:
+    """Draw the pixels of the new frame that differ from the current frame and return how many GPU calls it took. If force is True, redraw every pixel.
+
+    Changed pixels are extended to the right over pixels with the same background and either the same foreground or a whitespace symbol, so each run is a single set call. Runs are drawn sorted by background and then foreground, so every color is only switched to once.
+    """
+    changes: dict[int, dict[int, list[tuple[int, int, str]]]] = {}
+
+    for y in range(drawLimitY1, drawLimitY2 + 1):
+        row = slice(_getIndex(drawLimitX1, y), _getIndex(drawLimitX2, y) + 1)
+        backgrounds = newFrameBackgrounds[row]
+        foregrounds = newFrameForegrounds[row]
+        symbols = newFrameSymbols[row]
+
+        if force:
+            changed = np.arange(backgrounds.size)
+        else:
+            changed = np.flatnonzero(
+                (currentFrameBackgrounds[row] != backgrounds)
+                | (currentFrameForegrounds[row] != foregrounds)
+                | (currentFrameSymbols[row] != symbols),
+            )
+        if not changed.size:
+            continue
+
+        rowBackgrounds = backgrounds.tolist()
+        rowForegrounds = foregrounds.tolist()
+        rowSymbols = symbols.tolist()
+        last = len(rowSymbols)
+        end = 0
+        for start in changed.tolist():
+            # Skip pixels already drawn as part of a previous run
+            if start < end:
+                continue
+            background = rowBackgrounds[start]
+            foreground = rowForegrounds[start]
+
+            # Look for pixels that can be drawn along with this one
+            end = start + 1
+            while (
+                end < last
+                and rowBackgrounds[end] == background
+                and (
+                    rowSymbols[end] == " " or rowForegrounds[end] == foreground
+                )
+            ):
+                end += 1
+
+            changes.setdefault(background, {}).setdefault(
+                foreground,
+                [],
+            ).append((drawLimitX1 + start, y, "".join(rowSymbols[start:end])))
+
+        # Make pixels at both frames equal
+        currentFrameBackgrounds[row] = backgrounds
+        currentFrameForegrounds[row] = foregrounds
+        currentFrameSymbols[row] = symbols
+
+    # Draw grouped pixels on screen
+    calls = 0
+    currentForeground = None
+    for background in sorted(changes):
+        GPUProxySetBackground(background)
+        calls += 1
+
+        # Keep the foreground left over from the last background first
+        order = sorted(
+            changes[background],
+            key=lambda foreground: (
+                foreground != currentForeground,
+                foreground,
+            ),
+        )
+        for foreground in order:
+            if foreground != currentForeground:
+                GPUProxySetForeground(foreground)
+                currentForeground = foreground
+                calls += 1
+
+            for x, y, text in changes[background][foreground]:
+                GPUProxySet(x, y, text)
+            calls += len(changes[background][foreground])
+
+    return calls
 
 
 def setResolution(width: int, height: int) -> None:
@@ -189,10 +274,285 @@ def setGPUProxy(proxy: str) -> None:
     """Set the GPU Proxy."""
     global GPUProxy
     GPUProxy = proxy
-    updateGPUProxyMethods()
+    updateGPUProxyMethods(GPUProxy)
     flush()
 
 
 def getGPUProxy() -> str:
     """Return the GPU Proxy."""
     return GPUProxy
+
+
+def _newFramePlanes() -> tuple[
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.str_],
+]:
+    """Return (height, width) views of the new frame tables."""
+    shape = (bufferHeight, bufferWidth)
+    return (
+        newFrameBackgrounds.reshape(shape),
+        newFrameForegrounds.reshape(shape),
+        newFrameSymbols.reshape(shape),
+    )
+
+
+def _clip(
+    x: int,
+    y: int,
+    width: int,
+    height: int,
+) -> tuple[int, int, int, int] | None:
+    """Return the corners of the part of an area inside the draw limit and the buffer, or None if none of it is."""
+    x1 = max(x, drawLimitX1, 1)
+    y1 = max(y, drawLimitY1, 1)
+    x2 = min(x + width - 1, drawLimitX2, bufferWidth)
+    y2 = min(y + height - 1, drawLimitY2, bufferHeight)
+    if x1 > x2 or y1 > y2:
+        return None
+    return x1, y1, x2, y2
+
+
+def drawRectangle(
+    x: int,
+    y: int,
+    width: int,
+    height: int,
+    background: int,
+    foreground: int,
+    symbol: str,
+    transparency: float | None = None,
+) -> None:
+    """Draw a rectangle. If transparency is given, only blend the colors under it with background."""
+    area = _clip(x, y, width, height)
+    if area is None:
+        return
+    x1, y1, x2, y2 = area
+    rows, columns = slice(y1 - 1, y2), slice(x1 - 1, x2)
+    backgrounds, foregrounds, symbols = _newFramePlanes()
+
+    if transparency is None:
+        backgrounds[rows, columns] = background
+        foregrounds[rows, columns] = foreground
+        symbols[rows, columns] = symbol
+    else:
+        backgrounds[rows, columns] = color.blendMany(
+            backgrounds[rows, columns],
+            background,
+            transparency,
+        )
+        foregrounds[rows, columns] = color.blendMany(
+            foregrounds[rows, columns],
+            background,
+            transparency,
+        )
+
+
+def drawText(
+    x: int,
+    y: int,
+    textColor: int,
+    text: str,
+    transparency: float | None = None,
+) -> None:
+    """Draw text over the current background. If transparency is given, blend textColor with the background under every symbol."""
+    area = _clip(x, y, len(text), 1)
+    if area is None:
+        return
+    x1, _, x2, _ = area
+    columns = slice(x1 - 1, x2)
+    backgrounds, foregrounds, symbols = _newFramePlanes()
+
+    if transparency is None:
+        foregrounds[y - 1, columns] = textColor
+    else:
+        foregrounds[y - 1, columns] = color.blendMany(
+            backgrounds[y - 1, columns],
+            textColor,
+            transparency,
+        )
+    symbols[y - 1, columns] = list(text[x1 - x : x2 - x + 1])
+
+
+def drawImage(
+    x: int,
+    y: int,
+    picture: image.Picture,
+    blendForeground: bool = False,
+) -> None:
+    """Draw a picture, blending transparent pixels with what is under them. If blendForeground is True, blend foregrounds as well as backgrounds."""
+    area = _clip(x, y, picture.width, picture.height)
+    if area is None:
+        return
+    x1, y1, x2, y2 = area
+    rows, columns = slice(y1 - 1, y2), slice(x1 - 1, x2)
+    source = (slice(y1 - y, y2 - y + 1), slice(x1 - x, x2 - x + 1))
+    backgrounds, foregrounds, symbols = _newFramePlanes()
+
+    alpha = picture.alpha[source]
+    pictureBackgrounds = picture.background[source]
+    pictureForegrounds = picture.foreground[source]
+    pictureSymbols = picture.symbol[source]
+    frameBackgrounds = backgrounds[rows, columns]
+    frameForegrounds = foregrounds[rows, columns]
+
+    opaque = alpha == 0
+    translucent = ~opaque & (alpha < 255)
+    transparency = alpha[translucent] / 255
+
+    newBackgrounds = np.where(opaque, pictureBackgrounds, frameBackgrounds)
+    newBackgrounds[translucent] = color.blendMany(
+        frameBackgrounds[translucent],
+        pictureBackgrounds[translucent],
+        transparency,
+    )
+    # Fully transparent pixels only draw over the frame if they show a symbol
+    drawn = opaque | translucent | (pictureSymbols != " ")
+    newForegrounds = np.where(drawn, pictureForegrounds, frameForegrounds)
+    if blendForeground:
+        newForegrounds[translucent] = color.blendMany(
+            frameForegrounds[translucent],
+            pictureForegrounds[translucent],
+            transparency,
+        )
+
+    backgrounds[rows, columns] = newBackgrounds
+    foregrounds[rows, columns] = newForegrounds
+    symbols[rows, columns] = np.where(
+        drawn,
+        pictureSymbols,
+        symbols[rows, columns],
+    )
+
+
+def copy(x: int, y: int, width: int, height: int) -> image.Picture:
+    """Return a picture of an area of the new frame. Pixels outside the buffer are black spaces."""
+    picture = image.Picture(width, height)
+    x1, y1 = max(x, 1), max(y, 1)
+    x2, y2 = min(x + width - 1, bufferWidth), min(y + height - 1, bufferHeight)
+    if x1 > x2 or y1 > y2:
+        return picture
+    area = (slice(y1 - 1, y2), slice(x1 - 1, x2))
+    target = (slice(y1 - y, y2 - y + 1), slice(x1 - x, x2 - x + 1))
+    backgrounds, foregrounds, symbols = _newFramePlanes()
+
+    picture.background[target] = backgrounds[area]
+    picture.foreground[target] = foregrounds[area]
+    picture.symbol[target] = symbols[area]
+    return picture
+
+
+def paste(x: int, y: int, picture: image.Picture) -> None:
+    """Paste a picture from copy back into the new frame, ignoring alpha."""
+    area = _clip(x, y, picture.width, picture.height)
+    if area is None:
+        return
+    x1, y1, x2, y2 = area
+    rows, columns = slice(y1 - 1, y2), slice(x1 - 1, x2)
+    source = (slice(y1 - y, y2 - y + 1), slice(x1 - x, x2 - x + 1))
+    backgrounds, foregrounds, symbols = _newFramePlanes()
+
+    backgrounds[rows, columns] = picture.background[source]
+    foregrounds[rows, columns] = picture.foreground[source]
+    symbols[rows, columns] = picture.symbol[source]
+
+
+def rasterizeLine(
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Return the x and y choordinates of every point of a line."""
+    steps = max(abs(x2 - x1), abs(y2 - y1)) + 1
+    return (
+        np.rint(np.linspace(x1, x2, steps)).astype(np.int64),
+        np.rint(np.linspace(y1, y2, steps)).astype(np.int64),
+    )
+
+
+def drawLine(
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+    background: int,
+    foreground: int,
+    symbol: str,
+) -> None:
+    """Draw a line between two points."""
+    if x1 == x2 or y1 == y2:
+        drawRectangle(
+            min(x1, x2),
+            min(y1, y2),
+            abs(x2 - x1) + 1,
+            abs(y2 - y1) + 1,
+            background,
+            foreground,
+            symbol,
+        )
+        return
+
+    xs, ys = rasterizeLine(x1, y1, x2, y2)
+    visible = (
+        (xs >= max(drawLimitX1, 1))
+        & (xs <= min(drawLimitX2, bufferWidth))
+        & (ys >= max(drawLimitY1, 1))
+        & (ys <= min(drawLimitY2, bufferHeight))
+    )
+    points = (ys[visible] - 1, xs[visible] - 1)
+    backgrounds, foregrounds, symbols = _newFramePlanes()
+
+    backgrounds[points] = background
+    foregrounds[points] = foreground
+    symbols[points] = symbol
+
+
+def rasterizeEllipse(
+    centerX: int,
+    centerY: int,
+    radiusX: int,
+    radiusY: int,
+) -> list[tuple[int, int, int]]:
+    """Return the outline of an ellipse as (x1, x2, y) spans."""
+    offsets = np.arange(-radiusY, radiusY + 1)
+    if radiusY:
+        reach = np.rint(
+            radiusX * np.sqrt(1 - (offsets / radiusY) ** 2),
+        ).astype(np.int64)
+    else:
+        reach = np.full(1, radiusX)
+    # Each row goes in as far as the next row further from the center
+    # reaches out, so the outline stays connected
+    padded = np.concatenate(([-1], reach, [-1]))
+    outer = np.where(offsets < 0, padded[:-2], padded[2:])
+    inner = np.minimum(reach, outer + 1)
+
+    spans = []
+    for offset, start, end in zip(
+        offsets.tolist(),
+        inner.tolist(),
+        reach.tolist(),
+        strict=True,
+    ):
+        y = centerY + offset
+        if start == 0:
+            spans.append((centerX - end, centerX + end, y))
+        else:
+            spans.append((centerX - end, centerX - start, y))
+            spans.append((centerX + start, centerX + end, y))
+    return spans
+
+
+def drawEllipse(
+    centerX: int,
+    centerY: int,
+    radiusX: int,
+    radiusY: int,
+    background: int,
+    foreground: int,
+    symbol: str,
+) -> None:
+    """Draw the outline of an ellipse."""
+    for x1, x2, y in rasterizeEllipse(centerX, centerY, radiusX, radiusY):
+        drawRectangle(x1, y, x2 - x1 + 1, 1, background, foreground, symbol)
@@ -15,15 +15,21 @@ __all__ = [
     "getArchitecture",
     "getBootAddress",
     "getDeviceInfo",
+    "getSignalMetrics",
     "isRobot",
     "isRunning",
     "math",
     "maxEnergy",
     "pullSignal",
+    "pullSignalAsync",
+    "pullSignalBatch",
     "pushSignal",
+    "pushSignalBatch",
     "removeUser",
     "runlevel",
     "setBootAddress",
+    "setCoalescing",
+    "setSignalQueue",
     "shutdown",
     "start",
     "stop",
@@ -33,21 +39,121 @@ __all__ = [
     "users",
 ]
 
+import asyncio
 import math
 import os
 import struct
 import time
-from collections import deque
-from threading import Lock as _Lock, Thread as _Thread
+from collections import Counter
+from threading import (
+    Condition as _Condition,
+    Lock as _Lock,
+    RLock as _RLock,
+    Thread as _Thread,
+)
 
 _ADDRESS = "a1b2c3d4-e5f6-a1b2-c3d4-e5f6a1b2c3d4"
 _TMPFS = "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx"
-_START = math.floor(time.time())
+_START = time.time()
 _RUNNING = False
 _SHUTTINGDOWN = False
 _REBOOT = False
 
-_SIGNALS = deque()
+
+class _SignalRing:
+    """Hidden ring buffer of (name, *args) signal tuples, holding up to capacity of them. capacity may be math.inf, and the records list doubles in size whenever it fills up below capacity. Only use while holding _SIGNALS_LOCK."""
+
+    __slots__ = ("capacity", "head", "records", "size")
+
+    def __init__(self, capacity):
+        """Make an empty ring for up to capacity signals."""
+        self.capacity = capacity
+        self.records = [None] * min(capacity, 256)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        """Return the number of queued signals."""
+        return self.size
+
+    def append(self, signal):
+        """Add signal after the newest one. The ring must not be full."""
+        if self.size == len(self.records):
+            grown = min(self.size, self.capacity - self.size)
+            self.records = self.ordered() + [None] * grown
+            self.head = 0
+        self.records[(self.head + self.size) % len(self.records)] = signal
+        self.size += 1
+
+    def last(self):
+        """Return the newest signal. The ring must not be empty."""
+        return self.records[(self.head + self.size - 1) % len(self.records)]
+
+    def replaceLast(self, signal):
+        """Replace the newest signal. The ring must not be empty."""
+        self.records[(self.head + self.size - 1) % len(self.records)] = signal
+
+    def popleft(self):
+        """Remove and return the oldest signal. The ring must not be empty."""
+        signal = self.records[self.head]
+        self.records[self.head] = None
+        self.head = (self.head + 1) % len(self.records)
+        self.size -= 1
+        return signal
+
+    def ordered(self):
+        """Return a list of the queued signals, oldest first."""
+        end = self.head + self.size
+        signals = self.records[self.head : end]
+        signals += self.records[: max(end - len(self.records), 0)]
+        return signals
+
+    def drain(self):
+        """Remove and return a list of all queued signals, oldest first."""
+        signals = self.ordered()
+        self.records = [None] * len(self.records)
+        self.head = self.size = 0
+        return signals
+
+
+# Unlike OpenComputers, which drops new signals after 256 are queued, never
+# lose signals unless setSignalQueue is asked to
+_SIGNALS = _SignalRing(math.inf)
+_OVERFLOW = "dropNewest"
+_OVERFLOW_POLICIES = ("dropNewest", "dropOldest", "block")
+_DROPPED = Counter()
+_SIGNALS_LOCK = _RLock()
+_SIGNALS_CHANGED = _Condition(_SIGNALS_LOCK)
+_SPACE_FREED = _Condition(_SIGNALS_LOCK)
+# Threads waiting in pullSignal, pushSignal only notifies if there are any
+_WAITING = 0
+# Futures of coroutines waiting in pullSignalAsync, by the loop they run in
+_ASYNC_WAITERS = {}
+
+
+def _mergeDrag(previous, new):
+    """Hidden function to keep only the newest of two drags by the same player and button on the same screen."""
+    # screenAddress, x, y, button, playerName
+    if previous[0] == new[0] and previous[3:] == new[3:]:
+        return new
+    return None
+
+
+def _mergeScroll(previous, new):
+    """Hidden function to add up two scrolls by the same player at the same spot."""
+    # screenAddress, x, y, direction, playerName
+    if (
+        len(previous) == len(new) > 3
+        and previous[:3] == new[:3]
+        and previous[4:] == new[4:]
+    ):
+        return (*new[:3], previous[3] + new[3], *new[4:])
+    return None
+
+
+# Merge functions for signals that are coalesced with the one queued before
+_COALESCE = {"drag": _mergeDrag, "scroll": _mergeScroll}
+_COALESCED = Counter()
 
 _PITCHSTANDARD = 440
 
@@ -69,7 +175,7 @@ def start():
             _REBOOT = True
         return False
     _RUNNING = True
-    _START = math.floor(time.time())
+    _START = time.time()
     return True
 
 
@@ -132,7 +238,7 @@ def maxEnergy():
 
 def uptime():
     """The time in real world seconds this computer has been running, measured based on the world time that passed since it was started - meaning this will not increase while the game is paused, for example."""
-    return math.floor(time.time()) - _START
+    return time.time() - _START
 
 
 def shutdown(reboot=False):
@@ -175,34 +281,186 @@ def removeUser(name):
     return False
 
 
-class _Signal:
-    def __init__(self, name, *args):
-        self.name = name
-        self.args = args
-
-    def __repr__(self):
-        args = " ,".join(self.args)
-        return f"_Signal({self.name}, {args})"
-
-
 def pushSignal(name, *args):
     """Pushes a new signal into the queue. _Signals are processed in a FIFO order. The signal has to at least have a name. Arguments to pass along with it are optional. Note that the types supported as signal parameters are limited to the basic types nil, boolean, number, string, and tables. Yes tables are supported (keep reading). Threads and functions are not supported.
     Note that only tables of the supported types are supported. That is, tables must compose types supported, such as other strings and numbers, or even sub tables. But not of functions or threads.
     """
-    _SIGNALS.append(_Signal(name, *args))
+    with _SIGNALS_LOCK:
+        if _queueSignal((name, *args)):
+            _signalsAdded(1)
+
+
+def pushSignalBatch(signals):
+    """Push many (name, *args) signal tuples at once. Works like calling pushSignal for each, but only takes the queue lock once."""
+    with _SIGNALS_LOCK:
+        added = 0
+        for signal in signals:
+            added += _queueSignal(signal)
+        if added:
+            _signalsAdded(added)
+
+
+def _queueSignal(signal):
+    """Hidden function to add a signal tuple to the queue, coalescing it or applying the overflow policy. Returns if it was added as a new signal. Must hold _SIGNALS_LOCK."""
+    name = signal[0]
+    if name in _COALESCE and _SIGNALS.size and _SIGNALS.last()[0] == name:
+        merged = _COALESCE[name](_SIGNALS.last()[1:], signal[1:])
+        if merged is not None:
+            _SIGNALS.replaceLast((name, *merged))
+            _COALESCED[name] += 1
+            return False
+    if _SIGNALS.size == _SIGNALS.capacity:
+        if _OVERFLOW == "dropNewest":
+            _DROPPED[name] += 1
+            return False
+        if _OVERFLOW == "dropOldest":
+            _DROPPED[_SIGNALS.popleft()[0]] += 1
+        else:
+            # Make sure someone is pulling before waiting for them
+            _signalsAdded(_SIGNALS.size)
+            _SPACE_FREED.wait_for(lambda: _SIGNALS.size < _SIGNALS.capacity)
+    _SIGNALS.append(signal)
+    return True
+
+
+def _signalsAdded(count):
+    """Hidden function to wake up to count threads and coroutines waiting for signals. Must hold _SIGNALS_LOCK."""
+    if _WAITING:
+        _SIGNALS_CHANGED.notify(count)
+    for _ in range(min(count, len(_ASYNC_WAITERS))):
+        _wakeAsyncWaiter()
+
+
+def _freedSpace():
+    """Hidden function to let producers blocked on a full queue continue. Must hold _SIGNALS_LOCK."""
+    if _OVERFLOW == "block" and _SIGNALS.size == _SIGNALS.capacity:
+        _SPACE_FREED.notify_all()
+
+
+def setSignalQueue(capacity=math.inf, overflow="dropNewest"):
+    """Set how many signals can be queued and what pushSignal does when the queue is full. By default the queue is unbounded and never loses signals.
+
+    "dropNewest" drops the pushed signal like OpenComputers, which queues up to 256 signals, and "dropOldest" drops the oldest queued signal instead. Either way the loss is only counted in getSignalMetrics. "block" waits until a signal is pulled by another thread, so it deadlocks if the pushing thread is the only one pulling signals, or runs the asyncio loop whose coroutines pull them.
+
+    Queued signals that do not fit in the new capacity are dropped, oldest first.
+    """
+    global _SIGNALS, _OVERFLOW
+    if overflow not in _OVERFLOW_POLICIES:
+        raise ValueError(
+            f"Overflow policy must be one of {_OVERFLOW_POLICIES}.",
+        )
+    if capacity < 1:
+        raise ValueError("Signal queue capacity must be at least 1.")
+    with _SIGNALS_LOCK:
+        signals = _SIGNALS.drain()
+        dropped = max(len(signals) - capacity, 0)
+        for signal in signals[:dropped]:
+            _DROPPED[signal[0]] += 1
+        _SIGNALS = _SignalRing(capacity)
+        for signal in signals[dropped:]:
+            _SIGNALS.append(signal)
+        _OVERFLOW = overflow
+        _SPACE_FREED.notify_all()
+
+
+def setCoalescing(name, merge=None):
+    """Set how consecutive signals with given name are coalesced in the queue. merge is called with the arguments of the queued signal and the pushed one, and returns the arguments of the merged signal or None if they should stay apart. If merge is None, stop coalescing them.
+
+    drag and scroll are coalesced by default. touch is not, since merging touches would lose clicks.
+    """
+    with _SIGNALS_LOCK:
+        if merge is None:
+            _COALESCE.pop(name, None)
+        else:
+            _COALESCE[name] = merge
+
+
+def getSignalMetrics():
+    """Return a dictionary with the number of queued signals as depth, the queue capacity, and by signal name how many were merged into another as coalesced and how many were lost to a full queue as dropped."""
+    with _SIGNALS_LOCK:
+        return {
+            "depth": len(_SIGNALS),
+            "capacity": _SIGNALS.capacity,
+            "coalesced": dict(_COALESCED),
+            "dropped": dict(_DROPPED),
+        }
 
 
 def pullSignal(timeout=math.inf):
     """Tries to pull a signal from the queue, waiting up to the specified amount of time before failing and returning nil. If no timeout is specified waits forever.
     The first returned result is the signal name, following results correspond to what was pushed in push_Signal, for example. These vary based on the event type. Generally it is more convenient to use event.pull from the event library. The return value is the very same, but the event library provides some more options.
     """
-    start = math.floor(time.time())
-    while math.floor(time.time()) - start < timeout:
-        if _SIGNALS:
-            signal = _SIGNALS.popleft()
-            return signal.name, *signal.args
-    ##            return signalName, *signalargs
-    return None
+    with _SIGNALS_LOCK:
+        if not _waitForSignals(timeout):
+            return None
+        _freedSpace()
+        return _SIGNALS.popleft()
+
+
+def pullSignalBatch(timeout=math.inf):
+    """Wait like pullSignal for a signal, then return it along with every other pending signal as a list. Returns an empty list on timeout."""
+    with _SIGNALS_LOCK:
+        if not _waitForSignals(timeout):
+            return []
+        _freedSpace()
+        return _SIGNALS.drain()
+
+
+def _waitForSignals(timeout):
+    """Hidden function to wait up to timeout seconds for a signal to be queued. Returns if there is one. Must hold _SIGNALS_LOCK."""
+    global _WAITING
+    if _SIGNALS.size:
+        return True
+    # Sleep until pushSignal notifies us instead of polling the queue
+    _WAITING += 1
+    try:
+        return _SIGNALS_CHANGED.wait_for(
+            lambda: _SIGNALS.size,
+            None if timeout == math.inf else max(timeout, 0),
+        )
+    finally:
+        _WAITING -= 1
+
+
+def _wakeAsyncWaiter():
+    """Hidden function to wake the longest waiting pullSignalAsync. Must hold _SIGNALS_LOCK."""
+    if _ASYNC_WAITERS:
+        future = next(iter(_ASYNC_WAITERS))
+        loop = _ASYNC_WAITERS.pop(future)
+        # pushSignal may be called from any thread
+        loop.call_soon_threadsafe(_setWoken, future)
+
+
+def _setWoken(future):
+    """Hidden function to resolve a waiter future unless it was given up on."""
+    if not future.done():
+        future.set_result(None)
+
+
+async def pullSignalAsync(timeout=math.inf):
+    """Coroutine version of pullSignal. Waiting costs nothing until a signal is pushed, so any number of coroutines can wait at once."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max(timeout, 0)
+    while True:
+        with _SIGNALS_LOCK:
+            if _SIGNALS:
+                _freedSpace()
+                return _SIGNALS.popleft()
+            future = loop.create_future()
+            _ASYNC_WAITERS[future] = loop
+        try:
+            if timeout == math.inf:
+                await future
+            else:
+                await asyncio.wait_for(future, deadline - loop.time())
+        except BaseException as exception:
+            with _SIGNALS_LOCK:
+                # Pass on a wakeup that came in as we gave up
+                if _ASYNC_WAITERS.pop(future, None) is None and _SIGNALS:
+                    _wakeAsyncWaiter()
+            if isinstance(exception, TimeoutError):
+                return None
+            raise
 
 
 def _beeps_threads_cleanup():
@@ -0,0 +1,11 @@
+"""Put the Libraries and Helpers directories on the import path."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("Libraries", "Helpers"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
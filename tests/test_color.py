@@ -0,0 +1,171 @@
+"""Tests for the palette lookups and batch functions of both color modules."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import Color
+import color
+import numpy as np
+import pytest
+
+CHUNK = 1 << 18
+SAMPLE = 20_000
+# PALETTE is every mix of these channel levels, plus 16 grays
+RED = (0x00, 0x33, 0x66, 0x99, 0xCC, 0xFF)
+GREEN = (0x00, 0x24, 0x49, 0x6D, 0x92, 0xB6, 0xDB, 0xFF)
+BLUE = (0x00, 0x40, 0x80, 0xBF, 0xFF)
+GRAYS = tuple(range(0x0F, 0xFF, 0x0F))
+
+LOOKUPS = [
+    pytest.param(color.to_8_bit, color.to_8_bit_many, id="Helpers"),
+    pytest.param(Color.to8Bit, Color.to8BitMany, id="Libraries"),
+]
+
+BLENDS = [
+    pytest.param(color.blend, color.blend_many, id="Helpers blend"),
+    pytest.param(Color.blend, Color.blendMany, id="Libraries blend"),
+    pytest.param(
+        color.transition,
+        color.transition_many,
+        id="Helpers transition",
+    ),
+    pytest.param(
+        Color.transition,
+        Color.transitionMany,
+        id="Libraries transition",
+    ),
+]
+TO_HSB = [
+    pytest.param(color.rgb_to_hsb, color.rgb_to_hsb_many, id="Helpers"),
+    pytest.param(Color.RGBToHSB, Color.RGBToHSBMany, id="Libraries"),
+]
+TO_RGB = [
+    pytest.param(color.hsb_to_rgb, color.hsb_to_rgb_many, id="Helpers"),
+    pytest.param(Color.HSBToRGB, Color.HSBToRGBMany, id="Libraries"),
+]
+
+
+def brute_force_8_bit(colors):
+    """Return nearest PALETTE index of every color, checking all of them."""
+    palette = np.array(Color.PALETTE, dtype=np.int64)
+    delta = sum(
+        (
+            (palette >> shift & 0xFF)[np.newaxis, :]
+            - (colors >> shift & 0xFF)[:, np.newaxis]
+        )
+        ** 2
+        for shift in (16, 8, 0)
+    )
+    # argmin keeps the first index on ties, like the strict < search
+    return delta.argmin(axis=1)
+
+
+def reference_8_bit(colors):
+    """Return nearest PALETTE index of every color, like brute_force_8_bit.
+
+    Deltas add up over channels, so the nearest color of the level grid
+    has the nearest level of every channel. PALETTE is sorted, so on ties
+    the first index is the smallest color, which has the lowest levels.
+    """
+    rgb = [colors >> shift & 0xFF for shift in (16, 8, 0)]
+    nearest = np.zeros_like(colors)
+    delta = np.zeros_like(colors)
+    for levels, shift in zip((RED, GREEN, BLUE), (16, 8, 0), strict=True):
+        value = colors >> shift & 0xFF
+        level_delta = (
+            np.array(levels)[np.newaxis, :] - value[:, np.newaxis]
+        ) ** 2
+        nearest |= np.array(levels)[level_delta.argmin(axis=1)] << shift
+        delta += level_delta.min(axis=1)
+    for gray in GRAYS:
+        gray_delta = sum((gray - value) ** 2 for value in rgb)
+        gray_color = gray * 0x010101
+        closer = (gray_delta < delta) | (
+            (gray_delta == delta) & (gray_color < nearest)
+        )
+        nearest[closer] = gray_color
+        delta[closer] = gray_delta[closer]
+    return np.searchsorted(Color.PALETTE, nearest)
+
+
+@pytest.fixture(scope="module")
+def nearest_indices():
+    """Return nearest PALETTE index of every 24 bit color."""
+    return np.concatenate(
+        [
+            reference_8_bit(np.arange(start, start + CHUNK, dtype=np.int64))
+            for start in range(0, 1 << 24, CHUNK)
+        ],
+    ).astype(np.uint8)
+
+
+def test_palettes_are_levels_and_grays():
+    grid = [r << 16 | g << 8 | b for r in RED for g in GREEN for b in BLUE]
+    grays = [gray * 0x010101 for gray in GRAYS]
+    assert Color.PALETTE == color.PALETTE == tuple(sorted(grid + grays))
+
+
+def test_reference_matches_brute_force():
+    colors = np.random.default_rng(0).integers(0, 1 << 24, 1 << 14)
+    # Gray and level boundaries are where ties happen
+    edges = np.array(
+        [value * 0x010101 for value in range(256)]
+        + [value << shift for value in range(256) for shift in (16, 8, 0)],
+    )
+    colors = np.concatenate((colors, edges))
+    assert np.array_equal(reference_8_bit(colors), brute_force_8_bit(colors))
+
+
+@pytest.mark.parametrize(("to_8_bit", "to_8_bit_many"), LOOKUPS)
+def test_to_8_bit_many_every_color(to_8_bit, to_8_bit_many, nearest_indices):
+    for start in range(0, 1 << 24, CHUNK):
+        colors = np.arange(start, start + CHUNK, dtype=np.int64)
+        assert np.array_equal(
+            to_8_bit_many(colors),
+            nearest_indices[start : start + CHUNK],
+        ), f"differs in {start:06x}..{start + CHUNK - 1:06x}"
+
+
+@pytest.mark.parametrize(("to_8_bit", "to_8_bit_many"), LOOKUPS)
+def test_to_8_bit_sample(to_8_bit, to_8_bit_many, nearest_indices):
+    colors = np.random.default_rng(1).integers(0, 1 << 24, 1 << 15)
+    for value in colors.tolist():
+        assert to_8_bit(value) == nearest_indices[value], f"{value:06x}"
+
+
+@pytest.mark.parametrize(("scalar", "many"), BLENDS)
+def test_blend_many_matches_scalar(scalar, many):
+    rng = np.random.default_rng(2)
+    first, second = rng.integers(0, 1 << 24, (2, SAMPLE))
+    amount = rng.random(SAMPLE)
+    amount[:3] = (0, 0.5, 1)
+    expected = [
+        scalar(*pair)
+        for pair in zip(
+            first.tolist(),
+            second.tolist(),
+            amount.tolist(),
+            strict=True,
+        )
+    ]
+    assert many(first, second, amount).tolist() == expected
+
+
+@pytest.mark.parametrize(("scalar", "many"), TO_HSB)
+def test_rgb_to_hsb_many_matches_scalar(scalar, many):
+    channels = np.random.default_rng(3).integers(0, 256, (3, SAMPLE))
+    # The scalar version divides by zero for black
+    channels[:, channels.max(axis=0) == 0] = 1
+    channels[:, 0] = 0x80
+    hsb = np.stack(many(*channels), axis=1).tolist()
+    assert hsb == [list(scalar(*rgb)) for rgb in channels.T.tolist()]
+
+
+@pytest.mark.parametrize(("scalar", "many"), TO_RGB)
+def test_hsb_to_rgb_many_matches_scalar(scalar, many):
+    rng = np.random.default_rng(4)
+    hsb = np.stack(
+        (rng.random(SAMPLE) * 360, rng.random(SAMPLE), rng.random(SAMPLE)),
+    )
+    rgb = np.stack(many(*hsb), axis=1).tolist()
+    assert rgb == [list(scalar(*value)) for value in hsb.T.tolist()]
@@ -0,0 +1,241 @@
+"""Tests for the computer signal queue."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import asyncio
+import threading
+
+import computer
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    """Start and leave every test with an empty default signal queue."""
+    computer.setSignalQueue()
+    computer.pullSignalBatch(0)
+    yield
+    computer.setSignalQueue()
+    computer.pullSignalBatch(0)
+
+
+def dropped():
+    return sum(computer.getSignalMetrics()["dropped"].values())
+
+
+def test_default_queue_never_drops():
+    before = dropped()
+    for i in range(1000):
+        computer.pushSignal("test", i)
+    assert computer.pullSignalBatch(0) == [("test", i) for i in range(1000)]
+    assert dropped() == before
+
+
+def test_queue_keeps_order_while_growing_around_the_end():
+    expected = []
+    for i in range(600):
+        computer.pushSignal("test", 2 * i)
+        computer.pushSignal("test", 2 * i + 1)
+        expected += [("test", 2 * i), ("test", 2 * i + 1)]
+        assert computer.pullSignal(0) == expected.pop(0)
+    assert computer.pullSignalBatch(0) == expected
+
+
+@pytest.mark.parametrize(
+    ("overflow", "kept"),
+    [("dropNewest", [0, 1, 2]), ("dropOldest", [2, 3, 4])],
+)
+def test_full_queue_drops_by_policy(overflow, kept):
+    computer.setSignalQueue(3, overflow)
+    before = dropped()
+    for i in range(5):
+        computer.pushSignal("test", i)
+    assert computer.pullSignalBatch(0) == [("test", i) for i in kept]
+    assert dropped() == before + 2
+
+
+def test_block_policy_loses_nothing():
+    computer.setSignalQueue(10, "block")
+    before = dropped()
+    signals = [("test", i) for i in range(1000)]
+
+    def producer():
+        for start in range(0, len(signals), 100):
+            computer.pushSignalBatch(signals[start : start + 100])
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    received = []
+    while len(received) < len(signals):
+        batch = computer.pullSignalBatch(10)
+        assert batch, "producer stopped early"
+        assert len(batch) <= 10
+        received += batch
+    thread.join(10)
+    assert received == signals
+    assert dropped() == before
+
+
+def test_shrinking_queue_drops_oldest():
+    for i in range(5):
+        computer.pushSignal("test", i)
+    computer.setSignalQueue(2)
+    assert computer.getSignalMetrics()["capacity"] == 2
+    assert computer.pullSignalBatch(0) == [("test", 3), ("test", 4)]
+
+
+def test_pull_signal_times_out_on_empty_queue():
+    assert computer.pullSignal(0.01) is None
+    assert computer.pullSignalBatch(0.01) == []
+
+
+def test_blocked_pull_signal_wakes_up_on_push():
+    pulled = []
+    thread = threading.Thread(
+        target=lambda: pulled.append(computer.pullSignal(10)),
+    )
+    thread.start()
+    computer.pushSignal("test", 1)
+    thread.join(10)
+    assert pulled == [("test", 1)]
+
+
+def coalesced(name):
+    return computer.getSignalMetrics()["coalesced"].get(name, 0)
+
+
+def test_drags_of_one_button_keep_the_newest():
+    before = coalesced("drag")
+    for x in range(5):
+        computer.pushSignal("drag", "screen", x, 1, 0, "player")
+    assert computer.getSignalMetrics()["depth"] == 1
+    assert coalesced("drag") == before + 4
+    assert computer.pullSignalBatch(0) == [
+        ("drag", "screen", 4, 1, 0, "player"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        ("drag", "other screen", 2, 2, 0, "player"),
+        ("drag", "screen", 2, 2, 1, "player"),
+        ("drag", "screen", 2, 2, 0, "other player"),
+        ("touch", "screen", 2, 2, 0, "player"),
+    ],
+)
+def test_drags_stay_apart_from_other_signals(other):
+    first = ("drag", "screen", 1, 1, 0, "player")
+    last = ("drag", "screen", 3, 3, 0, "player")
+    before = coalesced("drag")
+    for signal in (first, other, last):
+        computer.pushSignal(*signal)
+    assert computer.getSignalMetrics()["depth"] == 3
+    assert coalesced("drag") == before
+    assert computer.pullSignalBatch(0) == [first, other, last]
+
+
+def test_scrolls_at_one_spot_add_up():
+    before = coalesced("scroll")
+    for direction in (1, 1, -1, 1):
+        computer.pushSignal("scroll", "screen", 5, 6, direction, "player")
+    computer.pushSignal("scroll", "screen", 5, 7, 1, "player")
+    assert coalesced("scroll") == before + 3
+    assert computer.pullSignalBatch(0) == [
+        ("scroll", "screen", 5, 6, 2, "player"),
+        ("scroll", "screen", 5, 7, 1, "player"),
+    ]
+
+
+def test_touches_are_not_coalesced():
+    for _ in range(3):
+        computer.pushSignal("touch", "screen", 1, 1, 0, "player")
+    assert computer.getSignalMetrics()["depth"] == 3
+    assert "touch" not in computer.getSignalMetrics()["coalesced"]
+
+
+def add_up(previous, new):
+    return (previous[0] + new[0],)
+
+
+def test_set_coalescing():
+    computer.setCoalescing("test", add_up)
+    try:
+        before = coalesced("test")
+        for i in range(1, 4):
+            computer.pushSignal("test", i)
+        assert coalesced("test") == before + 2
+        assert computer.pullSignalBatch(0) == [("test", 6)]
+    finally:
+        computer.setCoalescing("test")
+    computer.pushSignal("test", 1)
+    computer.pushSignal("test", 2)
+    assert computer.pullSignalBatch(0) == [("test", 1), ("test", 2)]
+
+
+def test_metrics_depth_counts_queued_signals():
+    assert computer.getSignalMetrics()["depth"] == 0
+    for i in range(3):
+        computer.pushSignal("test", i)
+    assert computer.getSignalMetrics()["depth"] == 3
+    computer.pullSignal(0)
+    assert computer.getSignalMetrics()["depth"] == 2
+
+
+def push_later(*signal, delay=0.05):
+    """Push signal from another thread after delay seconds."""
+    timer = threading.Timer(delay, computer.pushSignal, signal)
+    timer.start()
+    return timer
+
+
+def test_pull_signal_async_times_out_on_empty_queue():
+    assert asyncio.run(computer.pullSignalAsync(0.01)) is None
+
+
+def test_pull_signal_async_wakes_up_on_push_from_thread():
+    async def main():
+        timer = push_later("test", 1)
+        try:
+            return await asyncio.wait_for(computer.pullSignalAsync(), 10)
+        finally:
+            timer.join()
+
+    assert asyncio.run(main()) == ("test", 1)
+
+
+def test_cancelled_waiter_passes_wakeup_on():
+    async def main():
+        first = asyncio.create_task(computer.pullSignalAsync())
+        second = asyncio.create_task(computer.pullSignalAsync())
+        await asyncio.sleep(0)
+        # Wakes the first waiter, which gives up before it runs
+        computer.pushSignal("test", 1)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await asyncio.wait_for(second, 10)
+
+    assert asyncio.run(main()) == ("test", 1)
+
+
+def test_many_async_waiters_get_one_signal_each():
+    signals = [("test", i) for i in range(200)]
+
+    async def main():
+        waiters = [
+            asyncio.create_task(computer.pullSignalAsync(10)) for _ in signals
+        ]
+        await asyncio.sleep(0)
+        thread = threading.Thread(
+            target=computer.pushSignalBatch,
+            args=(signals,),
+        )
+        thread.start()
+        try:
+            return await asyncio.gather(*waiters)
+        finally:
+            thread.join()
+
+    assert sorted(asyncio.run(main())) == signals
@@ -0,0 +1,194 @@
+"""Tests for Event handlers, timers and pulls."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import asyncio
+import math
+import threading
+
+import computer
+import Event
+import pytest
+
+
+@pytest.fixture
+def handled():
+    """Register a coroutine handler for "test" signals, return its log."""
+    computer.pullSignalBatch(0)
+    log = []
+
+    async def callback(name, value):
+        await asyncio.sleep(0)
+        log.append(value)
+
+    handler = Event.addHandler(callback, signalName="test")
+    yield log
+    Event.removeHandler(handler)
+    computer.pullSignalBatch(0)
+
+
+def test_pull_runs_coroutine_handler_to_completion(handled):
+    Event.push("test", 1)
+    assert Event.pull(0) == ("test", 1)
+    assert handled == [1]
+
+
+def test_pull_batch_runs_coroutine_handlers_to_completion(handled):
+    Event.push("test", 1)
+    Event.push("test", 2)
+    assert Event.pullBatch(0) == [("test", 1), ("test", 2)]
+    assert handled == [1, 2]
+
+
+def test_pull_inside_running_loop_starts_task(handled):
+    async def main():
+        Event.push("test", 1)
+        Event.push("test", 2)
+        assert Event.pull(0) == ("test", 1)
+        assert Event.pullBatch(0) == [("test", 2)]
+        assert handled == []
+        await asyncio.gather(*Event.backgroundTasks)
+        return handled
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_pull_async_times_out(handled):
+    assert asyncio.run(Event.pullAsync(0.01)) is None
+    assert handled == []
+
+
+def test_pull_async_wakes_up_on_push_from_thread(handled):
+    async def main():
+        timer = threading.Timer(0.05, Event.push, ("test", 1))
+        timer.start()
+        try:
+            signal = await asyncio.wait_for(Event.pullAsync(), 10)
+            await asyncio.gather(*Event.backgroundTasks)
+        finally:
+            timer.join()
+        return signal
+
+    assert asyncio.run(main()) == ("test", 1)
+    assert handled == [1]
+
+
+def test_sleep_async_runs_handlers_while_waiting(handled):
+    async def main():
+        timer = threading.Timer(0.02, Event.push, ("test", 1))
+        timer.start()
+        start = computer.uptime()
+        try:
+            await Event.sleepAsync(0.1)
+            await asyncio.gather(*Event.backgroundTasks)
+        finally:
+            timer.join()
+        return computer.uptime() - start
+
+    assert asyncio.run(main()) >= 0.1
+    assert handled == [1]
+
+
+def test_handlers_get_signals_of_their_name():
+    computer.pullSignalBatch(0)
+    by_name = []
+    every = []
+    handlers = [
+        Event.addHandler(
+            lambda *signal: by_name.append(signal),
+            signalName="touch",
+        ),
+        Event.addHandler(lambda *signal: every.append(signal)),
+    ]
+    try:
+        for signal in (("touch", 1), ("drag", 2), ("touch", 3)):
+            computer.pushSignal(*signal)
+        assert Event.pullBatch(0) == [("touch", 1), ("drag", 2), ("touch", 3)]
+    finally:
+        for handler in handlers:
+            Event.removeHandler(handler)
+    assert by_name == [("touch", 1), ("touch", 3)]
+    assert every == [("touch", 1), ("drag", 2), ("touch", 3)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Give Event empty handler tables and an uptime set by the test."""
+    monkeypatch.setattr(Event, "handlers", {})
+    monkeypatch.setattr(Event, "signalHandlers", {})
+    monkeypatch.setattr(Event, "timerQueue", [])
+    now = [0.0]
+    monkeypatch.setattr(Event, "computerUptime", lambda: now[0])
+    return now
+
+
+def process(now, uptime, signal=("test",)):
+    """Process signal at uptime like pull does."""
+    now[0] = uptime
+    return Event.processSignal(signal, uptime, asyncio.run)
+
+
+def test_only_due_timers_run(clock):
+    ran = []
+    for interval in (1, 3, 5):
+        Event.addHandler(lambda *_, i=interval: ran.append(i), interval)
+    assert Event.nextTriggerTime() == 1
+    process(clock, 0.5)
+    assert ran == []
+    process(clock, 3)
+    assert sorted(ran) == [1, 3]
+    # Due again one interval after they ran
+    assert Event.nextTriggerTime() == 4
+    assert len(Event.timerQueue) == 3
+
+
+def test_timer_counts_down_times(clock):
+    ran = []
+    handler = Event.addHandler(lambda *_: ran.append(clock[0]), 1, 2)
+    for uptime in (1, 2, 3, 4):
+        process(clock, uptime)
+    assert ran == [1, 2]
+    assert handler not in Event.handlers
+    assert Event.nextTriggerTime() == math.inf
+    assert Event.timerQueue == []
+
+
+def test_timer_skips_signals_of_other_names(clock):
+    ran = []
+    Event.addHandler(lambda *_: ran.append(clock[0]), 1, signalName="touch")
+    process(clock, 1, ("drag",))
+    process(clock, 1.5, ("touch",))
+    process(clock, 2, ("touch",))
+    assert ran == [2]
+
+
+def test_removed_timer_is_skipped_lazily(clock):
+    ran = []
+    first = Event.addHandler(lambda *_: ran.append("first"), 1)
+    Event.addHandler(lambda *_: ran.append("second"), 2)
+    assert Event.removeHandler(first)
+    # The entry stays until it comes up
+    assert len(Event.timerQueue) == 2
+    assert Event.nextTriggerTime() == 2
+    assert len(Event.timerQueue) == 1
+    process(clock, 2)
+    assert ran == ["second"]
+
+
+def test_heap_is_rebuilt_when_mostly_stale(clock):
+    ran = []
+    timers = [
+        Event.addHandler(lambda *_, i=i: ran.append(i), 1 + i, 1)
+        for i in range(50)
+    ]
+    for handler in timers[:45]:
+        assert Event.removeHandler(handler)
+    # Rebuilt before removals made the heap much larger than needed
+    assert len(Event.timerQueue) < len(timers)
+    assert len(Event.timerQueue) <= 2 * len(Event.handlers) + 16
+    assert {entry[2] for entry in Event.timerQueue} >= set(timers[45:])
+    assert Event.nextTriggerTime() == 46
+    process(clock, 50)
+    assert ran == [45, 46, 47, 48, 49]
+    assert Event.timerQueue == []
@@ -0,0 +1,686 @@
+"""Tests for Filesystem paths, handles, mounts and the Proxy caches."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import builtins
+import errno
+import importlib.util
+import math
+import os
+import pickle
+import random
+import sys
+import tempfile
+import typing
+from pathlib import Path
+from typing import Any
+
+import component
+import computer
+import Filesystem
+import Paths
+import Proxy
+import pytest
+
+# Usually a tmpfs, so on another device than the temporary directory
+OTHER_DEVICE = "/dev/shm"  # noqa: S108
+
+
+def fake_path(real_path: str | Path) -> str:
+    """Return the OpenComputers path of a real path."""
+    return "/" + os.path.relpath(real_path, Proxy.OPENCOMPUTERS)
+
+
+def tree_files(root: Path) -> dict[str, bytes]:
+    """Return the contents of every file under root by relative path."""
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def write_host_file(real_path: Path, text: str, age: int) -> None:
+    """Write text to real_path without Proxy, modified age seconds ago."""
+    real_path.write_text(text, encoding="utf-8")
+    modified = real_path.stat().st_mtime - age
+    os.utime(real_path, (modified, modified))
+
+
+def make_tree(directory: Path, large_files: int) -> int:
+    """Fill directory with nested folders of small and large files, return their total size."""
+    # Seeded for the same tree every run, not for security
+    rng = random.Random(0)  # noqa: S311
+    folders = [directory]
+    for index in range(10):
+        folder = rng.choice(folders) / f"Folder{index}"
+        folder.mkdir()
+        folders.append(folder)
+    # Large files take more than one copy block
+    large_size = 2 * Filesystem.COPY_BLOCK_SIZE + 1
+    sizes = [4 << 10] * 40 + [large_size] * large_files
+    for index, size in enumerate(sizes):
+        (rng.choice(folders) / f"File{index}.bin").write_bytes(
+            rng.randbytes(size),
+        )
+    return sum(sizes)
+
+
+def mount_proxy(path: str) -> Any:
+    """Mount a new filesystem component at path and return its proxy."""
+    address = component.newRandomAddress()
+    component.addComponent("filesystem", address)
+    proxy = component.proxy(address)
+    assert Filesystem.mount(proxy, path) == (True, None)
+    return proxy
+
+
+def progress_signals() -> list[tuple[Any, ...]]:
+    """Return and remove queued copy_progress signals."""
+    return [
+        signal
+        for signal in computer.pullSignalBatch(0)
+        if signal[0] == "copy_progress"
+    ]
+
+
+def refuse_input(prompt: str = "") -> str:
+    """Fail if anything asks the user a question."""
+    raise AssertionError(f"asked {prompt!r}")
+
+
+@pytest.fixture(autouse=True)
+def forget_loaded_modules():
+    """Remove modules registered by loadfile during the test."""
+    before = set(sys.modules)
+    yield
+    for module_name in set(sys.modules) - before:
+        del sys.modules[module_name]
+
+
+def test_loadfile_runs_file(tmp_path: Path) -> None:
+    real_path = tmp_path / "Main.py"
+    write_host_file(real_path, "VALUE = 6 * 7\n", 10)
+    module, reason = Filesystem.loadfile(fake_path(real_path))
+    assert reason is None
+    assert module.VALUE == 42
+    assert module.__name__ == "Main"
+
+
+def test_loadfile_syntax_error(tmp_path: Path) -> None:
+    real_path = tmp_path / "Broken.py"
+    write_host_file(real_path, "def (\n", 10)
+    module, reason = Filesystem.loadfile(fake_path(real_path))
+    assert module is None
+    assert isinstance(reason, str)
+
+
+def test_loadfile_sees_edits_outside_proxy(tmp_path: Path) -> None:
+    real_path = tmp_path / "Main.py"
+    path = fake_path(real_path)
+    write_host_file(real_path, "VERSION = 1\n", 20)
+    assert Filesystem.loadfile(path)[0].VERSION == 1
+    assert path in Filesystem._CODES
+
+    # Same size, older than a second, changed behind Proxy's back
+    write_host_file(real_path, "VERSION = 2\n", 10)
+    assert Filesystem.loadfile(path)[0].VERSION == 2
+
+
+def test_loadfile_edits_through_filesystem(tmp_path: Path) -> None:
+    real_path = tmp_path / "Main.py"
+    path = fake_path(real_path)
+    write_host_file(real_path, "VERSION = 1\n", 20)
+    assert Filesystem.loadfile(path)[0].VERSION == 1
+    assert Filesystem.write(path, "VERSION = 2\n") == (True, None)
+    assert Filesystem.loadfile(path)[0].VERSION == 2
+
+
+APPLICATION_SOURCE = """\
+VERSION = 1
+
+
+def scramble(value, factor):
+    for step in range(3):
+        value = (value * factor + step) % 65521
+    return value
+
+
+RESULT = scramble(scramble(VERSION, 3), 7)
+"""
+
+
+def test_loadfile_matches_module_import(tmp_path: Path) -> None:
+    real_path = tmp_path / "Main.py"
+    path = fake_path(real_path)
+    write_host_file(real_path, APPLICATION_SOURCE, 10)
+    spec = importlib.util.spec_from_file_location("Imported", real_path)
+    imported = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(imported)
+
+    Filesystem._CODES.clear()
+    module, reason = Filesystem.loadfile(path)
+    assert reason is None
+    assert module.RESULT == imported.RESULT
+    # The second load runs the cached code
+    module, reason = Filesystem.loadfile(path)
+    assert reason is None
+    assert module.RESULT == imported.RESULT
+
+
+DATACLASS_SOURCE = """\
+from __future__ import annotations
+
+import dataclasses
+from typing import ClassVar
+
+
+@dataclasses.dataclass
+class Point:
+    DIMENSIONS: ClassVar[int] = 2
+    x: int
+    y: int
+"""
+
+
+def test_loadfile_registers_module(tmp_path: Path) -> None:
+    real_path = tmp_path / "LoadedPoint.py"
+    write_host_file(real_path, DATACLASS_SOURCE, 10)
+    module, reason = Filesystem.loadfile(fake_path(real_path))
+    assert reason is None
+    assert sys.modules["LoadedPoint"] is module
+    hints = typing.get_type_hints(module.Point)
+    assert list(hints) == ["DIMENSIONS", "x", "y"]
+    point = module.Point(1, 2)
+    assert pickle.loads(pickle.dumps(point)) == point  # noqa: S301
+
+
+def test_loadfile_forgets_failed_module(tmp_path: Path) -> None:
+    real_path = tmp_path / "LoadedFailure.py"
+    write_host_file(real_path, "raise ValueError('failed')\n", 10)
+    with pytest.raises(ValueError, match="failed"):
+        Filesystem.loadfile(fake_path(real_path))
+    assert "LoadedFailure" not in sys.modules
+
+
+def test_do_file_calls_main(tmp_path: Path) -> None:
+    real_path = tmp_path / "Main.py"
+    write_host_file(
+        real_path,
+        "def main(*args, **kwargs):\n    return args, kwargs\n",
+        10,
+    )
+    assert Filesystem.doFile(fake_path(real_path), 1, key=2) == (
+        (1,),
+        {"key": 2},
+    )
+
+
+def test_do_file_without_main_returns_module(tmp_path: Path) -> None:
+    real_path = tmp_path / "Main.py"
+    write_host_file(real_path, "VALUE = 6 * 7\n", 10)
+    assert Filesystem.doFile(fake_path(real_path)).VALUE == 42
+
+
+def test_do_file_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(InterruptedError):
+        Filesystem.doFile(fake_path(tmp_path / "Missing.py"))
+
+
+def test_read_rejects_unknown_format(tmp_path: Path) -> None:
+    real_path = tmp_path / "Text.txt"
+    write_host_file(real_path, "text\n", 10)
+    handle, reason = Filesystem.open_(fake_path(real_path), "r")
+    assert reason is None
+    try:
+        with pytest.raises(InterruptedError, match="got 'x'"):
+            handle.read("x")
+    finally:
+        handle.close()
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 1024])
+@pytest.mark.parametrize("count", [1, 3, 5000])
+def test_buffered_reads_return_whole_file(
+    tmp_path: Path,
+    buffer_size: int,
+    count: int,
+) -> None:
+    real_path = tmp_path / "Data.bin"
+    data = bytes(range(256)) * 40 + b"end"
+    real_path.write_bytes(data)
+    handle, reason = Filesystem.open_(fake_path(real_path), "rb", buffer_size)
+    assert reason is None
+    read = b""
+    try:
+        while (chunk := handle.readString(count)) is not None:
+            assert len(chunk) <= count
+            read += chunk
+    finally:
+        handle.close()
+    assert read == data
+
+
+@pytest.mark.parametrize("mode", ["rb", "rm"])
+def test_read_unicode_char_cut_off_by_eof(tmp_path: Path, mode: str) -> None:
+    real_path = tmp_path / "Text.txt"
+    real_path.write_bytes("a\u2588".encode()[:-1])
+    for chars in (False, True):
+        handle, reason = Filesystem.open_(fake_path(real_path), mode)
+        assert reason is None
+        try:
+            if chars:
+                assert handle.readUnicodeChars(2) == "a"
+            else:
+                assert handle.readUnicodeChar() == "a"
+                assert handle.readUnicodeChar() is None
+        finally:
+            handle.close()
+
+
+@pytest.mark.parametrize("little_endian", [False, True])
+@pytest.mark.parametrize("width", [1, 2, 3, 4, 8])
+def test_read_bytes_array_matches_read_bytes(
+    tmp_path: Path,
+    width: int,
+    little_endian: bool,
+) -> None:
+    real_path = tmp_path / "Data.bin"
+    data = bytes(range(7, 256)) * 5
+    real_path.write_bytes(data)
+    count = len(data) // width
+
+    numbers = []
+    for bulk in (True, False):
+        handle, reason = Filesystem.open_(fake_path(real_path), "rb", 64)
+        assert reason is None
+        try:
+            if bulk:
+                numbers.append(
+                    handle.readBytesArray(count, width, little_endian),
+                )
+            else:
+                numbers.append(
+                    [
+                        handle.readBytes(width, little_endian)
+                        for _ in range(count)
+                    ],
+                )
+        finally:
+            handle.close()
+    assert numbers[0] == numbers[1]
+
+
+def test_mapped_reads_match_buffered_reads(tmp_path: Path) -> None:
+    real_path = tmp_path / "Text.txt"
+    write_host_file(real_path, "MineOS \u00e9\n" * 5000, 10)
+    path = fake_path(real_path)
+    reads = []
+    for mode in ("rb", "rm"):
+        handle, reason = Filesystem.open_(path, mode)
+        assert reason is None
+        try:
+            reads.append(
+                (
+                    handle.readString(3),
+                    handle.readBytes(2),
+                    handle.readUnicodeChar(),
+                    handle.readLine(),
+                    handle.readAll(),
+                ),
+            )
+        finally:
+            handle.close()
+    assert reads[0] == reads[1]
+    assert reads[1][-1].endswith("\u00e9\n")
+
+
+@pytest.mark.parametrize("flush_size", [1, 5, Filesystem.FLUSH_SIZE])
+def test_handle_writes_reach_file(tmp_path: Path, flush_size: int) -> None:
+    real_path = tmp_path / "Written.bin"
+    path = fake_path(real_path)
+    handle, reason = Filesystem.open_(path, "wb", flushSize=flush_size)
+    assert reason is None
+    assert handle.write("MineOS ", b"\x00\xff", 42, True) == (True, None)
+    assert handle.writeBytes(1, 2, 3) == (True, None)
+    assert handle.write("\u00e9" * 10) == (True, None)
+    assert handle.close() == (True, None)
+    assert real_path.read_bytes() == (
+        b"MineOS \x00\xff42true\x01\x02\x03" + "\u00e9".encode() * 10
+    )
+
+
+@pytest.mark.parametrize("mode", ["r", "rb", "rm"])
+def test_read_handle_flush_and_close(tmp_path: Path, mode: str) -> None:
+    real_path = tmp_path / "Text.txt"
+    real_path.write_bytes(b"text")
+    handle, reason = Filesystem.open_(fake_path(real_path), mode)
+    assert reason is None
+    assert handle.readString(2) in {"te", b"te"}
+    assert handle.flush() == (True, None)
+    assert handle.write("more") == (False, "Stream is not writable.")
+    assert handle.close() == (True, None)
+    assert real_path.read_bytes() == b"text"
+
+
+def linear_get(path: str) -> tuple[Any, str]:
+    """Return proxy and rest path of the longest mount prefix by scanning."""
+    found = None
+    for mp in Filesystem.mountedProxies:
+        if path.startswith(mp.path) and (
+            found is None or len(mp.path) > len(found.path)
+        ):
+            found = mp
+    if found is None:
+        return Filesystem.BOOT_PROXY, path
+    return found.proxy, "/" + path[len(found.path) :]
+
+
+def mount_many(count: int) -> list[Any]:
+    """Mount count new filesystem components, some inside others, return their proxies."""
+    mounted: list[tuple[Any, str]] = []
+    for index in range(count):
+        path = Paths.system.mounts + f"Disk{index}/"
+        if index % 4:
+            path = mounted[-1][1] + f"disk{index}/"
+        mounted.append((mount_proxy(path), path))
+    return [proxy for proxy, _ in mounted]
+
+
+def sample_paths(count: int) -> list[str]:
+    """Return count paths inside, beside and outside of mounts."""
+    # Seeded so every run looks up the same paths
+    rng = random.Random(0)  # noqa: S311
+    mounted = [mp.path for mp in Filesystem.mountedProxies]
+    samples = []
+    for _ in range(count):
+        base = rng.choice(mounted)
+        samples += rng.choice(
+            (
+                [base + "Pictures/Girl.pic"],
+                [base[:-1] + "x/file.txt"],
+                ["/Libraries/Filesystem.py"],
+            ),
+        )
+    return samples
+
+
+def test_get_finds_deepest_mount() -> None:
+    mounted = list(Filesystem.mountedProxies)
+    proxies = mount_many(40)
+    try:
+        for path in sample_paths(2000):
+            assert Filesystem.get(path) == linear_get(path)
+    finally:
+        for proxy in proxies:
+            assert Filesystem.unmount(proxy) == (True, None)
+    assert Filesystem.mountedProxies == mounted
+    for path in sample_paths(100):
+        assert Filesystem.get(path) == linear_get(path)
+
+
+def test_get_finds_root_mount() -> None:
+    proxy = mount_proxy("/")
+    try:
+        assert Filesystem.get("/") == (proxy, "/")
+        assert Filesystem.get("/Pictures/Girl.pic") == (
+            proxy,
+            "/Pictures/Girl.pic",
+        )
+        # Deeper mounts still win
+        mp = Filesystem.mountedProxies[0]
+        assert Filesystem.get(mp.path + "File.txt") == (mp.proxy, "/File.txt")
+    finally:
+        assert Filesystem.unmount(proxy) == (True, None)
+    assert Filesystem.get("/Pictures/Girl.pic") == (
+        Filesystem.BOOT_PROXY,
+        "/Pictures/Girl.pic",
+    )
+
+
+def make_listing_tree(directory: Path) -> None:
+    """Fill directory with files of different types and ages, all whole seconds apart."""
+    now = 1_700_000_000
+    extensions = (".pic", ".lua", ".cfg", ".txt", "")
+    for index in range(50):
+        path = directory / f"File{index}{extensions[index % 5]}"
+        path.write_bytes(b"")
+        # Not in the same order as the names
+        modified = now - index * 7 % 50
+        os.utime(path, (modified, modified))
+    for index in range(10):
+        path = directory / f"Folder{index}"
+        path.mkdir()
+        os.utime(path, (now - 50 - index, now - 50 - index))
+    os.utime(directory, (now, now))
+
+
+def type_key(path: Path) -> tuple[str, str]:
+    """Return key sorting directories first, then by extension and name."""
+    extension = "." if path.is_dir() else path.suffix or "Z"
+    return extension.lower(), path.name.lower()
+
+
+@pytest.mark.parametrize(
+    ("method", "key"),
+    [
+        (Filesystem.SORTING_NAME, lambda path: path.name.lower()),
+        (Filesystem.SORTING_TYPE, type_key),
+        (Filesystem.SORTING_DATE, lambda path: -path.stat().st_mtime),
+    ],
+    ids=["name", "type", "date"],
+)
+def test_list_sorts_entries(tmp_path: Path, method: int, key: Any) -> None:
+    make_listing_tree(tmp_path)
+    path = fake_path(tmp_path) + "/"
+    expected = [entry.name for entry in sorted(tmp_path.iterdir(), key=key)]
+    Proxy.clearStatCache()
+    assert Filesystem.list(path, method) == (expected, None)
+    # The second listing comes from the cache
+    assert Filesystem.list(path, method) == (expected, None)
+
+
+def test_list_sees_new_file(tmp_path: Path) -> None:
+    path = fake_path(tmp_path) + "/"
+    (tmp_path / "Old.txt").write_bytes(b"")
+    # Only directories unchanged for a while are cached
+    os.utime(tmp_path, (1_700_000_000, 1_700_000_000))
+    assert Filesystem.list(path) == (["Old.txt"], None)
+    assert Proxy._LISTINGS[str(tmp_path)][0] == 1_700_000_000 * 10**9
+    # Adding a file changes the directory mtime
+    (tmp_path / "New.txt").write_bytes(b"")
+    assert Filesystem.list(path) == (["New.txt", "Old.txt"], None)
+
+
+def test_list_sees_write_to_file(tmp_path: Path) -> None:
+    path = fake_path(tmp_path) + "/"
+    for age, name in enumerate(("New.txt", "Old.txt")):
+        (tmp_path / name).write_bytes(b"")
+        modified = 1_700_000_000 - age
+        os.utime(tmp_path / name, (modified, modified))
+    os.utime(tmp_path, (1_700_000_000, 1_700_000_000))
+    by_date = Filesystem.SORTING_DATE
+    assert Filesystem.list(path, by_date) == (["New.txt", "Old.txt"], None)
+    assert str(tmp_path) in Proxy._LISTINGS
+
+    # Rewriting a file keeps the directory mtime
+    assert Filesystem.write(path + "Old.txt", "changed") == (True, None)
+    assert tmp_path.stat().st_mtime == 1_700_000_000
+    assert Filesystem.list(path, by_date) == (["Old.txt", "New.txt"], None)
+
+
+def test_listing_cache_is_bounded(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(Proxy, "LISTING_CACHE_SIZE", 3)
+    Proxy.clearStatCache()
+    for index in range(5):
+        directory = tmp_path / f"Folder{index}"
+        directory.mkdir()
+        os.utime(directory, (1_700_000_000, 1_700_000_000))
+        assert Filesystem.list(fake_path(directory)) == ([], None)
+    assert list(Proxy._LISTINGS) == [
+        str(tmp_path / f"Folder{index}") for index in range(2, 5)
+    ]
+
+
+def test_cached_metadata_matches_separate_stats(tmp_path: Path) -> None:
+    paths = [fake_path(tmp_path / f"File{index}.txt") for index in range(50)]
+    for index, path in enumerate(paths):
+        assert Filesystem.write(path, "x" * index) == (True, None)
+    paths += [fake_path(tmp_path), fake_path(tmp_path / "Missing.txt")]
+    Proxy.clearStatCache()
+    # Once filling the cache, once from it
+    for _ in range(2):
+        for path in paths:
+            real_path = Path(Proxy.OPENCOMPUTERS, path[1:])
+            exists = real_path.exists()
+            expected = (
+                exists,
+                real_path.stat().st_size if exists else None,
+                real_path.is_dir(),
+                math.ceil(real_path.stat().st_mtime) if exists else None,
+            )
+            exists = Proxy.Proxy.exists(path)
+            _, size = Proxy.Proxy.size(path)
+            modified, _ = Proxy.Proxy.lastModified(path)
+            cached = (
+                exists,
+                size if exists else None,
+                Proxy.Proxy.isDirectory(path),
+                modified or None,
+            )
+            assert cached == expected, path
+
+
+def test_append_leaves_no_stale_size(tmp_path: Path) -> None:
+    path = fake_path(tmp_path / "File.txt")
+    assert Filesystem.write(path, "x") == (True, None)
+    assert Proxy.Proxy.size(path) == (True, 1)
+    assert Filesystem.append(path, "more") == (True, None)
+    assert Proxy.Proxy.size(path) == (True, 5)
+
+
+@pytest.fixture
+def copy_mount():
+    """Mount a second filesystem component, return its mount path."""
+    mount = "/Mounts/CopyTest/"
+    proxy = mount_proxy(mount)
+    assert Filesystem.get(mount)[0] is proxy
+    yield mount
+    assert Filesystem.unmount(proxy) == (True, None)
+
+
+@pytest.mark.parametrize("across_proxies", [False, True])
+def test_copy_copies_tree(
+    tmp_path: Path,
+    copy_mount: str,
+    across_proxies: bool,
+) -> None:
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    source.mkdir()
+    total = make_tree(source, 2)
+    to_path = fake_path(target)
+    if across_proxies:
+        to_path = copy_mount + to_path[1:]
+    progress_signals()
+    assert Filesystem.copy(fake_path(source), to_path) == (True, None)
+    assert tree_files(target) == tree_files(source)
+    signals = progress_signals()
+    assert signals[-1][3:] == (total, total)
+
+
+@pytest.fixture
+def other_device(tmp_path: Path):
+    """Return a temporary directory on another host device than tmp_path."""
+    if not os.path.isdir(OTHER_DEVICE):
+        pytest.skip(f"no {OTHER_DEVICE}")
+    with tempfile.TemporaryDirectory(dir=OTHER_DEVICE) as other:
+        if os.stat(other).st_dev == tmp_path.stat().st_dev:
+            pytest.skip(f"{OTHER_DEVICE} is on the same device")
+        yield Path(other)
+
+
+@pytest.fixture
+def no_questions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail if removing files asks the user for confirmation."""
+    monkeypatch.setattr(builtins, "input", refuse_input)
+    monkeypatch.setattr(Proxy, "WARNING", True)
+
+
+@pytest.mark.usefixtures("no_questions")
+@pytest.mark.parametrize("device", ["same", "other"])
+def test_rename_moves_tree_across_mounts(
+    tmp_path: Path,
+    copy_mount: str,
+    request: pytest.FixtureRequest,
+    device: str,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    make_tree(source, 2)
+    expected = tree_files(source)
+    if device == "same":
+        target = tmp_path / "target"
+    else:
+        target = request.getfixturevalue("other_device") / "target"
+    to_path = copy_mount + fake_path(target)[1:]
+    assert Filesystem.rename(fake_path(source), to_path) == (True, None)
+    assert not source.exists()
+    assert tree_files(target) == expected
+
+
+def refuse_rename(source: str, destination: str) -> None:
+    """Fail like renaming between two bind mounts of one device."""
+    raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), source, destination)
+
+
+@pytest.mark.usefixtures("no_questions")
+def test_rename_copies_when_host_refuses(
+    tmp_path: Path,
+    copy_mount: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    make_tree(source, 1)
+    expected = tree_files(source)
+    target = tmp_path / "target"
+    monkeypatch.setattr(os, "rename", refuse_rename)
+    to_path = copy_mount + fake_path(target)[1:]
+    assert Filesystem.rename(fake_path(source), to_path) == (True, None)
+    assert not source.exists()
+    assert tree_files(target) == expected
+
+
+@pytest.mark.usefixtures("no_questions")
+def test_rename_resumes_interrupted_move(
+    tmp_path: Path,
+    copy_mount: str,
+    other_device: Path,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    make_tree(source, 1)
+    expected = tree_files(source)
+    target = other_device / "target"
+    from_path = fake_path(source)
+    to_path = copy_mount + fake_path(target)[1:]
+
+    # A directory in the way of one file stops the move half way
+    name = next(path.name for path in source.iterdir() if path.is_file())
+    (target / name / "blocker").mkdir(parents=True)
+    Proxy.clearStatCache()
+    success, _ = Filesystem.rename(from_path, to_path)
+    assert not success
+    assert (source / name).exists()
+
+    (target / name / "blocker").rmdir()
+    (target / name).rmdir()
+    Proxy.clearStatCache()
+    assert Filesystem.rename(from_path, to_path) == (True, None)
+    assert not source.exists()
+    assert tree_files(target) == expected
@@ -0,0 +1,243 @@
+"""Tests for Image transforms and saving and loading OCIF images."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import math
+import os
+from typing import TYPE_CHECKING
+
+import Color
+import Filesystem
+import Image
+import numpy as np
+import ocif
+import Proxy
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+PICTURES = ["Icons/Trash.pic", "Pictures/Road.pic", "Pictures/Girl.pic"]
+
+
+def fake_path(real_path: str | Path) -> str:
+    """Return the OpenComputers path of a real path."""
+    return "/" + os.path.relpath(real_path, Proxy.OPENCOMPUTERS)
+
+
+def sample_picture() -> Image.Picture:
+    """Return a small picture using colors of the 8 bit palette."""
+    picture = Image.create(4, 3, 0x000000, 0xFFFFFF, 0, "a")
+    # Multibyte symbols can be cut off in the middle
+    Image.set_(picture, 2, 1, 0xFF0000, 0x00FF00, 0, "\u2588")
+    Image.set_(picture, 4, 3, 0x0000FF, 0x000000, 1, "c")
+    return picture
+
+
+def assert_same_picture(loaded: Image.Picture, picture: Image.Picture) -> None:
+    assert Image.getSize(loaded) == Image.getSize(picture)
+    for plane in ("background", "foreground", "alpha", "symbol"):
+        assert np.array_equal(
+            getattr(loaded, plane),
+            getattr(picture, plane),
+        ), plane
+
+
+@pytest.mark.parametrize("encoding_method", [5, 6])
+def test_save_load_round_trip(tmp_path: Path, encoding_method: int) -> None:
+    path = fake_path(tmp_path / "Sample.pic")
+    picture = sample_picture()
+    assert Image.save(path, picture, encoding_method) == (True, None)
+    loaded, reason = Image.load(path)
+    assert reason is None
+    assert_same_picture(loaded, picture)
+
+
+@pytest.mark.parametrize("method", [5, 6, 7, 8])
+def test_ocif_encode_decode_round_trip(method: int) -> None:
+    picture = ocif.Picture.from_picture(sample_picture())
+    assert_same_picture(ocif.decode(ocif.encode(picture, method)), picture)
+
+
+@pytest.mark.parametrize(
+    ("method", "width"),
+    [(5, 4), (5, 300), (6, 4)],
+)
+def test_ocif_files_match_image_files(
+    tmp_path: Path,
+    method: int,
+    width: int,
+) -> None:
+    real_path = tmp_path / "Sample.pic"
+    path = fake_path(real_path)
+    picture = Image.create(width, 3, 0x000000, 0xFFFFFF, 0, "a")
+    Image.set_(picture, 2, 1, 0xFF0000, 0x00FF00, 0, "\u2588")
+    Image.set_(picture, width, 3, 0x0000FF, 0x000000, 1, "c")
+
+    ocif.save(str(real_path), ocif.Picture.from_picture(picture), method)
+    loaded, reason = Image.load(path)
+    assert reason is None
+    assert_same_picture(loaded, picture)
+
+    assert Image.save(path, picture, method) == (True, None)
+    assert_same_picture(ocif.load(str(real_path)), picture)
+
+
+@pytest.mark.parametrize("name", PICTURES)
+def test_load_matches_reference_decoders(name: str) -> None:
+    real_path = os.path.join(Proxy.MINEOS, name)
+    path = fake_path(real_path)
+    picture, reason = Image.load(path)
+    assert reason is None
+    assert_same_picture(picture, ocif.load(real_path))
+
+    # Decode the file again, reading through a handle instead of a map
+    file, reason = Filesystem.open(path, "rb")
+    assert file, reason
+    assert file.readString(4) == Image.OCIFSignature.encode()
+    decoded, reason = Image.encodingMethodsLoad[file.readBytes(1)](file)
+    file.close()
+    assert reason is None
+    assert_same_picture(picture, decoded)
+
+
+@pytest.mark.parametrize("encoding_method", [5, 6])
+def test_load_truncated_file(tmp_path: Path, encoding_method: int) -> None:
+    real_path = tmp_path / "Sample.pic"
+    path = fake_path(real_path)
+    assert Image.save(path, sample_picture(), encoding_method) == (True, None)
+    data = real_path.read_bytes()
+
+    # Keep the signature and encoding method, cut off anything after
+    for size in range(len(Image.OCIFSignature) + 1, len(data)):
+        real_path.write_bytes(data[:size])
+        Proxy.Proxy.forget(path)
+        assert Image.load(path) == (
+            False,
+            "Failed to load OCIF image: file is truncated.",
+        ), size
+
+
+@pytest.mark.parametrize("encoding_method", [5, 6])
+def test_load_invalid_symbol(tmp_path: Path, encoding_method: int) -> None:
+    real_path = tmp_path / "Sample.pic"
+    path = fake_path(real_path)
+    assert Image.save(path, sample_picture(), encoding_method) == (True, None)
+    data = real_path.read_bytes()
+    # A lead byte followed by a byte that is not a continuation byte
+    symbol = "\u2588".encode()
+    real_path.write_bytes(data.replace(symbol, symbol[:1] + b"a" + symbol[2:]))
+    Proxy.Proxy.forget(path)
+    assert Image.load(path) == (
+        False,
+        "Failed to load OCIF image: symbol is not valid UTF-8.",
+    )
+
+
+def random_picture() -> Image.Picture:
+    """Return a random picture larger than any of the transformed sizes."""
+    picture = Image.create(160, 50, random_=True)
+    Image.set_(picture, 1, 1, 0x000000, 0xFFFFFF, 0.5, "x")
+    return picture
+
+
+def per_pixel(
+    picture: Image.Picture,
+    width: int,
+    height: int,
+    source: Callable[[int, int], tuple[int, int] | None],
+) -> Image.Picture:
+    """Return new picture of width and height, copying every pixel from the position source returns, if any."""
+    new_picture = Image.Picture(width, height)
+    for y in range(1, height + 1):
+        for x in range(1, width + 1):
+            position = source(x, y)
+            if position is not None:
+                Image.set_(new_picture, x, y, *Image.get(picture, *position))
+    return new_picture
+
+
+def test_transform_matches_per_pixel_version() -> None:
+    picture = random_picture()
+    width, height = 97, 31
+    # Positions are summed up one step at a time, starting from 1
+    columns = [1.0]
+    for _ in range(width - 1):
+        columns.append(columns[-1] + picture.width / width)
+    rows = [1.0]
+    for _ in range(height - 1):
+        rows.append(rows[-1] + picture.height / height)
+
+    assert_same_picture(
+        Image.transform(picture, width, height),
+        per_pixel(
+            picture,
+            width,
+            height,
+            lambda x, y: (math.floor(columns[x - 1]), math.floor(rows[y - 1])),
+        ),
+    )
+
+
+def test_crop_matches_per_pixel_version() -> None:
+    picture = random_picture()
+    cropped, reason = Image.crop(picture, 11, 5, 120, 40)
+    assert reason is None
+    assert_same_picture(
+        cropped,
+        per_pixel(picture, 120, 40, lambda x, y: (x + 10, y + 4)),
+    )
+
+
+def test_flip_horizontally_matches_per_pixel_version() -> None:
+    picture = random_picture()
+    width, height = Image.getSize(picture)
+    assert_same_picture(
+        Image.flipHorizontally(picture),
+        per_pixel(picture, width, height, lambda x, y: (width - x + 1, y)),
+    )
+
+
+def test_flip_vertically_matches_per_pixel_version() -> None:
+    picture = random_picture()
+    width, height = Image.getSize(picture)
+    assert_same_picture(
+        Image.flipVertically(picture),
+        per_pixel(picture, width, height, lambda x, y: (x, height - y + 1)),
+    )
+
+
+def test_expand_matches_per_pixel_version() -> None:
+    picture = random_picture()
+    width, height = Image.getSize(picture)
+
+    def source(x: int, y: int) -> tuple[int, int] | None:
+        x, y = x - 4, y - 2
+        if 1 <= x <= width and 1 <= y <= height:
+            return x, y
+        return None
+
+    assert_same_picture(
+        Image.expand(picture, 2, 3, 4, 5),
+        per_pixel(picture, width + 9, height + 5, source),
+    )
+
+
+def test_blend_matches_per_pixel_version() -> None:
+    picture = random_picture()
+    blended = picture.copy()
+    for y in range(1, picture.height + 1):
+        for x in range(1, picture.width + 1):
+            background, foreground, alpha, symbol = Image.get(picture, x, y)
+            Image.set_(
+                blended,
+                x,
+                y,
+                Color.blend(background, 0x336DBF, 0.37),
+                Color.blend(foreground, 0x336DBF, 0.37),
+                alpha,
+                symbol,
+            )
+    assert_same_picture(Image.blend(picture, 0x336DBF, 0.37), blended)
@@ -0,0 +1,333 @@
+"""Tests for drawing to the Screen buffer and updating the GPU."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+import random
+
+import Color
+import Image
+import pytest
+import Screen
+
+WIDTH = 10
+HEIGHT = 3
+FRAME_BACKGROUND = 0x010101
+FRAME_FOREGROUND = 0xFEFEFE
+
+
+@pytest.fixture(autouse=True)
+def blank_screen() -> None:
+    Screen.flush(WIDTH, HEIGHT)
+
+
+def pixel(x: int, y: int) -> tuple[int, int, str]:
+    """Return background, foreground and symbol of the new frame at x, y."""
+    backgrounds, foregrounds, symbols = Screen._newFramePlanes()
+    return (
+        int(backgrounds[y - 1, x - 1]),
+        int(foregrounds[y - 1, x - 1]),
+        str(symbols[y - 1, x - 1]),
+    )
+
+
+def row(y: int) -> str:
+    """Return the symbols of a row of the new frame."""
+    return "".join(Screen._newFramePlanes()[2][y - 1].tolist())
+
+
+def test_draw_image_opaque_pixel() -> None:
+    picture = Image.Picture(1, 1, 0x112233, 0x445566, 0, "A")
+    Screen.drawImage(2, 2, picture)
+    assert pixel(2, 2) == (0x112233, 0x445566, "A")
+    assert pixel(1, 2) == (FRAME_BACKGROUND, FRAME_FOREGROUND, " ")
+
+
+def test_draw_image_translucent_background() -> None:
+    picture = Image.Picture(1, 1, 0xFFFFFF, 0x445566, 0.9, "A")
+    Screen.drawImage(1, 1, picture)
+    background, foreground, symbol = pixel(1, 1)
+    transparency = picture.alpha[0, 0] / 255
+    assert background == Color.blend(
+        FRAME_BACKGROUND,
+        0xFFFFFF,
+        transparency,
+    )
+    # Mostly the frame color showing through, not mostly white
+    assert background == 0x1A1A1A
+    assert foreground == 0x445566
+    assert symbol == "A"
+
+
+def test_draw_image_translucent_foreground() -> None:
+    picture = Image.Picture(1, 1, 0xFFFFFF, 0x000000, 0.5, "A")
+    Screen.drawImage(1, 1, picture, blendForeground=True)
+    transparency = picture.alpha[0, 0] / 255
+    assert pixel(1, 1)[1] == Color.blend(
+        FRAME_FOREGROUND,
+        0x000000,
+        transparency,
+    )
+
+
+def test_draw_image_transparent_keeps_frame() -> None:
+    Screen.drawText(1, 1, 0x00FF00, "HELLOWORLD")
+    picture = Image.Picture(4, 1, 0xFFFFFF, 0xFF0000, 1, " ")
+    Screen.drawImage(1, 1, picture)
+    assert row(1) == "HELLOWORLD"
+    assert pixel(1, 1) == (FRAME_BACKGROUND, 0x00FF00, "H")
+
+
+def test_draw_image_transparent_symbol_is_drawn() -> None:
+    picture = Image.Picture(1, 1, 0xFFFFFF, 0xFF0000, 1, "X")
+    Screen.drawImage(3, 1, picture)
+    assert pixel(3, 1) == (FRAME_BACKGROUND, 0xFF0000, "X")
+
+
+def test_draw_image_clipped_to_draw_limit() -> None:
+    Screen.setDrawLimit(2, 1, 3, 1)
+    picture = Image.Picture(4, 1, 0x112233, 0x445566, 0, "A")
+    Screen.drawImage(1, 1, picture)
+    assert row(1) == " AA       "
+
+
+def rows() -> list[str]:
+    """Return the symbols of every row of the new frame."""
+    return ["".join(line) for line in Screen._newFramePlanes()[2].tolist()]
+
+
+def points() -> set[tuple[int, int]]:
+    """Return the x, y of every pixel of the new frame that is not a space."""
+    return {
+        (x, y)
+        for y, line in enumerate(rows(), 1)
+        for x, symbol in enumerate(line, 1)
+        if symbol != " "
+    }
+
+
+def assert_connected(drawn: set[tuple[int, int]]) -> None:
+    """Check every drawn pixel touches another one, diagonals included."""
+    for x, y in drawn:
+        assert any(
+            (x + dx, y + dy) in drawn
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            if dx or dy
+        ), (x, y)
+
+
+def test_draw_line_straight() -> None:
+    Screen.drawLine(8, 2, 3, 2, 0x112233, 0x445566, "-")
+    Screen.drawLine(1, 3, 1, 1, 0x112233, 0x445566, "|")
+    assert rows() == ["|         ", "| ------  ", "|         "]
+    assert pixel(3, 2) == (0x112233, 0x445566, "-")
+
+
+def test_draw_line_diagonal() -> None:
+    Screen.drawLine(1, 1, 3, 3, 0x112233, 0x445566, "\\")
+    assert rows() == ["\\         ", " \\        ", "  \\       "]
+    assert pixel(2, 2) == (0x112233, 0x445566, "\\")
+
+
+@pytest.mark.parametrize(
+    ("x1", "y1", "x2", "y2"),
+    [(1, 1, 10, 3), (10, 1, 1, 3), (2, 3, 4, 1), (5, 1, 6, 3)],
+)
+def test_draw_line_has_one_pixel_per_step(
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+) -> None:
+    Screen.drawLine(x1, y1, x2, y2, 0x112233, 0x445566, "#")
+    drawn = points()
+    assert len(drawn) == max(abs(x2 - x1), abs(y2 - y1)) + 1
+    assert {(x1, y1), (x2, y2)} <= drawn
+    assert_connected(drawn)
+
+
+def test_draw_line_clipped_to_draw_limit() -> None:
+    Screen.setDrawLimit(2, 1, 3, 3)
+    Screen.drawLine(-1, -1, 5, 5, 0x112233, 0x445566, "#")
+    Screen.drawLine(1, 2, 10, 2, 0x112233, 0x445566, "-")
+    assert points() == {(2, 2), (3, 3), (3, 2)}
+
+
+def test_draw_ellipse_outline() -> None:
+    Screen.flush(15, 9)
+    Screen.drawEllipse(8, 5, 5, 3, 0x112233, 0x445566, "o")
+    drawn = points()
+    assert_connected(drawn)
+    xs = [x for x, _ in drawn]
+    ys = [y for _, y in drawn]
+    assert (min(xs), max(xs), min(ys), max(ys)) == (3, 13, 2, 8)
+    # Symmetric around the center, which is left empty
+    assert drawn == {(16 - x, y) for x, y in drawn}
+    assert drawn == {(x, 10 - y) for x, y in drawn}
+    assert (8, 5) not in drawn
+    assert {(3, 5), (13, 5), (8, 2), (8, 8)} <= drawn
+
+
+def test_rasterize_flat_ellipse_is_a_line() -> None:
+    assert Screen.rasterizeEllipse(5, 2, 3, 0) == [(2, 8, 2)]
+
+
+def test_draw_ellipse_clipped_to_draw_limit() -> None:
+    Screen.flush(15, 9)
+    Screen.drawEllipse(8, 5, 5, 3, 0x112233, 0x445566, "o")
+    whole = points()
+    Screen.flush(15, 9)
+    Screen.setDrawLimit(1, 1, 8, 4)
+    Screen.drawEllipse(8, 5, 5, 3, 0x112233, 0x445566, "o")
+    assert points() == {(x, y) for x, y in whole if x <= 8 and y <= 4}
+
+
+def test_copy_paste_round_trip() -> None:
+    Screen.drawRectangle(2, 1, 3, 2, 0x112233, 0x445566, "#")
+    Screen.drawText(3, 2, 0xFF0000, "ab")
+    picture = Screen.copy(2, 1, 4, 2)
+    expected = [plane[0:2, 1:5].copy() for plane in Screen._newFramePlanes()]
+
+    Screen.flush(WIDTH, HEIGHT)
+    Screen.paste(6, 2, picture)
+    for plane, want in zip(Screen._newFramePlanes(), expected, strict=True):
+        assert plane[1:3, 5:9].tolist() == want.tolist()
+    assert rows() == ["          ", "     ###  ", "     #ab  "]
+
+
+def test_copy_outside_buffer_is_black_spaces() -> None:
+    Screen.drawRectangle(1, 1, 2, 2, 0x112233, 0x445566, "#")
+    picture = Screen.copy(0, 0, 3, 2)
+    assert picture.symbol.tolist() == [[" ", " ", " "], [" ", "#", "#"]]
+    assert picture.background.tolist()[0] == [0, 0, 0]
+    assert picture.background.tolist()[1] == [0, 0x112233, 0x112233]
+
+
+def test_paste_clipped_to_draw_limit() -> None:
+    picture = Image.Picture(4, 2, 0x112233, 0x445566, 0, "#")
+    Screen.setDrawLimit(3, 2, 4, 3)
+    Screen.paste(1, 1, picture)
+    assert rows() == ["          ", "  ##      ", "          "]
+
+
+class FakeGPU:
+    """GPU that keeps its screen in lists and records every call."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.background = FRAME_BACKGROUND
+        self.foreground = FRAME_FOREGROUND
+        self.backgrounds = [[FRAME_BACKGROUND] * width for _ in range(height)]
+        self.foregrounds = [[FRAME_FOREGROUND] * width for _ in range(height)]
+        self.symbols = [[" "] * width for _ in range(height)]
+        self.calls: list[str] = []
+
+    def getResolution(self) -> tuple[int, int]:  # noqa: N802
+        """Return screen size."""
+        return self.width, self.height
+
+    def setResolution(self, width: int, height: int) -> None:  # noqa: N802
+        """Change screen size."""
+        self.width, self.height = width, height
+
+    def getBackground(self) -> int:  # noqa: N802
+        """Return current background."""
+        return self.background
+
+    def getForeground(self) -> int:  # noqa: N802
+        """Return current foreground."""
+        return self.foreground
+
+    def setBackground(self, color: int) -> None:  # noqa: N802
+        """Change background of later set calls."""
+        self.calls.append("setBackground")
+        self.background = color
+
+    def setForeground(self, color: int) -> None:  # noqa: N802
+        """Change foreground of later set calls."""
+        self.calls.append("setForeground")
+        self.foreground = color
+
+    def set(self, x: int, y: int, text: str) -> None:
+        """Write text at x, y in the current colors."""
+        self.calls.append("set")
+        for offset, symbol in enumerate(text):
+            self.backgrounds[y - 1][x - 1 + offset] = self.background
+            self.foregrounds[y - 1][x - 1 + offset] = self.foreground
+            self.symbols[y - 1][x - 1 + offset] = symbol
+
+    def fill(self) -> None:
+        """Record a fill call."""
+        self.calls.append("fill")
+
+
+@pytest.fixture
+def gpu() -> FakeGPU:
+    fake = FakeGPU(WIDTH, HEIGHT)
+    Screen.setGPUProxy(fake)
+    return fake
+
+
+def assert_screen_shows_frame(gpu: FakeGPU) -> None:
+    """Check the fake GPU shows the new frame, ignoring foregrounds of spaces."""
+    backgrounds, foregrounds, symbols = Screen._newFramePlanes()
+    assert gpu.backgrounds == backgrounds.tolist()
+    assert gpu.symbols == symbols.tolist()
+    for y, line in enumerate(symbols.tolist()):
+        for x, symbol in enumerate(line):
+            if symbol != " ":
+                assert gpu.foregrounds[y][x] == foregrounds[y, x]
+
+
+def test_get_index_starts_at_one() -> None:
+    assert Screen.getIndex(1, 1) == 1
+    assert Screen.getIndex(WIDTH, 2) == 2 * WIDTH
+    assert Screen._getIndex(1, 1) == 0
+
+
+def test_update_unchanged_frame_makes_no_calls(gpu: FakeGPU) -> None:
+    assert Screen.update() == 0
+    assert gpu.calls == []
+
+
+def test_update_rectangle_is_one_set_per_row(gpu: FakeGPU) -> None:
+    Screen.drawRectangle(2, 1, 5, HEIGHT, 0x336DBF, 0xFFFFFF, " ")
+    calls = Screen.update()
+    assert calls == len(gpu.calls)
+    assert gpu.calls == ["setBackground", "setForeground"] + ["set"] * HEIGHT
+    assert_screen_shows_frame(gpu)
+
+
+def test_update_force_redraws_everything(gpu: FakeGPU) -> None:
+    Screen.update(force=True)
+    assert gpu.calls.count("set") == HEIGHT
+    assert_screen_shows_frame(gpu)
+
+
+def test_update_matches_frame_over_random_draws(gpu: FakeGPU) -> None:
+    # Seeded for repeatable draws, not security
+    rng = random.Random(0)  # noqa: S311
+    colors = (0x000000, 0x336DBF, 0xFFFFFF, 0xFF0000)
+    for _ in range(50):
+        for _ in range(rng.randrange(1, 4)):
+            x, y = rng.randint(-1, WIDTH), rng.randint(-1, HEIGHT)
+            if rng.random() < 0.5:
+                Screen.drawRectangle(
+                    x,
+                    y,
+                    rng.randint(1, 6),
+                    rng.randint(1, 3),
+                    rng.choice(colors),
+                    rng.choice(colors),
+                    rng.choice(" #"),
+                )
+            else:
+                Screen.drawText(x, y, rng.choice(colors), "MineOS")
+        gpu.calls.clear()
+        calls = Screen.update()
+        assert calls == len(gpu.calls)
+        assert_screen_shows_frame(gpu)
+        # Every color is switched to at most once per update
+        assert gpu.calls.count("setBackground") <= len(colors)